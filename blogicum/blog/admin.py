@@ -1,6 +1,10 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
 
-from .models import Post, Category, Location
+from .deletion import (
+    delete_posts, remove_user, restore_comments, restore_posts
+)
+from .models import Post, Category, Comment, Location, QueryStat, User
 
 
 @admin.register(Post)
@@ -12,7 +16,9 @@ class PostAdmin(admin.ModelAdmin):
         'location',
         'pub_date',
         'is_published',
+        'is_visible',
         'created_at',
+        'deleted_at',
         'comment_count'
     )
     list_editable = (
@@ -20,11 +26,26 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'location',
     )
+    list_filter = ('deleted_at',)
+    actions = ('restore',)
+
+    def get_queryset(self, request):
+        return Post.all_objects.all()
+
+    @admin.action(description='Восстановить удалённые публикации')
+    def restore(self, request, queryset):
+        restore_posts(queryset.filter(deleted_at__isnull=False))
 
     @admin.display(description='Количество комментариев')
     def comment_count(self, obj):
         return obj.comments.count()
 
+    def delete_model(self, request, obj):
+        delete_posts([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        delete_posts(queryset.values_list('id', flat=True))
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -33,6 +54,7 @@ class CategoryAdmin(admin.ModelAdmin):
         'description',
         'slug',
         'is_published',
+        'published_posts_count',
         'created_at'
     )
     list_editable = (
@@ -45,8 +67,75 @@ class LocationAdmin(admin.ModelAdmin):
     list_display = (
         'name',
         'is_published',
+        'published_posts_count',
         'created_at'
     )
     list_editable = (
         'is_published',
     )
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = (
+        'text',
+        'post',
+        'author',
+        'created_at',
+        'deleted_at'
+    )
+    list_filter = ('deleted_at',)
+    list_select_related = ('post', 'author')
+    actions = ('restore',)
+
+    def get_queryset(self, request):
+        return Comment.all_objects.all()
+
+    @admin.action(description='Восстановить удалённые комментарии')
+    def restore(self, request, queryset):
+        restore_comments(queryset.filter(deleted_at__isnull=False))
+
+
+@admin.register(QueryStat)
+class QueryStatAdmin(admin.ModelAdmin):
+    list_display = (
+        'fingerprint',
+        'calls',
+        'total_time',
+        'mean_time',
+        'max_time',
+        'rows',
+        'top_views',
+        'updated_at'
+    )
+    search_fields = ('fingerprint',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='Среднее время')
+    def mean_time(self, obj):
+        return obj.mean_time
+
+    @admin.display(description='Представления')
+    def top_views(self, obj):
+        return ', '.join(
+            f'{view} ({calls})' for view, calls in obj.top_views()
+        )
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(UserAdmin):
+
+    def delete_model(self, request, obj):
+        remove_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            remove_user(user)
@@ -0,0 +1,253 @@
+import base64
+from functools import wraps
+from hashlib import md5
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, CharField, F, Q, When
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+
+from .models import Category, Comment, Post, User, comment_count
+
+API_PAGE_SIZE = 10
+API_MAX_PAGE_SIZE = 100
+API_STREAM_CHUNK = 8192
+
+POST_FIELDS = {
+    'id': F('id'),
+    'title': F('title'),
+    'text': F('text'),
+    'pub_date': F('pub_date'),
+    'author': F('author__username'),
+    'category': F('category__slug'),
+    'category_title': F('category__title'),
+    'location': Case(
+        When(location__is_published=True, then=F('location__name')),
+        output_field=CharField()
+    ),
+    'image': F('image'),
+    'comment_count': comment_count(),
+}
+POST_LIST_FIELDS = tuple(field for field in POST_FIELDS if field != 'text')
+
+COMMENT_FIELDS = {
+    'id': F('id'),
+    'text': F('text'),
+    'created_at': F('created_at'),
+    'author': F('author__username'),
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def _select_fields(request, available, default):
+    """Разбирает параметр ?fields= (разреженный набор полей)."""
+    fields = request.GET.get('fields')
+    if not fields:
+        return default
+    fields = tuple(field.strip() for field in fields.split(',') if field)
+    unknown = set(fields) - set(available)
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(sorted(unknown))}.')
+    return fields
+
+
+def _page_size(request):
+    try:
+        size = int(request.GET.get('limit', API_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть числом.')
+    return max(1, min(size, API_MAX_PAGE_SIZE))
+
+
+def _encode_cursor(moment, pk):
+    raw = f'{moment.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        moment, pk = base64.urlsafe_b64decode(
+            cursor.encode()
+        ).decode().split('|')
+        moment = parse_datetime(moment)
+        if moment is None:
+            raise ValueError
+        return moment, int(pk)
+    except ValueError:
+        raise ApiError('Некорректный курсор.')
+
+
+def _values(queryset, fields, available, order_field):
+    """values() по выбранным полям плюс служебные поля курсора."""
+    return queryset.values(
+        _cursor_id=F('id'),
+        _cursor_date=F(order_field),
+        **{f'api_{field}': available[field] for field in fields}
+    )
+
+
+def _keyset_page(request, rows, order_field, descending):
+    """Страница по курсору (order_field, id) без OFFSET."""
+    limit = _page_size(request)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        moment, pk = _decode_cursor(cursor)
+        if descending:
+            rows = rows.filter(
+                Q(**{f'{order_field}__lt': moment})
+                | Q(**{order_field: moment, 'id__lt': pk})
+            )
+        else:
+            rows = rows.filter(
+                Q(**{f'{order_field}__gt': moment})
+                | Q(**{order_field: moment, 'id__gt': pk})
+            )
+    ordering = ('-' if descending else '') + order_field
+    rows = list(rows.order_by(ordering, '-id' if descending else 'id')[
+        :limit + 1
+    ])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(
+            rows[-1]['_cursor_date'], rows[-1]['_cursor_id']
+        )
+    return [_clean(row) for row in rows], next_cursor
+
+
+def _clean(row):
+    """Переименовывает поля выборки в поля ответа."""
+    result = {
+        key[len('api_'):]: value for key, value in row.items()
+        if key.startswith('api_')
+    }
+    if 'image' in result:
+        result['image'] = (
+            default_storage.url(result['image']) if result['image'] else None
+        )
+    return result
+
+
+def _chunked(chunks):
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= API_STREAM_CHUNK:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _respond(request, payload):
+    """
+    Ответ с ETag по содержимому.
+
+    Тело кодируется по частям и отдаётся потоком: большие страницы
+    не собираются в одну строку.
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    etag = '"{}"'.format(md5(repr(payload).encode()).hexdigest())
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = StreamingHttpResponse(
+        _chunked(encoder.iterencode(payload)),
+        content_type='application/json'
+    )
+    response['ETag'] = etag
+    return response
+
+
+def api_view(view):
+    """GET-представление API, ошибки запроса отдаются как JSON 400."""
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'detail': 'Не найдено.'}, status=404)
+    return wrapper
+
+
+def _post_list(request, posts):
+    fields = _select_fields(request, POST_FIELDS, POST_LIST_FIELDS)
+    results, next_cursor = _keyset_page(
+        request,
+        _values(posts, fields, POST_FIELDS, 'pub_date'),
+        'pub_date',
+        descending=True
+    )
+    return _respond(request, {'results': results, 'next': next_cursor})
+
+
+@api_view
+def post_list(request):
+    """Лента публикаций."""
+    return _post_list(request, Post.new_objects.all())
+
+
+@api_view
+def category_post_list(request, category_slug):
+    """Публикации категории."""
+    if not Category.objects.filter(
+        slug=category_slug, is_published=True
+    ).exists():
+        raise Http404
+    return _post_list(
+        request, Post.new_objects.filter(category__slug=category_slug)
+    )
+
+
+@api_view
+def profile_post_list(request, username):
+    """Публикации пользователя."""
+    if not User.objects.filter(username=username).exists():
+        raise Http404
+    return _post_list(
+        request, Post.new_objects.filter(author__username=username)
+    )
+
+
+@api_view
+def post_detail(request, post_id):
+    """Публикация."""
+    fields = _select_fields(request, POST_FIELDS, tuple(POST_FIELDS))
+    rows = _values(
+        Post.new_objects.filter(pk=post_id), fields, POST_FIELDS, 'pub_date'
+    )
+    post = rows.first()
+    if post is None:
+        raise Http404
+    return _respond(request, _clean(post))
+
+
+@api_view
+def comment_list(request, post_id):
+    """Комментарии к публикации."""
+    if not Post.new_objects.filter(pk=post_id).exists():
+        raise Http404
+    fields = _select_fields(request, COMMENT_FIELDS, tuple(COMMENT_FIELDS))
+    results, next_cursor = _keyset_page(
+        request,
+        _values(
+            Comment.objects.filter(post_id=post_id),
+            fields,
+            COMMENT_FIELDS,
+            'created_at'
+        ),
+        'created_at',
+        descending=False
+    )
+    return _respond(request, {'results': results, 'next': next_cursor})
@@ -5,3 +5,10 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import query_stats, signals, slow_queries  # noqa: F401
+
+        post_migrate.connect(signals.restore_search_triggers, sender=self)
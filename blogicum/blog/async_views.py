@@ -0,0 +1,42 @@
+"""
+Асинхронные варианты страниц для чтения.
+
+В Django 3.2 у ORM нет асинхронных методов (aget, acount, async for
+появились в 4.1), поэтому обычное представление целиком выполняется за
+один переход в пул потоков: dispatch с кешем страницы для анонимов,
+пагинация по счётчикам и рендер шаблона, в котором ещё бывают запросы.
+В цикл событий возвращается готовый ответ, и поток не занят, пока
+медленный клиент читает его. Бюджет запросов у асинхронного варианта
+тот же, что у синхронного. Для работы без переходов в поток все
+middleware должны поддерживать async, поэтому debug_toolbar в боевых
+настройках отключается.
+"""
+from asgiref.sync import sync_to_async
+
+from .views import (
+    CategoryListView, PostDetailView, PostListView, ProfileListView
+)
+
+
+def async_view(view_class):
+    sync_view = view_class.as_view()
+
+    def respond(request, kwargs):
+        response = sync_view(request, **kwargs)
+        if not response.is_rendered:
+            response.render()
+        return response
+
+    async def view(request, **kwargs):
+        return await sync_to_async(respond)(request, kwargs)
+
+    view.__doc__ = view_class.__doc__
+    view.__name__ = view_class.__name__
+    view.view_class = view_class
+    return view
+
+
+post_list = async_view(PostListView)
+post_detail = async_view(PostDetailView)
+profile = async_view(ProfileListView)
+category_posts = async_view(CategoryListView)
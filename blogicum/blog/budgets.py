@@ -0,0 +1,107 @@
+"""
+Бюджеты запросов для представлений блога.
+
+Представление объявляет атрибут query_budget — сколько запросов к базе
+оно может выполнить вместе с рендером шаблона. Запросы промежуточных
+слоёв до представления (ScheduledPublishMiddleware) не считаются, а
+сессия и пользователь загружаются лениво внутри представления и входят
+в бюджет как AUTH_QUERIES.
+
+Превышение в разработке и тестах — QueryBudgetExceeded
+(BLOG_QUERY_BUDGETS = 'raise'), в бою — предупреждение в лог и метрика
+blog_query_budget_exceeded_total (BLOG_QUERY_BUDGETS = 'log'). В обоих
+случаях выводится разница с последним запросом к тому же представлению,
+который уложился в бюджет: лишние запросы отмечены «+». Эталон хранится
+в памяти воркера.
+"""
+import difflib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from . import metrics
+from .query_stats import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Сессия и пользователь для вошедших.
+AUTH_QUERIES = 2
+
+EXCEEDED_METRIC = 'blog_query_budget_exceeded_total'
+metrics.describe(
+    EXCEEDED_METRIC, 'Запросы к представлениям сверх бюджета запросов.'
+)
+
+_baselines = {}
+_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов, чем объявлено."""
+
+
+def get_budget(view_func):
+    view = getattr(view_func, 'view_class', view_func)
+    return getattr(view, 'query_budget', None)
+
+
+def sql_diff(baseline, queries, budget):
+    """
+    Лишние запросы: разница с эталоном, а если его нет или запросы
+    не изменились (бюджет уменьшили) — всё, что сверх бюджета.
+    """
+    if baseline is None or baseline == queries:
+        return '\n'.join(
+            ('+ ' if number >= budget else '  ') + query
+            for number, query in enumerate(queries)
+        )
+    return '\n'.join(
+        line for line in difflib.ndiff(baseline, queries)
+        if not line.startswith('?')
+    )
+
+
+class QueryBudgetMiddleware:
+    """Сверяет число запросов представления с его query_budget."""
+
+    def __init__(self, get_response):
+        if not settings.BLOG_QUERY_BUDGETS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = []
+
+        def collect(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(collect):
+            response = self.get_response(request)
+        match = request.resolver_match
+        budget = match and get_budget(match.func)
+        if budget is None:
+            return response
+        queries = [fingerprint(sql) for sql in queries]
+        if len(queries) <= budget:
+            with _lock:
+                _baselines[match.view_name] = queries
+            return response
+        self.report(request, match.view_name, queries, budget)
+        return response
+
+    def report(self, request, view_name, queries, budget):
+        with _lock:
+            baseline = _baselines.get(view_name)
+        message = (
+            f'{view_name} ({request.method} {request.path}): '
+            f'запросов {len(queries)} при бюджете {budget}\n'
+            f'{sql_diff(baseline, queries, budget)}'
+        )
+        if settings.BLOG_QUERY_BUDGETS == 'raise':
+            raise QueryBudgetExceeded(message)
+        metrics.increment(EXCEEDED_METRIC, {'view': view_name})
+        logger.warning(message)
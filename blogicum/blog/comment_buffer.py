@@ -0,0 +1,104 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Comment
+from .publishing import bump_generation
+from .timeline import change_comment_count
+
+logger = logging.getLogger(__name__)
+
+# Сколько раз подряд пачка может не сохраниться, прежде чем комментарии
+# сохраняются по одному, а несохраняемые уходят в dead_letters.
+MAX_ATTEMPTS = 3
+
+
+class CommentBuffer:
+    """
+    Буфер отложенной записи комментариев.
+
+    Запрос только кладёт комментарий в очередь; фоновый поток раз
+    в interval секунд сохраняет всё накопленное одной транзакцией.
+    Если пачка не сохранилась, комментарии возвращаются в очередь.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.dead_letters = []
+        self._pending = []
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def add(self, comment):
+        with self._lock:
+            self._pending.append(comment)
+            if self._worker is None:
+                self._start_worker()
+
+    def _start_worker(self):
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Не удалось сохранить комментарии')
+
+    def flush(self):
+        """Сохраняет накопленные комментарии, возвращает их число."""
+        with self._lock:
+            comments, self._pending = self._pending, []
+        if not comments:
+            return 0
+        for comment in comments:
+            comment.render_html()
+        try:
+            self._save(comments)
+        except Exception:
+            self._failures += 1
+            if self._failures < MAX_ATTEMPTS:
+                with self._lock:
+                    self._pending[:0] = comments
+                raise
+            self._failures = 0
+            return self._save_one_by_one(comments)
+        self._failures = 0
+        return len(comments)
+
+    def _save(self, comments):
+        with transaction.atomic():
+            Comment.objects.bulk_create(comments)
+            for post_id, count in Counter(
+                    comment.post_id for comment in comments).items():
+                change_comment_count(post_id, count)
+        bump_generation()
+
+    def _save_one_by_one(self, comments):
+        """Последняя попытка: несохраняемые комментарии — в dead_letters."""
+        saved = 0
+        for comment in comments:
+            try:
+                self._save([comment])
+            except Exception:
+                logger.exception(
+                    'Комментарий к посту %s не сохранён и отложен',
+                    comment.post_id
+                )
+                with self._lock:
+                    self.dead_letters.append(comment)
+            else:
+                saved += 1
+        return saved
+
+
+comment_buffer = CommentBuffer(settings.BLOG_COMMENT_BUFFER_INTERVAL)
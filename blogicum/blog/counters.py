@@ -0,0 +1,78 @@
+from itertools import islice
+
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Category, Location, Post, ProfileStats, User
+
+STATS_BATCH_SIZE = 1000
+
+
+def _count(field, **filters):
+    return Coalesce(
+        Subquery(
+            Post.objects.filter(
+                **{field: OuterRef('pk')}, **filters
+            ).order_by().values(field).annotate(
+                total=Count('id')
+            ).values('total')
+        ),
+        0
+    )
+
+
+def _refresh(queryset, field):
+    queryset.update(
+        posts_count=_count(field),
+        published_posts_count=_count(field, is_visible=True)
+    )
+
+
+def _ids(values):
+    return {value for value in values if value is not None}
+
+
+def create_stats(author_ids):
+    ProfileStats.objects.bulk_create(
+        [ProfileStats(user_id=author_id) for author_id in author_ids],
+        batch_size=STATS_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def refresh_counters(category_ids=(), location_ids=(), author_ids=(),
+                     create_missing=True):
+    """Пересчитывает счётчики публикаций одним UPDATE на таблицу."""
+    category_ids = _ids(category_ids)
+    location_ids = _ids(location_ids)
+    author_ids = _ids(author_ids)
+    if category_ids:
+        _refresh(Category.objects.filter(id__in=category_ids), 'category')
+    if location_ids:
+        _refresh(Location.objects.filter(id__in=location_ids), 'location')
+    if author_ids:
+        if create_missing:
+            create_stats(author_ids)
+        _refresh(ProfileStats.objects.filter(pk__in=author_ids), 'author')
+
+
+def refresh_post_counters(posts):
+    """Пересчитывает счётчики всех категорий, мест и авторов постов."""
+    keys = list(posts.values_list(
+        'category_id', 'location_id', 'author_id'
+    ).distinct())
+    if keys:
+        refresh_counters(*zip(*keys))
+
+
+def reconcile_counters():
+    """Полная сверка всех счётчиков."""
+    user_ids = User.objects.values_list('id', flat=True).iterator()
+    while True:
+        batch = list(islice(user_ids, STATS_BATCH_SIZE))
+        if not batch:
+            break
+        create_stats(batch)
+    _refresh(Category.objects.all(), 'category')
+    _refresh(Location.objects.all(), 'location')
+    _refresh(ProfileStats.objects.all(), 'author')
@@ -0,0 +1,185 @@
+import logging
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .counters import refresh_counters, refresh_post_counters
+from .models import Comment, FeedEntry, Post, visible_posts_q
+from .publishing import bump_generation, reset_schedule, set_visibility
+from .timeline import refresh_comment_counts
+
+DELETE_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+def _raw_delete(queryset):
+    """
+    DELETE одним запросом: без загрузки объектов и сигналов,
+    как при «быстром» удалении в коллекторе Django.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def _delete_in_batches(queryset, batch_size=DELETE_BATCH_SIZE):
+    """Удаляет строки пакетами, каждый пакет в своей транзакции."""
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += _raw_delete(
+                queryset.model.all_objects.filter(id__in=ids)
+            )
+
+
+def delete_files(names):
+    storage = Post._meta.get_field('image').storage
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.warning('Не удалось удалить файл %s', name, exc_info=True)
+
+
+def _delete_post_batch(post_ids, batch_size):
+    _delete_in_batches(
+        Comment.all_objects.filter(post_id__in=post_ids), batch_size
+    )
+    with transaction.atomic():
+        posts = Post.all_objects.filter(id__in=post_ids)
+        keys = list(posts.values_list(
+            'category_id', 'location_id', 'author_id'
+        ).distinct())
+        images = list(
+            posts.exclude(image='').values_list('image', flat=True)
+        )
+        _raw_delete(FeedEntry.objects.filter(post_id__in=post_ids))
+        _raw_delete(posts)
+        if keys:
+            refresh_counters(*zip(*keys), create_missing=False)
+        transaction.on_commit(partial(delete_files, images))
+
+
+def delete_posts(post_ids, batch_size=DELETE_BATCH_SIZE):
+    """
+    Удаляет посты вместе с комментариями пакетными DELETE.
+    Файлы изображений удаляются после фиксации транзакции.
+    """
+    post_ids = list(post_ids)
+    for start in range(0, len(post_ids), batch_size):
+        _delete_post_batch(post_ids[start:start + batch_size], batch_size)
+    if post_ids:
+        bump_generation()
+
+
+def delete_user(user):
+    """Удаляет пользователя, его комментарии и посты пакетами."""
+    comments = Comment.all_objects.filter(author=user)
+    post_ids = set(comments.values_list('post_id', flat=True).distinct())
+    _delete_in_batches(comments)
+    refresh_comment_counts(post_ids)
+    delete_posts(
+        Post.all_objects.filter(author=user).values_list('id', flat=True)
+    )
+    user.delete()
+    bump_generation()
+
+
+def soft_delete_posts(posts):
+    """Помечает посты удалёнными и скрывает их."""
+    post_ids = list(posts.values_list('id', flat=True))
+    deleted = Post.all_objects.filter(id__in=post_ids)
+    deleted.update(deleted_at=timezone.now())
+    hidden = set(set_visibility(deleted, False))
+    refresh_post_counters(deleted.exclude(id__in=hidden))
+    return post_ids
+
+
+def soft_delete_post(post):
+    """
+    Мягко удаляет один загруженный пост. Ключи счётчиков и видимость
+    уже известны, поэтому без выборок, которые делает soft_delete_posts.
+    """
+    with transaction.atomic():
+        Post.all_objects.filter(pk=post.pk).update(
+            deleted_at=timezone.now(), is_visible=False
+        )
+        _raw_delete(FeedEntry.objects.filter(post_id=post.pk))
+        refresh_counters(
+            [post.category_id], [post.location_id], [post.author_id],
+            create_missing=False
+        )
+    bump_generation()
+
+
+def restore_posts(posts):
+    """Отменяет мягкое удаление постов."""
+    post_ids = list(posts.values_list('id', flat=True))
+    restored = Post.all_objects.filter(id__in=post_ids)
+    restored.update(deleted_at=None)
+    shown = set(set_visibility(
+        restored.filter(visible_posts_q(timezone.now())), True
+    ))
+    refresh_post_counters(restored.exclude(id__in=shown))
+    reset_schedule()
+    return post_ids
+
+
+def soft_delete_comments(comments):
+    post_ids = set(comments.values_list('post_id', flat=True))
+    comments.update(deleted_at=timezone.now())
+    refresh_comment_counts(post_ids)
+    bump_generation()
+
+
+def restore_comments(comments):
+    post_ids = set(comments.values_list('post_id', flat=True))
+    comments.update(deleted_at=None)
+    refresh_comment_counts(post_ids)
+    bump_generation()
+
+
+def run_in_background(func, *args):
+    def target():
+        try:
+            func(*args)
+        except Exception:
+            logger.exception('Фоновое удаление не удалось')
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=target, daemon=True).start()
+
+
+def purge_deleted(before, batch_size=DELETE_BATCH_SIZE):
+    """Физически удаляет записи, помеченные удалёнными до before."""
+    delete_posts(
+        Post.all_objects.filter(
+            deleted_at__lte=before
+        ).values_list('id', flat=True),
+        batch_size
+    )
+    _delete_in_batches(
+        Comment.all_objects.filter(deleted_at__lte=before),
+        batch_size
+    )
+
+
+def remove_user(user):
+    """
+    Удаляет пользователя сразу или, при BLOG_ASYNC_DELETION, скрывает
+    его записи и удаляет в фоне, не задерживая ответ.
+    """
+    if not settings.BLOG_ASYNC_DELETION:
+        delete_user(user)
+        return
+    user.is_active = False
+    user.save(update_fields=('is_active',))
+    soft_delete_posts(Post.objects.filter(author=user))
+    soft_delete_comments(Comment.objects.filter(author=user))
+    transaction.on_commit(lambda: run_in_background(delete_user, user))
@@ -0,0 +1,170 @@
+from hashlib import md5
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, parse_http_date
+from django.utils.text import Truncator
+
+from .models import Category, Post, User
+from .publishing import get_generation
+
+FEED_SIZE = 30
+FEED_DESCRIPTION_WORDS = 50
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+FEED_FIELDS = (
+    'id',
+    'title',
+    'text',
+    'pub_date',
+    'author__username',
+    'category__title',
+)
+
+
+class LatestPostsFeed(Feed):
+    """Лента последних публикаций."""
+    title = 'Блогикум'
+    link = reverse_lazy('blog:index')
+    description = 'Последние публикации Блогикума'
+
+    def get_posts(self, obj):
+        return Post.new_objects.all()
+
+    def items(self, obj):
+        return self.get_posts(obj).select_related(
+            'author', 'category'
+        ).only(*FEED_FIELDS).order_by('-pub_date')[:FEED_SIZE].iterator()
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(FEED_DESCRIPTION_WORDS)
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', kwargs={'post_id': item.id})
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    """Лента публикаций категории."""
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category,
+            slug=category_slug,
+            is_published=True
+        )
+
+    def get_posts(self, obj):
+        return Post.new_objects.filter(category=obj)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def link(self, obj):
+        return reverse(
+            'blog:category_posts',
+            kwargs={'category_slug': obj.slug}
+        )
+
+    def description(self, obj):
+        return obj.description
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    """Лента публикаций автора."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, obj):
+        return Post.new_objects.filter(author=obj)
+
+    def title(self, obj):
+        return f'Блогикум: @{obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', kwargs={'username': obj.username})
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}'
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def render_feed(feed, obj, request):
+    """Ответ ленты для уже найденного объекта, как в Feed.__call__."""
+    feedgen = feed.get_feed(obj, request)
+    response = HttpResponse(content_type=feedgen.content_type)
+    response['Last-Modified'] = http_date(
+        feedgen.latest_post_date().timestamp()
+    )
+    feedgen.write(response, 'utf-8')
+    return response
+
+
+def cached_feed(feed_class):
+    """
+    Представление ленты с ETag/Last-Modified.
+
+    Готовый ответ лежит в кеше, пока не сменится поколение содержимого,
+    то есть до следующей публикации или правки. Без кеша объект ленты
+    ищется до проверки условного запроса: для пропавшей категории
+    ответ 404, а не 304.
+    """
+    feed = feed_class()
+
+    def view(request, **kwargs):
+        generation = get_generation()
+        cache_key = f'blog:feed:{request.path}:{generation}'
+        response = cache.get(cache_key)
+        if response is None:
+            try:
+                obj = feed.get_object(request, **kwargs)
+            except ObjectDoesNotExist:
+                raise Http404('Лента не найдена.')
+            response = render_feed(feed, obj, request)
+            response['ETag'] = '"{}"'.format(
+                md5(f'{request.path}:{generation}'.encode()).hexdigest()
+            )
+            cache.set(cache_key, response, FEED_CACHE_TIMEOUT)
+        return get_conditional_response(
+            request,
+            etag=response['ETag'],
+            last_modified=parse_http_date(response['Last-Modified']),
+            response=response,
+        ) or response
+
+    return view
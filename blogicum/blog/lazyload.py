@@ -0,0 +1,117 @@
+"""
+Строгий режим загрузки: поиск ленивых запросов в представлениях блога.
+
+Запрос, который Django выполняет сам при обращении к незагруженной
+связи (comment.post) или к отложенному полю (после only()), незаметен
+в коде, а в цикле по записям превращается в N+1. В строгом режиме
+такие запросы собираются по стеку вызовов вместе с шаблоном и строкой,
+откуда они пришли. После ответа они пишутся в лог (BLOG_STRICT_LOADING
+= 'log') или превращаются в LazyLoadError ('raise').
+
+Исключение не бросается сразу: шаблонные {% if %} глотают ошибки
+сравнений, и часть нарушений осталась бы незамеченной.
+"""
+import logging
+import os
+import sys
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor, ReverseOneToOneDescriptor
+)
+from django.db.models.query_utils import DeferredAttribute
+from django.template.base import Node
+
+logger = logging.getLogger(__name__)
+
+LAZY_LOADERS = {
+    ForwardManyToOneDescriptor.__get__.__code__,
+    ReverseOneToOneDescriptor.__get__.__code__,
+    DeferredAttribute.__get__.__code__,
+}
+RENDER_CODE = Node.render_annotated.__code__
+
+
+class LazyLoadError(Exception):
+    """Представление выполнило ленивые запросы к базе."""
+
+
+def _loaded_field(descriptor):
+    field = getattr(descriptor, 'field', None)
+    if field is None:
+        # Обратная связь один-к-одному, например user.stats.
+        field = descriptor.related
+        return f'{field.model.__name__}.{field.get_accessor_name()}'
+    return f'{field.model.__name__}.{field.name}'
+
+
+def call_site(frame):
+    """Шаблон и строка, а без шаблона — строка кода приложения blog."""
+    app_path = apps.get_app_config('blog').path
+    code_site = None
+    while frame is not None:
+        if frame.f_code is RENDER_CODE:
+            node = frame.f_locals['self']
+            origin = node.origin
+            return (
+                f'{origin.template_name or origin.name}:{node.token.lineno}'
+            )
+        filename = frame.f_code.co_filename
+        if (code_site is None and filename.startswith(app_path)
+                and filename != __file__):
+            code_site = (
+                f'{os.path.relpath(filename, app_path)}:{frame.f_lineno}'
+            )
+        frame = frame.f_back
+    return code_site or 'неизвестно'
+
+
+def find_lazy_load(frame):
+    """Описание ленивой загрузки, если запрос выполняется ради неё."""
+    while frame is not None:
+        if frame.f_code in LAZY_LOADERS:
+            return (
+                _loaded_field(frame.f_locals['self']),
+                call_site(frame.f_back),
+            )
+        frame = frame.f_back
+    return None
+
+
+class StrictLoadingMiddleware:
+    """Ловит ленивые запросы, выполненные представлениями блога."""
+
+    def __init__(self, get_response):
+        if not settings.BLOG_STRICT_LOADING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        lazy_loads = Counter()
+
+        def detect(execute, sql, params, many, context):
+            lazy_load = find_lazy_load(sys._getframe(1))
+            if lazy_load is not None:
+                lazy_loads[lazy_load] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(detect):
+            response = self.get_response(request)
+        match = request.resolver_match
+        if lazy_loads and match and 'blog' in match.namespaces:
+            self.report(request, lazy_loads)
+        return response
+
+    def report(self, request, lazy_loads):
+        sites = '; '.join(
+            f'{field} в {site} (запросов: {count})'
+            for (field, site), count in lazy_loads.items()
+        )
+        message = f'Ленивые запросы на {request.path}: {sites}'
+        if settings.BLOG_STRICT_LOADING == 'raise':
+            raise LazyLoadError(message)
+        logger.warning(message)
@@ -0,0 +1,432 @@
+"""
+Нагрузочный прогон локального сервера смесями сценариев блога.
+
+HTTP-клиент написан на asyncio без сторонних библиотек. Каждый запрос
+открывает своё соединение (Connection: close), поэтому клиенту не нужно
+разбирать keep-alive, а задержка включает установку соединения, как у
+нового посетителя. Виртуальный пользователь хранит cookie, а для форм
+берёт CSRF-токен из cookie csrftoken.
+
+Сценарии:
+feed — анонимная лента; номер страницы распределён по Парето, поэтому
+    чаще всего первые страницы, но есть длинный хвост глубоких. Лента
+    листается курсором, и курсоры начала страниц собираются до прогона;
+detail — чтение постов, популярность которых распределена по Ципфу;
+comment — вход и серия комментариев к одному горячему посту;
+login — вход через форму;
+create — вход и публикация поста с картинкой.
+
+Ответы 429 считаются отдельно от ошибок: это ограничитель комментариев
+делает свою работу. Ошибки — ответы 5xx и сбои соединения.
+"""
+import asyncio
+import itertools
+import math
+import random
+import struct
+import time
+import uuid
+import zlib
+from collections import Counter, defaultdict
+from urllib.parse import quote, urlencode
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import Category, FeedEntry, Location, Post
+from .render_timing import REQUEST_METRIC
+from .timeline import make_feed_cursor
+
+LOOPBACK_HOSTS = {'127.0.0.1', 'localhost', '::1'}
+DEFAULT_MIX = {
+    'feed': 50,
+    'detail': 30,
+    'comment': 10,
+    'login': 5,
+    'create': 5,
+}
+PAGE_SIZE = 10
+REQUEST_TIMEOUT = 30
+USER_PREFIX = 'loadtest'
+PASSWORD = 'loadtest-password'
+TOO_MANY_REQUESTS = 429
+
+
+def parse_mix(value):
+    """'feed=50,detail=30' -> {'feed': 50, 'detail': 30}."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f'Неизвестный сценарий: {name}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(values, fraction):
+    """Процентиль по ближайшему рангу из отсортированного списка."""
+    if not values:
+        return 0.0
+    rank = math.ceil(fraction * len(values))
+    return values[max(rank, 1) - 1]
+
+
+def tiny_png():
+    """PNG 1×1, который пропустит проверка ImageField."""
+    def chunk(kind, data):
+        return (
+            struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data))
+        )
+
+    header = struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b'\x00\xff\x80\x00')
+    return (
+        b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+        + chunk(b'IDAT', pixels) + chunk(b'IEND', b'')
+    )
+
+
+def encode_multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; '
+            f'name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content_type, content) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; '
+            f'name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode()
+            + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return f'multipart/form-data; boundary={boundary}', b''.join(parts)
+
+
+def _dechunk(body):
+    result = []
+    while body:
+        size_line, _, body = body.partition(b'\r\n')
+        size = int(size_line.split(b';')[0], 16)
+        if not size:
+            break
+        result.append(body[:size])
+        body = body[size + 2:]
+    return b''.join(result)
+
+
+async def fetch(host, port, method, path, headers, body=b''):
+    """Один запрос HTTP/1.1: (статус, заголовки, тело)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        authority = f'[{host}]:{port}' if ':' in host else f'{host}:{port}'
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {authority}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        lines += [f'Content-Length: {len(body)}', 'Connection: close']
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+        raw = await reader.read()
+    finally:
+        writer.close()
+    head, _, payload = raw.partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = defaultdict(list)
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        response_headers[name.strip().lower()].append(value.strip())
+    if 'chunked' in response_headers.get('transfer-encoding', ()):
+        payload = _dechunk(payload)
+    return int(status_line.split()[1]), response_headers, payload
+
+
+class Recorder:
+    """Задержки и статусы ответов по именам запросов."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def add(self, name, status, seconds):
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+
+    def summary(self, elapsed):
+        rows = []
+        for name in sorted(self.latencies):
+            latencies = sorted(self.latencies[name])
+            statuses = self.statuses[name]
+            errors = sum(
+                count for status, count in statuses.items()
+                if status == 0 or status >= 500
+            )
+            rows.append({
+                'name': name,
+                'requests': len(latencies),
+                'rps': len(latencies) / elapsed,
+                'p50': percentile(latencies, 0.5),
+                'p90': percentile(latencies, 0.9),
+                'p99': percentile(latencies, 0.99),
+                'max': latencies[-1],
+                'errors': errors,
+                'error_rate': errors / len(latencies),
+                'limited': statuses[TOO_MANY_REQUESTS],
+            })
+        return rows
+
+
+class Session:
+    """Виртуальный пользователь: cookie и запросы с замером."""
+
+    def __init__(self, host, port, recorder):
+        self.host = host
+        self.port = port
+        self.recorder = recorder
+        self.cookies = {}
+        self.username = None
+
+    async def request(self, name, method, path, body=b'', headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(
+                f'{key}={value}' for key, value in self.cookies.items()
+            )
+        started = time.perf_counter()
+        try:
+            status, response_headers, _ = await asyncio.wait_for(
+                fetch(self.host, self.port, method, path, headers, body),
+                REQUEST_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            status, response_headers = 0, {}
+        self.recorder.add(name, status, time.perf_counter() - started)
+        for cookie in response_headers.get('set-cookie', ()):
+            key, _, value = cookie.split(';')[0].partition('=')
+            self.cookies[key] = value
+        return status
+
+    async def get(self, name, path):
+        return await self.request(name, 'GET', path)
+
+    async def post(self, name, path, fields, files=None):
+        fields = {
+            'csrfmiddlewaretoken': self.cookies.get('csrftoken', ''),
+            **fields,
+        }
+        if files:
+            content_type, body = encode_multipart(fields, files)
+        else:
+            content_type = 'application/x-www-form-urlencoded'
+            body = urlencode(fields).encode()
+        return await self.request(
+            name, 'POST', path, body, {'Content-Type': content_type}
+        )
+
+
+class Site:
+    """Что есть в базе: посты по популярности, страницы, пользователи."""
+
+    def __init__(self, post_ids, pages, category_ids, location_ids,
+                 usernames, page_skew, hot_skew, burst, feed_cursors=()):
+        self.post_ids = post_ids
+        self.pages = pages
+        self.feed_cursors = feed_cursors
+        self.category_ids = category_ids
+        self.location_ids = location_ids
+        self.usernames = usernames
+        self.page_skew = page_skew
+        self.burst = burst
+        # Горячие посты — свежие: вес поста с рангом r равен 1 / r^s.
+        self.post_weights = list(itertools.accumulate(
+            1 / rank ** hot_skew for rank in range(1, len(post_ids) + 1)
+        ))
+
+    @classmethod
+    def load(cls, users, hot_posts=1000, **options):
+        post_ids = list(
+            Post.new_objects.order_by('-pub_date')
+            .values_list('id', flat=True)[:hot_posts]
+        )
+        cursors = feed_cursors()
+        return cls(
+            post_ids=post_ids,
+            pages=len(cursors) + 1,
+            feed_cursors=cursors,
+            category_ids=list(
+                Category.objects.filter(is_published=True)
+                .values_list('id', flat=True)
+            ),
+            location_ids=list(
+                Location.objects.filter(is_published=True)
+                .values_list('id', flat=True)
+            ),
+            usernames=ensure_users(users),
+            **options
+        )
+
+    def page(self, rng):
+        return min(int(rng.paretovariate(self.page_skew)), self.pages)
+
+    def hot_post(self, rng):
+        return rng.choices(self.post_ids, cum_weights=self.post_weights)[0]
+
+    def feed_path(self, page):
+        if page == 1:
+            return '/'
+        return f'/?cursor={quote(self.feed_cursors[page - 2])}'
+
+
+def feed_cursors():
+    """Курсоры, с которых начинаются вторая и следующие страницы ленты."""
+    cursors = []
+    previous = None
+    entries = FeedEntry.objects.order_by('-pub_date', '-post').only(
+        'pub_date'
+    )
+    for number, entry in enumerate(entries.iterator()):
+        if number and number % PAGE_SIZE == 0:
+            cursors.append(make_feed_cursor(previous))
+        previous = entry
+    return cursors
+
+
+def ensure_users(count):
+    """Пользователи нагрузочного прогона с известным паролем."""
+    User = get_user_model()
+    usernames = [f'{USER_PREFIX}{number}' for number in range(count)]
+    existing = set(
+        User.objects.filter(username__in=usernames)
+        .values_list('username', flat=True)
+    )
+    for username in usernames:
+        if username not in existing:
+            User.objects.create_user(username, password=PASSWORD)
+    return usernames
+
+
+async def login(session, site, rng):
+    session.cookies.clear()
+    await session.get('login_form', '/auth/login/')
+    username = rng.choice(site.usernames)
+    status = await session.post(
+        'login', '/auth/login/', {'username': username, 'password': PASSWORD}
+    )
+    session.username = username if status == 302 else None
+
+
+async def ensure_login(session, site, rng):
+    if session.username is None:
+        await login(session, site, rng)
+    return session.username is not None
+
+
+async def feed(session, site, rng):
+    await session.get('feed', site.feed_path(site.page(rng)))
+
+
+async def detail(session, site, rng):
+    if site.post_ids:
+        await session.get('detail', f'/posts/{site.hot_post(rng)}/')
+
+
+async def comment(session, site, rng):
+    if not site.post_ids or not await ensure_login(session, site, rng):
+        return
+    post_id = site.hot_post(rng)
+    for number in range(site.burst):
+        await session.post(
+            'comment', f'/posts/{post_id}/comment/',
+            {'text': f'Нагрузочный комментарий {number}'}
+        )
+
+
+async def create(session, site, rng):
+    if not await ensure_login(session, site, rng):
+        return
+    await session.get('create_form', '/posts/create/')
+    fields = {
+        'title': f'Нагрузочный пост {uuid.uuid4().hex[:8]}',
+        'text': 'Текст поста из нагрузочного прогона.',
+        'pub_date': timezone.localtime().strftime('%Y-%m-%dT%H:%M'),
+    }
+    if site.category_ids:
+        fields['category'] = rng.choice(site.category_ids)
+    if site.location_ids:
+        fields['location'] = rng.choice(site.location_ids)
+    await session.post(
+        'create', '/posts/create/', fields,
+        {'image': ('load.png', 'image/png', tiny_png())}
+    )
+
+
+SCENARIOS = {
+    'feed': feed,
+    'detail': detail,
+    'comment': comment,
+    'login': login,
+    'create': create,
+}
+
+
+async def run(host, port, site, mix, clients, duration, seed=None,
+              think=0.0):
+    """Гоняет clients пользователей duration секунд; (время, Recorder)."""
+    recorder = Recorder()
+    names = list(mix)
+    weights = list(itertools.accumulate(mix.values()))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+
+    async def user(number):
+        rng = random.Random(None if seed is None else seed + number)
+        session = Session(host, port, recorder)
+        while loop.time() < deadline:
+            scenario = rng.choices(names, cum_weights=weights)[0]
+            await SCENARIOS[scenario](session, site, rng)
+            if think:
+                await asyncio.sleep(rng.expovariate(1 / think))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(number) for number in range(clients)))
+    return time.perf_counter() - started, recorder
+
+
+def parse_metrics(text):
+    """Текст Prometheus -> {строка с метками: значение}."""
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            series, _, value = line.rpartition(' ')
+            values[series] = float(value)
+    return values
+
+
+def metrics_delta(before, after):
+    """Прирост серий сервера за прогон."""
+    return {
+        series: value - before.get(series, 0.0)
+        for series, value in after.items()
+        if value != before.get(series, 0.0)
+    }
+
+
+def server_summary(delta):
+    """
+    Из прироста метрик: по представлениям — число запросов и среднее
+    время на сервере; отдельно — счётчики событий (*_total).
+    """
+    views = {}
+    counters = {}
+    for series, value in delta.items():
+        name, _, labels = series.partition('{')
+        if name.endswith('_total'):
+            counters[series] = value
+        elif name in (REQUEST_METRIC + '_count', REQUEST_METRIC + '_sum'):
+            view = labels.split('"')[1]
+            views.setdefault(view, {})[name.rsplit('_', 1)[1]] = value
+    return {
+        view: (int(values['count']), values['sum'] / values['count'])
+        for view, values in views.items() if values.get('count')
+    }, counters
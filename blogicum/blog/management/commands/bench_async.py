@@ -0,0 +1,110 @@
+import asyncio
+import statistics
+import time
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+
+SCENARIOS = (
+    ('sync', '/'),
+    ('async', '/async/'),
+)
+
+
+async def _request(application, path, send_delay):
+    """Один запрос медленного клиента: каждое сообщение он читает долго."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'127.0.0.1')],
+        'client': ('127.0.0.1', 0),
+        'server': ('127.0.0.1', 8000),
+    }
+    disconnected = asyncio.Event()
+    request_sent = False
+    status = None
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        await asyncio.sleep(send_delay)
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return status
+
+
+async def _run(application, path, clients, requests, send_delay):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(path)
+
+    async def client():
+        nonlocal errors
+        while not queue.empty():
+            url = queue.get_nowait()
+            started = time.perf_counter()
+            status = await _request(application, url, send_delay)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return time.perf_counter() - started, latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность синхронных и асинхронных '
+        'страниц под ASGI при множестве медленных клиентов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--send-delay', type=float, default=0.05,
+            help='Задержка клиента на каждое сообщение ответа, секунды.'
+        )
+        parser.add_argument(
+            '--path', default='',
+            help='Суффикс пути, например posts/1/ или category/travel/.'
+        )
+
+    def handle(self, *args, **options):
+        application = get_asgi_application()
+        for name, prefix in SCENARIOS:
+            elapsed, latencies, errors = asyncio.run(_run(
+                application,
+                prefix + options['path'],
+                options['clients'],
+                options['requests'],
+                options['send_delay'],
+            ))
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f'{name:>5}: {len(latencies) / elapsed:8.1f} запр/с, '
+                f'медиана {statistics.median(latencies) * 1000:7.1f} мс, '
+                f'p95 {p95 * 1000:7.1f} мс, ошибок {errors}'
+            )
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+
+from blog.comment_buffer import comment_buffer
+from blog.models import Comment, Post
+
+User = get_user_model()
+
+
+def _writer(post_id, user, deadline, statuses, lock):
+    client = Client(HTTP_HOST='127.0.0.1')
+    client.force_login(user)
+    url = f'/posts/{post_id}/comment/'
+    local = Counter()
+    while time.perf_counter() < deadline:
+        response = client.post(url, {'text': 'Нагрузочный комментарий'})
+        local[response.status_code] += 1
+    connections.close_all()
+    with lock:
+        statuses.update(local)
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест записи комментариев: несколько потоков '
+        'комментируют один пост, команда печатает пропускную способность.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('post_id', type=int)
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument(
+            '--buffer', action='store_true',
+            help='Включить буфер отложенной записи комментариев.'
+        )
+        parser.add_argument(
+            '--no-limits', action='store_true',
+            help='Отключить ограничение частоты комментариев.'
+        )
+
+    def handle(self, *args, **options):
+        if not Post.objects.filter(pk=options['post_id']).exists():
+            raise CommandError('Пост не найден.')
+        users = [
+            User.objects.get_or_create(username=f'bench_writer_{number}')[0]
+            for number in range(options['writers'])
+        ]
+        # Панель отладки рендерится на каждый ответ и исказит замер.
+        overrides = {'BLOG_COMMENT_BUFFER': options['buffer'], 'DEBUG': False}
+        if options['no_limits']:
+            overrides['BLOG_COMMENT_RATE_LIMITS'] = {
+                'user': (10 ** 6, 10 ** 6),
+                'post': (10 ** 6, 10 ** 6),
+            }
+        before = Comment.objects.filter(post_id=options['post_id']).count()
+        statuses = Counter()
+        lock = threading.Lock()
+        with override_settings(**overrides):
+            started = time.perf_counter()
+            deadline = started + options['seconds']
+            threads = [
+                threading.Thread(target=_writer, args=(
+                    options['post_id'], user, deadline, statuses, lock
+                ))
+                for user in users
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            comment_buffer.flush()
+            elapsed = time.perf_counter() - started
+        saved = (
+            Comment.objects.filter(post_id=options['post_id']).count()
+            - before
+        )
+        self.stdout.write(
+            f'Запросов: {sum(statuses.values())} '
+            f'({dict(statuses)}), сохранено комментариев: {saved}, '
+            f'{saved / elapsed:.1f} комм/с за {elapsed:.1f} с'
+        )
@@ -0,0 +1,77 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.template.loader import get_template
+from django.utils import timezone
+
+from blog.models import Category, Location, Post
+
+User = get_user_model()
+
+CARD = 'includes/post_card.html'
+CATEGORY_LINK = '{% include "includes/category_link.html" %}'
+
+
+def _source(template_name):
+    return get_template(template_name).template.source
+
+
+def _page_template(tag):
+    """Страница из карточек постов; адреса строит указанный тег."""
+    card = _source(CARD).replace(
+        CATEGORY_LINK, _source('includes/category_link.html')
+    )
+    return Template(
+        '{% for post in posts %}'
+        + card.replace('{% blog_url ', '{% ' + tag + ' ')
+        + '{% endfor %}'
+    )
+
+
+def _posts(count):
+    """Несохранённые посты: замер не должен зависеть от базы."""
+    category = Category(slug='bench', title='Замер', is_published=True)
+    location = Location(name='Замер', is_published=True)
+    return [
+        Post(
+            id=number + 1,
+            title=f'Пост {number}',
+            text='Текст поста для замера ' * 5,
+            pub_date=timezone.now(),
+            is_published=True,
+            author=User(username=f'bench_author_{number}'),
+            category=category,
+            location=location,
+        )
+        for number in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Микробенчмарк: рендер страницы из карточек постов '
+        'с {% url %} и с {% blog_url %}.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=500)
+
+    def handle(self, *args, **options):
+        context = Context({'posts': _posts(options['posts'])})
+        timings = {}
+        for tag in ('url', 'blog_url'):
+            template = _page_template(tag)
+            template.render(context)
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                template.render(context)
+            timings[tag] = (
+                (time.perf_counter() - started) / options['repeat'] * 1000
+            )
+            self.stdout.write(f'{{% {tag} %}}: {timings[tag]:.3f} мс/стр')
+        self.stdout.write(
+            f'Ускорение: {timings["url"] / timings["blog_url"]:.2f}x'
+        )
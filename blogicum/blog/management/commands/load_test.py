@@ -0,0 +1,120 @@
+import asyncio
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from blog import loadtest
+from blog.profiling import make_token
+
+DEFAULT_URL = 'http://127.0.0.1:8000'
+TOKEN_HEADER = 'X-Blog-Profiling-Token'
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает локально запущенный сервер смесью сценариев: лента, '
+        'горячие посты, комментарии, вход и создание постов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', nargs='?', default=DEFAULT_URL)
+        parser.add_argument('--clients', type=int, default=20)
+        parser.add_argument(
+            '--duration', type=float, default=30, help='Секунды.'
+        )
+        parser.add_argument(
+            '--mix', type=loadtest.parse_mix,
+            default=loadtest.DEFAULT_MIX,
+            help='Веса сценариев, например feed=50,detail=30,comment=10.'
+        )
+        parser.add_argument(
+            '--page-skew', type=float, default=1.2,
+            help='Показатель Парето для номера страницы ленты; '
+                 'чем меньше, тем чаще глубокие страницы.'
+        )
+        parser.add_argument(
+            '--hot-skew', type=float, default=1.1,
+            help='Показатель Ципфа для популярности постов.'
+        )
+        parser.add_argument(
+            '--burst', type=int, default=5,
+            help='Комментариев подряд в сценарии comment.'
+        )
+        parser.add_argument(
+            '--users', type=int, default=10,
+            help='Сколько пользователей loadtest* создать для входа.'
+        )
+        parser.add_argument(
+            '--think', type=float, default=0,
+            help='Средняя пауза пользователя между сценариями, секунды.'
+        )
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['base_url'])
+        if url.hostname not in loadtest.LOOPBACK_HOSTS:
+            raise CommandError(
+                'Нагрузочный прогон запускается только на 127.0.0.1.'
+            )
+        host, port = url.hostname, url.port or 80
+        before = self.server_metrics(host, port)
+        site = loadtest.Site.load(
+            options['users'],
+            page_skew=options['page_skew'],
+            hot_skew=options['hot_skew'],
+            burst=options['burst'],
+        )
+        elapsed, recorder = asyncio.run(loadtest.run(
+            host, port, site, options['mix'], options['clients'],
+            options['duration'], options['seed'], options['think']
+        ))
+        self.report(recorder.summary(elapsed), elapsed)
+        after = self.server_metrics(host, port)
+        if before is None or after is None:
+            self.stdout.write('Метрики сервера недоступны.')
+            return
+        views, counters = loadtest.server_summary(
+            loadtest.metrics_delta(before, after)
+        )
+        self.stdout.write('\nНа сервере:')
+        for view, (count, seconds) in sorted(
+                views.items(), key=lambda item: -item[1][0]):
+            self.stdout.write(
+                f'  {view:<28}{count:>8} запросов, '
+                f'в среднем {seconds * 1000:.1f} мс'
+            )
+        for series, value in sorted(counters.items()):
+            self.stdout.write(f'  {series} {value:g}')
+
+    def server_metrics(self, host, port):
+        try:
+            status, _, body = asyncio.run(loadtest.fetch(
+                host, port, 'GET', reverse('blog:metrics'),
+                {TOKEN_HEADER: make_token()}
+            ))
+        except OSError as error:
+            raise CommandError(f'Сервер недоступен: {error}')
+        if status != 200:
+            return None
+        return loadtest.parse_metrics(body.decode())
+
+    def report(self, rows, elapsed):
+        self.stdout.write(
+            f'{"запрос":<12}{"всего":>8}{"запр/с":>9}{"p50, мс":>9}'
+            f'{"p90, мс":>9}{"p99, мс":>9}{"макс.":>9}{"ошибок":>8}'
+            f'{"429":>6}'
+        )
+        for row in rows:
+            self.stdout.write(
+                f'{row["name"]:<12}{row["requests"]:>8}{row["rps"]:>9.1f}'
+                f'{row["p50"] * 1000:>9.1f}{row["p90"] * 1000:>9.1f}'
+                f'{row["p99"] * 1000:>9.1f}{row["max"] * 1000:>9.1f}'
+                f'{row["error_rate"]:>8.1%}{row["limited"]:>6}'
+            )
+        total = sum(row['requests'] for row in rows)
+        errors = sum(row['errors'] for row in rows)
+        self.stdout.write(
+            f'Итого: {total} запросов за {elapsed:.1f} с, '
+            f'{total / elapsed:.1f} запр/с, ошибок {errors}'
+        )
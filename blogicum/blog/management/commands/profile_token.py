@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = (
+        'Печатает значение заголовка X-Blog-Profile: запрос с ним '
+        'будет профилирован.'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
+        self.stderr.write(
+            f'Действует {settings.BLOG_PROFILE_TOKEN_MAX_AGE} с.'
+        )
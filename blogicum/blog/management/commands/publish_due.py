@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.publishing import publish_due
+
+
+class Command(BaseCommand):
+    help = 'Открывает отложенные публикации, дата которых наступила.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять каждые N секунд (режим воркера).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            published = publish_due()
+            if published:
+                self.stdout.write(f'Опубликовано постов: {len(published)}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
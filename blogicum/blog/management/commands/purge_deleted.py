@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.deletion import DELETE_BATCH_SIZE, purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Физически удаляет посты и комментарии, удалённые раньше '
+        'срока хранения. Запускать вне часов пик.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.BLOG_DELETED_RETENTION_DAYS,
+            help='Сколько дней хранить удалённые записи.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DELETE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        purge_deleted(
+            timezone.now() - timedelta(days=options['days']),
+            options['batch_size']
+        )
+        self.stdout.write('Удалённые записи очищены.')
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from blog import query_stats
+from blog.models import QueryStat
+
+ORDERS = {
+    'total': '-total_time',
+    'calls': '-calls',
+    'max': '-max_time',
+    'rows': '-rows',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Самые тяжёлые запросы по отпечаткам и представления, '
+        'из которых они пришли.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--order', choices=ORDERS, default='total',
+            help='По чему сортировать: общее время, вызовы, максимум, строки.'
+        )
+        parser.add_argument(
+            '--flush', action='store_true',
+            help='Сначала сохранить статистику этого процесса.'
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Очистить сохранённую статистику.'
+        )
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            query_stats.flush()
+        if options['reset']:
+            QueryStat.objects.all().delete()
+            self.stdout.write('Статистика запросов очищена.')
+            return
+        stats = QueryStat.objects.order_by(
+            ORDERS[options['order']]
+        )[:options['limit']]
+        for stat in stats:
+            self.stdout.write(
+                f'{stat.calls:>8} вызовов  '
+                f'{stat.total_time * 1000:>10.1f} мс всего  '
+                f'{stat.mean_time * 1000:>7.2f} мс в среднем  '
+                f'{stat.max_time * 1000:>7.2f} мс макс.  '
+                f'{stat.rows:>8} строк'
+            )
+            self.stdout.write(f'    {stat.fingerprint}')
+            views = ', '.join(
+                f'{view} ({calls})' for view, calls in stat.top_views()
+            )
+            self.stdout.write(f'    из: {views}')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import FeedEntry
+from blog.timeline import rebuild_feed
+
+
+class Command(BaseCommand):
+    help = 'Заново собирает ленту главной страницы из видимых публикаций.'
+
+    def handle(self, *args, **options):
+        rebuild_feed()
+        self.stdout.write(
+            f'Записей в ленте: {FeedEntry.objects.count()}.'
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики публикаций категорий, мест и профилей.'
+
+    def handle(self, *args, **options):
+        reconcile_counters()
+        self.stdout.write('Счётчики пересчитаны.')
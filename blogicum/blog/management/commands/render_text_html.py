@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Comment, Post
+
+RENDER_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Заполняет готовый HTML текста постов и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перерисовать и уже заполненные записи.'
+        )
+
+    def handle(self, *args, **options):
+        for model in (Post, Comment):
+            queryset = model.all_objects.only('id', 'text')
+            if not options['all']:
+                queryset = queryset.filter(text_html='')
+            rendered = last_id = 0
+            while True:
+                batch = list(queryset.filter(
+                    id__gt=last_id
+                ).order_by('id')[:RENDER_BATCH_SIZE])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                for obj in batch:
+                    obj.render_html()
+                model.all_objects.bulk_update(batch, ('text_html',))
+                rendered += len(batch)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: {rendered}'
+            )
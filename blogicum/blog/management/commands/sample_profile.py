@@ -0,0 +1,77 @@
+import json
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from blog.profiling import make_token
+from blog.sampling import DEFAULT_INTERVAL, DEFAULT_SECONDS
+
+TOKEN_HEADER = 'X-Blog-Profiling-Token'
+POLL_INTERVAL = 0.5
+# Сколько ждать файла сверх времени семплирования.
+SAVE_TIMEOUT = 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает семплирующий профилировщик в работающем воркере '
+        'и сохраняет свёрнутые стеки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'base_url', help='Адрес воркера, например http://127.0.0.1:8000'
+        )
+        parser.add_argument('--seconds', type=float, default=DEFAULT_SECONDS)
+        parser.add_argument(
+            '--interval', type=float, default=DEFAULT_INTERVAL
+        )
+        parser.add_argument(
+            '--output', type=Path,
+            help='Куда сохранить стеки; по умолчанию — в stdout.'
+        )
+
+    def fetch(self, url, token):
+        request = Request(url, headers={TOKEN_HEADER: token})
+        with urlopen(request) as response:
+            return response.read()
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        token = make_token()
+        query = urlencode({
+            'seconds': options['seconds'], 'interval': options['interval']
+        })
+        try:
+            started = json.loads(self.fetch(
+                f'{base_url}{reverse("blog:profiling_sample")}?{query}', token
+            ))
+        except HTTPError as error:
+            raise CommandError(
+                f'Воркер ответил {error.code}: {error.read().decode()}'
+            )
+        self.stderr.write(
+            f'Семплирование {started["seconds"]} с, файл {started["name"]}'
+        )
+        download_url = base_url + reverse(
+            'blog:profiling_download', args=(started['name'],)
+        )
+        deadline = time.monotonic() + started['seconds'] + SAVE_TIMEOUT
+        time.sleep(started['seconds'])
+        while True:
+            try:
+                stacks = self.fetch(download_url, token)
+                break
+            except HTTPError as error:
+                if error.code != 404 or time.monotonic() > deadline:
+                    raise CommandError(f'Не удалось получить стеки: {error}')
+                time.sleep(POLL_INTERVAL)
+        if options['output']:
+            options['output'].write_bytes(stacks)
+        else:
+            self.stdout.write(stacks.decode())
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Выполняется в чистом интерпретаторе: загрузка WSGI-приложения
+# и первый запрос к нему.
+COLD_START_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+from blogicum.wsgi import application
+booted = time.perf_counter()
+statuses = []
+application({
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'wsgi.url_scheme': 'http', 'wsgi.input': sys.stdin.buffer,
+    'wsgi.errors': sys.stderr,
+}, lambda status, headers, exc_info=None: statuses.append(status))
+answered = time.perf_counter()
+print(json.dumps({
+    'boot': booted - started,
+    'first_response': answered - booted,
+    'status': int(statuses[0].split()[0]),
+    'debug_toolbar_loaded': 'debug_toolbar' in sys.modules,
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """Собственное время импорта по пакетам верхнего уровня, микросекунды."""
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        packages[name.strip().split('.')[0]] += int(own)
+    return packages
+
+
+def cold_start(path, settings_module):
+    """Запускает свежий процесс и возвращает его замеры и профиль импорта."""
+    environment = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', COLD_START_SCRIPT, path],
+        cwd=settings.BASE_DIR, env=environment, capture_output=True,
+        text=True, stdin=subprocess.DEVNULL
+    )
+    if result.returncode:
+        raise CommandError(result.stderr[-2000:])
+    report = json.loads(result.stdout.splitlines()[-1])
+    report['imports'] = parse_importtime(result.stderr)
+    return report
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет холодный старт воркера: импорт с -X importtime, '
+        'загрузку приложения и первый ответ.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/pages/about/')
+        parser.add_argument(
+            '--settings-module', default='blogicum.production_settings'
+        )
+        parser.add_argument('--top', type=int, default=15)
+        parser.add_argument(
+            '--json', action='store_true', help='Вывести отчёт в JSON.'
+        )
+
+    def handle(self, *args, **options):
+        report = cold_start(options['path'], options['settings_module'])
+        imports = report.pop('imports')
+        if options['json']:
+            report['imports_us'] = dict(imports.most_common(options['top']))
+            self.stdout.write(json.dumps(report))
+            return
+        self.stdout.write(
+            f'Загрузка: {report["boot"] * 1000:.0f} мс, '
+            f'первый ответ ({report["status"]}): '
+            f'{report["first_response"] * 1000:.0f} мс, '
+            f'импорт всего: {sum(imports.values()) / 1000:.0f} мс'
+        )
+        for package, spent in imports.most_common(options['top']):
+            self.stdout.write(f'{spent / 1000:8.1f} мс  {package}')
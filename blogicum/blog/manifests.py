@@ -0,0 +1,39 @@
+"""
+Манифесты полей шаблонов.
+
+Для каждого шаблона, который выводит список записей, перечислены поля,
+которые он читает. Запросы для таких шаблонов загружают только эти
+колонки: без пароля и почты автора, описания категории и прочего.
+Если шаблон начнёт читать поле не из манифеста, Django догрузит его
+отдельным запросом на каждую строку — это ловит тест манифестов.
+"""
+TEMPLATE_FIELDS = {
+    'includes/post_card.html': (
+        'id',
+        'title',
+        # Карточка обрезает текст по словам, поэтому он нужен целиком.
+        'text',
+        'pub_date',
+        'image',
+        'is_published',
+        'author__username',
+        'category__slug',
+        'category__title',
+        'category__is_published',
+        'location__name',
+        'location__is_published',
+    ),
+    'includes/comments.html': (
+        'id',
+        'text',
+        'text_html',
+        'created_at',
+        'post',
+        'author__username',
+    ),
+}
+
+
+def only_for(queryset, template_name):
+    """Ограничивает загрузку колонками из манифеста шаблона."""
+    return queryset.only(*TEMPLATE_FIELDS[template_name])
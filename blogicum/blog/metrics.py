@@ -0,0 +1,98 @@
+"""
+Метрики процесса в текстовом формате Prometheus.
+
+Значения копятся в памяти воркера, поэтому при нескольких воркерах
+каждый отдаёт свои; сборщик складывает их сам.
+"""
+import threading
+from collections import defaultdict
+
+from django.http import HttpResponse
+
+from .profiling import staff_or_token_required
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_lock = threading.Lock()
+_help = {}
+_counters = defaultdict(float)
+# (имя, метки) -> [число, сумма, максимум]
+_summaries = {}
+
+
+def _key(name, labels):
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def describe(name, text):
+    _help[name] = text
+
+
+def increment(name, labels=None, amount=1):
+    with _lock:
+        _counters[_key(name, labels)] += amount
+
+
+def observe(name, value, labels=None, count=1):
+    """
+    Учитывает count наблюдений с суммарным значением value;
+    максимум берётся по значениям value.
+    """
+    key = _key(name, labels)
+    with _lock:
+        summary = _summaries.setdefault(key, [0, 0.0, 0.0])
+        summary[0] += count
+        summary[1] += value
+        summary[2] = max(summary[2], value)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _summaries.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name, str(value).replace('\\', '\\\\').replace('"', '\\"')
+        )
+        for name, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def _header(lines, name, kind):
+    if name in _help:
+        lines.append(f'# HELP {name} {_help[name]}')
+    lines.append(f'# TYPE {name} {kind}')
+
+
+def render():
+    with _lock:
+        counters = sorted(_counters.items())
+        summaries = sorted(
+            (key, tuple(value)) for key, value in _summaries.items()
+        )
+    lines = []
+    seen = set()
+    for (name, labels), value in counters:
+        if name not in seen:
+            seen.add(name)
+            _header(lines, name, 'counter')
+        lines.append(f'{name}{_labels(labels)} {value:g}')
+    for (name, labels), (count, total, maximum) in summaries:
+        if name not in seen:
+            seen.add(name)
+            _header(lines, name, 'summary')
+        lines.append(f'{name}_count{_labels(labels)} {count}')
+        lines.append(f'{name}_sum{_labels(labels)} {total:.6f}')
+        lines.append(f'{name}_max{_labels(labels)} {maximum:.6f}')
+    return '\n'.join(lines) + '\n'
+
+
+@staff_or_token_required
+def metrics_view(request):
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,12 @@
+from .publishing import publish_if_due
+
+
+class ScheduledPublishMiddleware:
+    """Открывает отложенные публикации, как только наступает их время."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        publish_if_due()
+        return self.get_response(request)
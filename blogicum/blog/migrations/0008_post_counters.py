@@ -0,0 +1,79 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    ProfileStats = apps.get_model('blog', 'ProfileStats')
+
+    def count(field, **filters):
+        return Coalesce(Subquery(
+            Post.objects.filter(
+                **{field: OuterRef('pk')}, **filters
+            ).order_by().values(field).annotate(
+                total=Count('id')
+            ).values('total')
+        ), 0)
+
+    ProfileStats.objects.bulk_create(
+        [ProfileStats(user_id=pk) for pk in Post.objects.values_list(
+            'author_id', flat=True
+        ).distinct()],
+        ignore_conflicts=True
+    )
+    for model, field in (
+            (apps.get_model('blog', 'Category'), 'category'),
+            (apps.get_model('blog', 'Location'), 'location'),
+            (ProfileStats, 'author')):
+        model.objects.update(
+            posts_count=count(field),
+            published_posts_count=count(field, is_visible=True)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0007_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileStats',
+            fields=[
+                ('posts_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Всего публикаций')),
+                ('published_posts_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано публикаций')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'статистика профиля',
+                'verbose_name_plural': 'Статистика профилей',
+            },
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Всего публикаций'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='published_posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано публикаций'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Всего публикаций'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='published_posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано публикаций'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+from django.utils.text import Truncator
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    rows = Post.objects.filter(is_visible=True).annotate(
+        comment_count=Count('comments')
+    ).values(
+        'id', 'pub_date', 'title', 'text', 'image',
+        'author_id', 'author__username',
+        'category_id', 'category__slug', 'category__title',
+        'location_id', 'location__name', 'location__is_published',
+        'comment_count',
+    )
+    FeedEntry.objects.bulk_create((
+        FeedEntry(
+            post_id=row['id'],
+            pub_date=row['pub_date'],
+            title=row['title'],
+            excerpt=Truncator(row['text']).words(10),
+            image=row['image'] or '',
+            author_id=row['author_id'],
+            author_username=row['author__username'],
+            category_id=row['category_id'],
+            category_slug=row['category__slug'],
+            category_title=row['category__title'],
+            location_id=row['location_id'],
+            location_name=(
+                row['location__name'] if row['location__is_published']
+                else None
+            ),
+            comment_count=row['comment_count'],
+        ) for row in rows.iterator()
+    ), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('excerpt', models.TextField(verbose_name='Начало текста')),
+                ('image', models.CharField(blank=True, max_length=100, verbose_name='Фото')),
+                ('author_id', models.BigIntegerField()),
+                ('author_username', models.CharField(max_length=150, verbose_name='Автор')),
+                ('category_id', models.BigIntegerField()),
+                ('category_slug', models.SlugField(verbose_name='Идентификатор категории')),
+                ('category_title', models.CharField(max_length=256, verbose_name='Категория')),
+                ('location_id', models.BigIntegerField(null=True)),
+                ('location_name', models.CharField(max_length=256, null=True, verbose_name='Местоположение')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментарии')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='blog_feed_pub_date_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_feed_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Пост ждёт фонового удаления.', null=True, verbose_name='Удалена'),
+        ),
+    ]
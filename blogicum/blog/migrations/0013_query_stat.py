@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_text_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=40, unique=True, verbose_name='Отпечаток')),
+                ('fingerprint', models.TextField(verbose_name='Запрос')),
+                ('calls', models.PositiveBigIntegerField(default=0, verbose_name='Вызовов')),
+                ('total_time', models.FloatField(default=0, verbose_name='Всего, с')),
+                ('max_time', models.FloatField(default=0, verbose_name='Максимум, с')),
+                ('rows', models.PositiveBigIntegerField(default=0, verbose_name='Строк')),
+                ('views', models.JSONField(default=dict, help_text='Сколько раз запрос выполнило каждое представление.', verbose_name='Представления')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'статистика запроса',
+                'verbose_name_plural': 'Статистика запросов',
+                'ordering': ('-total_time',),
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+def dates_to_datetimes(apps, schema_editor):
+    # SQLite хранит дату строкой «ГГГГ-ММ-ДД», а такую строку поле
+    # DateTimeField не разбирает; PostgreSQL приводит тип сам.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "UPDATE blog_comment SET deleted_at = deleted_at || ' 00:00:00' "
+        'WHERE length(deleted_at) = 10'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_query_stat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Удалён'),
+        ),
+        migrations.RunPython(dates_to_datetimes, migrations.RunPython.noop),
+    ]
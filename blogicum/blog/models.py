@@ -2,17 +2,43 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from .text import render_text
+
 User = get_user_model()
 
 
-class BaseManager(models.Manager):
+LOADED_STATE = frozenset(
+    ('category_id', 'location_id', 'author_id', 'is_visible')
+)
+
+
+def visible_posts_q(now):
+    """Условие видимости публикации в момент now."""
+    return models.Q(
+        pub_date__lte=now,
+        is_published=True,
+        category__is_published=True,
+        deleted_at__isnull=True
+    )
+
+
+def comment_count():
+    """Число неудалённых комментариев публикации."""
+    return models.Count(
+        'comments', filter=models.Q(comments__deleted_at__isnull=True)
+    )
+
+
+class LiveManager(models.Manager):
+    """Менеджер без мягко удалённых записей."""
+
     def get_queryset(self):
-        current_time = timezone.now()
-        return super().get_queryset().filter(
-            pub_date__lte=current_time,
-            is_published=True,
-            category__is_published=True
-        )
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class BaseManager(LiveManager):
+    def get_queryset(self):
+        return super().get_queryset().filter(is_visible=True)
 
     def new_select_related(self):
         return self.select_related(
@@ -37,7 +63,45 @@ class BaseModel(models.Model):
         abstract = True
 
 
-class Category(BaseModel):
+class PostCountersModel(models.Model):
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Всего публикаций'
+    )
+    published_posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Опубликовано публикаций'
+    )
+
+    class Meta:
+        abstract = True
+
+
+class RenderedTextModel(models.Model):
+    text_html = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Текст в HTML'
+    )
+
+    class Meta:
+        abstract = True
+
+    def render_html(self):
+        self.text_html = render_text(self.text)
+
+    def save(self, *args, **kwargs):
+        self.render_html()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'text_html'}
+        super().save(*args, **kwargs)
+
+
+class Category(BaseModel, PostCountersModel):
     title = models.CharField(
         max_length=256,
         verbose_name='Заголовок'
@@ -60,7 +124,7 @@ class Category(BaseModel):
         return self.title
 
 
-class Location(BaseModel):
+class Location(BaseModel, PostCountersModel):
     name = models.CharField(
         max_length=256,
         verbose_name='Название места'
@@ -74,7 +138,7 @@ class Location(BaseModel):
         return self.name
 
 
-class Post(BaseModel):
+class Post(BaseModel, RenderedTextModel):
     title = models.CharField(
         max_length=256,
         verbose_name='Заголовок'
@@ -111,19 +175,75 @@ class Post(BaseModel):
         upload_to='posts_images',
         verbose_name='Фото'
     )
+    is_visible = models.BooleanField(
+        default=False,
+        db_index=True,
+        editable=False,
+        verbose_name='Видна в ленте',
+        help_text=('Вычисляется при сохранении и при наступлении '
+                   'даты публикации.')
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Удалена',
+        help_text='Удалённый пост хранится до очистки purge_deleted.'
+    )
 
-    objects = models.Manager()
+    objects = LiveManager()
     new_objects = BaseManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = (
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='blog_post_live_author_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            models.Index(
+                fields=('deleted_at',),
+                name='blog_post_deleted_idx',
+                condition=models.Q(deleted_at__isnull=False)
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        # Ключи и видимость на момент загрузки: по ним сигналы решают,
+        # какие счётчики пересчитать, без повторного запроса.
+        post.loaded_state = (
+            (post.category_id, post.location_id, post.author_id,
+             post.is_visible)
+            if LOADED_STATE.issubset(field_names) else None
+        )
+        return post
+
+    def compute_visibility(self, now=None):
+        return (
+            self.is_published
+            and self.deleted_at is None
+            and self.pub_date <= (now or timezone.now())
+            and self.category_id is not None
+            and self.category.is_published
+        )
+
+    def save(self, *args, **kwargs):
+        self.is_visible = self.compute_visibility()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
 
-class Comment(models.Model):
+
+class Comment(RenderedTextModel):
     text = models.TextField(
         verbose_name='Текст'
     )
@@ -140,9 +260,161 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         related_name='comments'
     )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Удалён'
+    )
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='blog_comment_live_post_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            models.Index(
+                fields=('deleted_at',),
+                name='blog_comment_deleted_idx',
+                condition=models.Q(deleted_at__isnull=False)
+            ),
+        )
 
     def __str__(self):
         return 'Комментарий'
+
+
+class ProfileStats(PostCountersModel):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь'
+    )
+
+    class Meta:
+        verbose_name = 'статистика профиля'
+        verbose_name_plural = 'Статистика профилей'
+
+    def __str__(self):
+        return str(self.user)
+
+
+class FeedEntry(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата и время публикации'
+    )
+    title = models.CharField(
+        max_length=256,
+        verbose_name='Заголовок'
+    )
+    excerpt = models.TextField(
+        verbose_name='Начало текста'
+    )
+    image = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Фото'
+    )
+    author_id = models.BigIntegerField()
+    author_username = models.CharField(
+        max_length=150,
+        verbose_name='Автор'
+    )
+    category_id = models.BigIntegerField()
+    category_slug = models.SlugField(
+        verbose_name='Идентификатор категории'
+    )
+    category_title = models.CharField(
+        max_length=256,
+        verbose_name='Категория'
+    )
+    location_id = models.BigIntegerField(null=True)
+    location_name = models.CharField(
+        max_length=256,
+        null=True,
+        verbose_name='Местоположение'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Комментарии'
+    )
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-post'),
+                name='blog_feed_pub_date_idx'
+            ),
+        )
+
+    def __str__(self):
+        return self.title
+
+
+class QueryStat(models.Model):
+    digest = models.CharField(
+        max_length=40,
+        unique=True,
+        verbose_name='Отпечаток'
+    )
+    fingerprint = models.TextField(
+        verbose_name='Запрос'
+    )
+    calls = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Вызовов'
+    )
+    total_time = models.FloatField(
+        default=0,
+        verbose_name='Всего, с'
+    )
+    max_time = models.FloatField(
+        default=0,
+        verbose_name='Максимум, с'
+    )
+    rows = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Строк'
+    )
+    views = models.JSONField(
+        default=dict,
+        verbose_name='Представления',
+        help_text='Сколько раз запрос выполнило каждое представление.'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Обновлено'
+    )
+
+    class Meta:
+        verbose_name = 'статистика запроса'
+        verbose_name_plural = 'Статистика запросов'
+        ordering = ('-total_time',)
+
+    def __str__(self):
+        return self.fingerprint[:80]
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.calls if self.calls else 0
+
+    def top_views(self, limit=3):
+        return sorted(
+            self.views.items(), key=lambda item: -item[1]
+        )[:limit]
@@ -0,0 +1,16 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class CountedPaginator(Paginator):
+    """Пагинатор с заранее известным числом объектов (без COUNT(*))."""
+
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.known_count = count
+
+    @cached_property
+    def count(self):
+        if self.known_count is None:
+            return super().count
+        return self.known_count
@@ -0,0 +1,170 @@
+"""
+Профилирование отдельного запроса на боевом сервере.
+
+Профиль снимается, только если запрос пришёл с подписанным заголовком
+X-Blog-Profile (значение выдаёт команда profile_token) или сотрудник
+добавил к адресу ?profile=1. Остальные запросы проходят через
+middleware без профилировщика. Результат сохраняется в
+BLOG_PROFILE_DIR в двух видах: .prof для pstats и snakeviz и
+.collapsed — свёрнутые стеки для flamegraph.pl и speedscope.
+"""
+import cProfile
+import os
+import pstats
+import re
+import time
+import uuid
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.utils.text import slugify
+
+HEADER = 'HTTP_X_BLOG_PROFILE'
+# Тем же значением открывается доступ к профилям без входа сотрудника;
+# отдельный заголовок, чтобы сами эти запросы не профилировались.
+ACCESS_HEADER = 'HTTP_X_BLOG_PROFILING_TOKEN'
+QUERY_PARAM = 'profile'
+TOKEN_SALT = 'blog.profiling'
+TOKEN_VALUE = 'profile'
+PROFILE_NAME_RE = re.compile(r'[\w-]+\.(prof|collapsed)')
+# Глубже стеки не разворачиваются, а доли меньше микросекунды
+# отбрасываются: иначе дерево вызовов Django разрастается без пользы.
+MAX_STACK_DEPTH = 64
+MIN_FRAME_SECONDS = 1e-6
+
+
+def make_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(TOKEN_VALUE)
+
+
+def _valid_token(token):
+    try:
+        return signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=settings.BLOG_PROFILE_TOKEN_MAX_AGE
+        ) == TOKEN_VALUE
+    except signing.BadSignature:
+        return False
+
+
+def is_requested(request):
+    token = request.META.get(HEADER)
+    if token:
+        return _valid_token(token)
+    # Строку запроса разбираем, только если в ней есть параметр.
+    if QUERY_PARAM not in request.META.get('QUERY_STRING', ''):
+        return False
+    return (
+        request.GET.get(QUERY_PARAM) == '1'
+        and request.user.is_staff
+    )
+
+
+def frame_label(func):
+    """Подпись кадра: функция, файл и строка её объявления."""
+    filename, lineno, name = func
+    return f'{name} ({os.path.basename(filename)}:{lineno})'
+
+
+def _main_caller(func, callers, stats):
+    """Вызывающий, из которого функция провела больше всего времени."""
+    profiled = {
+        caller: cumulative for caller, (*_, cumulative) in callers.items()
+        if caller in stats.stats and caller != func
+    }
+    return max(profiled, key=profiled.get) if profiled else None
+
+
+def collapsed_stacks(stats):
+    """
+    Свёрнутые стеки из профиля cProfile.
+
+    cProfile хранит только пары «вызывающий — вызываемый», а не стеки,
+    поэтому стек функции восстанавливается по цепочке её основных
+    вызывающих, и всё её собственное время относится к этому стеку.
+    Для поиска горячих мест этого хватает; точные стеки даёт
+    семплирующий профилировщик.
+    """
+    parents = {
+        func: _main_caller(func, callers, stats)
+        for func, (*_, callers) in stats.stats.items()
+    }
+    stacks = Counter()
+    for func, (_, _, own, _, _) in stats.stats.items():
+        if own < MIN_FRAME_SECONDS:
+            continue
+        stack = [func]
+        parent = parents[func]
+        while (parent is not None and parent not in stack
+               and len(stack) < MAX_STACK_DEPTH):
+            stack.append(parent)
+            parent = parents[parent]
+        stacks[';'.join(map(frame_label, reversed(stack)))] += own
+    return '\n'.join(
+        f'{stack} {round(seconds * 1_000_000)}'
+        for stack, seconds in sorted(stacks.items())
+    ) + '\n'
+
+
+def save_profile(profiler, request):
+    """Сохраняет профиль и свёрнутые стеки, возвращает имя профиля."""
+    directory = Path(settings.BLOG_PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = '-'.join((
+        time.strftime('%Y%m%d-%H%M%S'),
+        slugify(request.path) or 'index',
+        uuid.uuid4().hex[:6],
+    ))
+    profiler.dump_stats(directory / f'{name}.prof')
+    (directory / f'{name}.collapsed').write_text(
+        collapsed_stacks(pstats.Stats(profiler)), encoding='utf-8'
+    )
+    return name
+
+
+class ProfilingMiddleware:
+    """Профилирует представление и рендер шаблона по запросу."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_requested(request):
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        response['X-Blog-Profile'] = save_profile(profiler, request)
+        return response
+
+
+def staff_or_token_required(view):
+    """Пускает сотрудников и запросы с подписанным токеном доступа."""
+    staff_view = staff_member_required(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = request.META.get(ACCESS_HEADER)
+        if token and _valid_token(token):
+            return view(request, *args, **kwargs)
+        return staff_view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@staff_or_token_required
+def download(request, name):
+    """Отдаёт сохранённый профиль сотруднику."""
+    if not PROFILE_NAME_RE.fullmatch(name):
+        raise Http404
+    path = Path(settings.BLOG_PROFILE_DIR) / name
+    if not path.is_file():
+        raise Http404
+    return FileResponse(path.open('rb'), as_attachment=True)
@@ -0,0 +1,103 @@
+import time
+
+from django.db.models import Min
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import shared_cache
+from .models import Post, visible_posts_q
+
+GENERATION_KEY = 'blog:generation'
+NEXT_PUBLISH_KEY = 'blog:next_publish'
+NEXT_PUBLISH_TIMEOUT = 60 * 5
+NOTHING_SCHEDULED = 'none'
+
+# Массовая смена видимости (bulk update не вызывает post_save).
+visibility_changed = Signal()
+
+
+def get_generation():
+    """Поколение содержимого: меняется при каждой смене видимых постов."""
+    generation = shared_cache.recall(GENERATION_KEY)
+    if generation is None:
+        shared_cache.shared_cache().add(GENERATION_KEY, time.time_ns(), None)
+        generation = shared_cache.shared_cache().get(GENERATION_KEY)
+        shared_cache.remember(GENERATION_KEY, generation)
+    return generation
+
+
+def bump_generation():
+    # Новое значение, а не incr: два воркера, увеличившие одно и то же
+    # число, получили бы одинаковое поколение для разного содержимого.
+    shared_cache.store(GENERATION_KEY, time.time_ns(), None)
+
+
+def set_visibility(posts, visible):
+    """Переключает is_visible у постов, где он отличается от visible."""
+    post_ids = list(
+        posts.exclude(is_visible=visible).values_list('id', flat=True)
+    )
+    if post_ids:
+        Post.all_objects.filter(id__in=post_ids).update(
+            is_visible=visible
+        )
+        visibility_changed.send(
+            sender=Post, post_ids=post_ids, visible=visible
+        )
+        bump_generation()
+    return post_ids
+
+
+def next_publish_time(now=None):
+    return Post.objects.filter(
+        is_visible=False,
+        is_published=True,
+        category__is_published=True,
+        deleted_at__isnull=True,
+        pub_date__gt=now or timezone.now()
+    ).aggregate(next_publish=Min('pub_date'))['next_publish']
+
+
+def reset_schedule():
+    shared_cache.discard(NEXT_PUBLISH_KEY)
+
+
+def schedule(post):
+    """Учитывает в расписании новую отложенную публикацию."""
+    if post.is_visible or not post.is_published:
+        return
+    next_publish = shared_cache.recall(NEXT_PUBLISH_KEY)
+    if next_publish is None:
+        return
+    moment = post.pub_date.timestamp()
+    if next_publish == NOTHING_SCHEDULED or moment < next_publish:
+        shared_cache.store(NEXT_PUBLISH_KEY, moment, NEXT_PUBLISH_TIMEOUT)
+
+
+def publish_due(now=None):
+    """Открывает посты, чья дата публикации наступила."""
+    now = now or timezone.now()
+    published = set_visibility(
+        Post.objects.filter(visible_posts_q(now)), True
+    )
+    next_publish = next_publish_time(now)
+    shared_cache.store(
+        NEXT_PUBLISH_KEY,
+        next_publish.timestamp() if next_publish else NOTHING_SCHEDULED,
+        NEXT_PUBLISH_TIMEOUT
+    )
+    return published
+
+
+def publish_if_due():
+    """
+    Дешёвая проверка на каждый запрос: запрос к базе только тогда,
+    когда расписание неизвестно или срок ближайшей публикации наступил.
+    """
+    next_publish = shared_cache.recall(NEXT_PUBLISH_KEY)
+    if next_publish == NOTHING_SCHEDULED:
+        return []
+    now = timezone.now()
+    if next_publish is None or next_publish <= now.timestamp():
+        return publish_due(now)
+    return []
@@ -0,0 +1,262 @@
+"""
+Статистика запросов по отпечаткам, как pg_stat_statements для SQLite.
+
+Обёртка выполнения запросов (execute_wrapper) ставится на каждое
+соединение при подключении. Запрос приводится к отпечатку: значения
+уже вынесены в параметры, а списки IN и многострочные VALUES
+сворачиваются. По отпечатку копятся число вызовов, общее и наибольшее
+время, число строк и представления, из которых запрос пришёл. Таблица
+в памяти ограничена BLOG_QUERY_STATS_SIZE отпечатками; при переполнении
+вытесняется самый редкий. Раз в BLOG_QUERY_STATS_FLUSH_INTERVAL секунд
+накопленное складывается в QueryStat, таблица в памяти очищается.
+Счётчики в таблице увеличиваются самим UPDATE, поэтому сбросы из разных
+воркеров не теряют друг друга; если сохранить не удалось, записи
+возвращаются в таблицу в памяти до следующего сброса.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import QueryStat
+
+logger = logging.getLogger(__name__)
+
+NORMALIZERS = (
+    (re.compile(r'IN \((?:%s, )*%s\)'), 'IN (...)'),
+    (re.compile(r'(\(%s(?:, %s)*\))(?:, \1)+'), r'\1, ...'),
+    (re.compile(r'"s\d+_x\d+"'), '"s_x"'),
+    # Числа и строки в запросах, написанных вручную.
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'(?<![\w".])-?\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\s+'), ' '),
+)
+NO_VIEW = '-'
+
+_request = ContextVar('blog_query_stats_request', default=None)
+_paused = ContextVar('blog_query_stats_paused', default=False)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    for pattern, replacement in NORMALIZERS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def current_view():
+    request = _request.get()
+    match = request and request.resolver_match
+    return match.view_name if match else NO_VIEW
+
+
+class Entry:
+    __slots__ = ('calls', 'total_time', 'max_time', 'rows', 'views')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.views = Counter()
+
+
+class StatsTable:
+    """Отпечаток -> Entry, не больше size записей."""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = {}
+        self.last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, sql, seconds, view):
+        key = fingerprint(sql)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                if len(self.entries) >= self.size:
+                    rarest = min(
+                        self.entries, key=lambda k: self.entries[k].calls
+                    )
+                    del self.entries[rarest]
+                entry = self.entries[key] = Entry()
+            entry.calls += 1
+            entry.total_time += seconds
+            entry.max_time = max(entry.max_time, seconds)
+            entry.views[view] += 1
+        return entry
+
+    def add_rows(self, entry, rows):
+        with self._lock:
+            entry.rows += rows
+
+    def take(self):
+        with self._lock:
+            entries, self.entries = self.entries, {}
+            self.last_flush = time.monotonic()
+        return entries
+
+    def put_back(self, entries):
+        """Возвращает несохранённые записи, складывая их с новыми."""
+        with self._lock:
+            for key, entry in entries.items():
+                current = self.entries.get(key)
+                if current is None:
+                    if len(self.entries) < self.size:
+                        self.entries[key] = entry
+                    continue
+                current.calls += entry.calls
+                current.total_time += entry.total_time
+                current.max_time = max(current.max_time, entry.max_time)
+                current.rows += entry.rows
+                current.views.update(entry.views)
+
+    def flush_due(self):
+        interval = settings.BLOG_QUERY_STATS_FLUSH_INTERVAL
+        return (
+            interval is not None and self.entries
+            and time.monotonic() - self.last_flush >= interval
+        )
+
+
+stats = StatsTable(settings.BLOG_QUERY_STATS_SIZE)
+
+
+class RowCountingCursor:
+    """Курсор БД, который считает выбранные строки в записи статистики."""
+
+    def __init__(self, cursor, entry):
+        self.cursor = cursor
+        self.entry = entry
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __iter__(self):
+        for row in self.cursor:
+            stats.add_rows(self.entry, 1)
+            yield row
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        if row is not None:
+            stats.add_rows(self.entry, 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self.cursor.fetchmany(*args, **kwargs)
+        stats.add_rows(self.entry, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        stats.add_rows(self.entry, len(rows))
+        return rows
+
+
+def record_query(execute, sql, params, many, context):
+    if _paused.get():
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        entry = stats.record(
+            sql, time.perf_counter() - started, current_view()
+        )
+        wrapper = context['cursor']
+        cursor = wrapper.cursor
+        if isinstance(cursor, RowCountingCursor):
+            cursor = cursor.cursor
+        if cursor.rowcount > 0:
+            # Изменённые строки; у SELECT rowcount не заполняется.
+            stats.add_rows(entry, cursor.rowcount)
+        wrapper.cursor = RowCountingCursor(cursor, entry)
+
+
+@receiver(connection_created)
+def install(sender, connection, **kwargs):
+    if (settings.BLOG_QUERY_STATS
+            and record_query not in connection.execute_wrappers):
+        connection.execute_wrappers.append(record_query)
+
+
+def save(entries):
+    digests = {
+        hashlib.sha1(key.encode()).hexdigest(): key for key in entries
+    }
+    now = timezone.now()
+    with transaction.atomic():
+        # Строку для отпечатка мог уже создать сброс другого воркера.
+        QueryStat.objects.bulk_create(
+            [QueryStat(digest=digest, fingerprint=key)
+             for digest, key in digests.items()],
+            ignore_conflicts=True
+        )
+        # Представления лежат в JSON и складываются здесь, поэтому строки
+        # блокируются до конца транзакции, в одном порядке во всех воркерах.
+        views = dict(
+            QueryStat.objects.select_for_update()
+            .filter(digest__in=list(digests)).order_by('digest')
+            .values_list('digest', 'views')
+        )
+        for digest, key in sorted(digests.items()):
+            entry = entries[key]
+            QueryStat.objects.filter(digest=digest).update(
+                calls=F('calls') + entry.calls,
+                total_time=F('total_time') + entry.total_time,
+                max_time=Greatest('max_time', Value(entry.max_time)),
+                rows=F('rows') + entry.rows,
+                views=dict(Counter(views[digest]) + entry.views),
+                updated_at=now,
+            )
+
+
+def flush():
+    """Складывает накопленную статистику в QueryStat."""
+    entries = stats.take()
+    if not entries:
+        return 0
+    token = _paused.set(True)
+    try:
+        save(entries)
+    except DatabaseError:
+        logger.exception('Не удалось сохранить статистику запросов')
+        stats.put_back(entries)
+        return 0
+    finally:
+        _paused.reset(token)
+    return len(entries)
+
+
+class QueryStatsMiddleware:
+    """Запоминает запрос для подписи представлений и сбрасывает статистику."""
+
+    def __init__(self, get_response):
+        if not settings.BLOG_QUERY_STATS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request.reset(token)
+        if stats.flush_due():
+            flush()
+        return response
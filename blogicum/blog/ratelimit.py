@@ -0,0 +1,42 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from .shared_cache import shared_cache
+
+_lock = threading.Lock()
+
+
+def take_token(key, rate, burst, now=None):
+    """
+    Корзина жетонов в общем кеше: rate жетонов в секунду, не больше burst.
+
+    Возвращает, сколько секунд ждать следующего жетона; 0 — жетон взят.
+    Внутри воркера чтение и запись идут под блокировкой, а между
+    воркерами не атомарны: одновременные запросы с одним ключом из
+    разных воркеров могут взять один и тот же жетон. Лимит тогда
+    превышается не больше чем на число воркеров минус один за раз.
+    """
+    now = time.time() if now is None else now
+    cache = shared_cache()
+    with _lock:
+        tokens, updated = cache.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        cache.set(key, (tokens, now), math.ceil(burst / rate) + 1)
+    return wait
+
+
+def comment_wait(user_id, post_id):
+    """Сколько секунд пользователю ждать, прежде чем комментировать пост."""
+    limits = settings.BLOG_COMMENT_RATE_LIMITS
+    return max(
+        take_token(f'blog:ratelimit:user:{user_id}', *limits['user']),
+        take_token(f'blog:ratelimit:post:{post_id}', *limits['post']),
+    )
@@ -0,0 +1,143 @@
+"""
+Время рендера шаблонов: дерево шаблонов и include за один запрос.
+
+Template.render оборачивается так же, как это делает тестовое окружение
+Django с Template._render: вне запроса обёртка сразу вызывает исходный
+метод. Повторные include под одним родителем (десять post_card.html
+на странице) сливаются в один узел с числом вызовов. Время узла
+включает время вложенных шаблонов.
+
+Дерево попадает в заголовок Server-Timing, в лог для медленных
+запросов и в метрику blog_template_render_seconds.
+"""
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.base import Template
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+RENDER_METRIC = 'blog_template_render_seconds'
+REQUEST_METRIC = 'blog_request_seconds'
+metrics.describe(
+    RENDER_METRIC,
+    'Время рендера шаблона вместе с вложенными; max — за запрос.'
+)
+metrics.describe(REQUEST_METRIC, 'Время обработки запроса.')
+
+_current = ContextVar('blog_render_node', default=None)
+_original_render = Template.render
+
+
+class RenderNode:
+    __slots__ = ('name', 'calls', 'seconds', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.children = {}
+
+    def child(self, name):
+        if name not in self.children:
+            self.children[name] = RenderNode(name)
+        return self.children[name]
+
+    def walk(self, path=()):
+        """Узлы поддерева с путями от корня, без самого корня."""
+        for child in self.children.values():
+            child_path = (*path, child.name)
+            yield child_path, child
+            yield from child.walk(child_path)
+
+
+def timed_render(self, context):
+    parent = _current.get()
+    if parent is None:
+        return _original_render(self, context)
+    node = parent.child(self.name or '<строка>')
+    token = _current.set(node)
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        node.seconds += time.perf_counter() - started
+        node.calls += 1
+        _current.reset(token)
+
+
+def install():
+    Template.render = timed_render
+
+
+def format_tree(root):
+    return '\n'.join(
+        f'{"  " * (len(path) - 1)}{node.name} ×{node.calls}: '
+        f'{node.seconds * 1000:.1f} мс'
+        for path, node in root.walk()
+    )
+
+
+def server_timing(root, elapsed):
+    """Значение Server-Timing: запрос целиком и самые долгие шаблоны."""
+    nodes = sorted(root.walk(), key=lambda item: -item[1].seconds)
+    entries = [f'app;dur={elapsed * 1000:.1f}']
+    for number, (path, node) in enumerate(
+            nodes[:settings.BLOG_SERVER_TIMING_TEMPLATES]):
+        description = ' > '.join(path)
+        if node.calls > 1:
+            description += f' x{node.calls}'
+        entries.append(
+            f'tpl{number};desc="{description}";dur={node.seconds * 1000:.1f}'
+        )
+    return ', '.join(entries)
+
+
+def record(root, view_name):
+    totals = {}
+    for _, node in root.walk():
+        calls, seconds = totals.get(node.name, (0, 0.0))
+        totals[node.name] = (calls + node.calls, seconds + node.seconds)
+    for name, (calls, seconds) in totals.items():
+        metrics.observe(
+            RENDER_METRIC, seconds,
+            {'view': view_name, 'template': name}, count=calls
+        )
+
+
+class RenderTimingMiddleware:
+    """Собирает дерево рендера шаблонов каждого запроса."""
+
+    def __init__(self, get_response):
+        if not settings.BLOG_TEMPLATE_TIMING:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        root = RenderNode(request.path)
+        token = _current.set(root)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - started
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        metrics.observe(REQUEST_METRIC, elapsed, {'view': view_name})
+        if root.children:
+            response['Server-Timing'] = server_timing(root, elapsed)
+            record(root, view_name)
+        if elapsed >= settings.BLOG_SLOW_REQUEST_SECONDS:
+            logger.warning(
+                'Медленный запрос %s %s: %.1f мс\n%s',
+                request.method, request.path, elapsed * 1000,
+                format_tree(root)
+            )
+        return response
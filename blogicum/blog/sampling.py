@@ -0,0 +1,124 @@
+"""
+Семплирующий профилировщик для работающего воркера.
+
+Поток раз в interval секунд снимает стеки всех потоков процесса через
+sys._current_frames() и копит их в виде свёрнутых стеков. В отличие от
+cProfile он не замедляет каждый вызов, поэтому горячие места вроде
+рендера post_card.html не искажаются. Учитываются только потоки,
+которые обрабатывают запрос: стек начинается с имени представления,
+а рендер каждого шаблона отмечен кадром [template имя].
+"""
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.http import JsonResponse
+from django.template.base import Template
+
+from .profiling import frame_label, staff_or_token_required
+
+DEFAULT_SECONDS = 10
+MAX_SECONDS = 120
+DEFAULT_INTERVAL = 0.005
+MIN_INTERVAL = 0.001
+
+HANDLER_CODE = BaseHandler._get_response.__code__
+TEMPLATE_CODE = Template.render.__code__
+
+_running = threading.Lock()
+
+
+def request_stack(frame):
+    """Свёрнутый стек потока, обрабатывающего запрос, иначе None."""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        if code is HANDLER_CODE:
+            match = getattr(frame.f_locals['request'], 'resolver_match', None)
+            labels.append(match.view_name if match else 'unresolved')
+            return ';'.join(reversed(labels))
+        if code is TEMPLATE_CODE:
+            labels.append(f"[template {frame.f_locals['self'].name}]")
+        labels.append(frame_label(
+            (code.co_filename, code.co_firstlineno, code.co_name)
+        ))
+        frame = frame.f_back
+    return None
+
+
+class Sampler(threading.Thread):
+    """Снимает стеки seconds секунд и сохраняет их в BLOG_PROFILE_DIR."""
+
+    def __init__(self, seconds=DEFAULT_SECONDS, interval=DEFAULT_INTERVAL):
+        super().__init__(name='blog-sampler', daemon=True)
+        self.seconds = seconds
+        self.interval = interval
+        self.stacks = Counter()
+        self.profile_name = '-'.join((
+            time.strftime('%Y%m%d-%H%M%S'), 'sample', uuid.uuid4().hex[:6]
+        ))
+
+    def sample(self):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.ident:
+                continue
+            stack = request_stack(frame)
+            if stack is not None:
+                self.stacks[stack] += 1
+
+    def run(self):
+        try:
+            deadline = time.monotonic() + self.seconds
+            while time.monotonic() < deadline:
+                self.sample()
+                time.sleep(self.interval)
+            self.save()
+        finally:
+            _running.release()
+
+    def start(self):
+        if not _running.acquire(blocking=False):
+            raise RuntimeError('Профилировщик уже запущен.')
+        super().start()
+
+    def save(self):
+        directory = Path(settings.BLOG_PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{self.profile_name}.collapsed'
+        # Файл появляется целиком: download не отдаст его недописанным.
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(''.join(
+            f'{stack} {count}\n'
+            for stack, count in sorted(self.stacks.items())
+        ), encoding='utf-8')
+        temporary.replace(path)
+
+
+@staff_or_token_required
+def start_sampling(request):
+    """Запускает семплирование в этом воркере и сразу отвечает."""
+    try:
+        seconds = min(
+            float(request.GET.get('seconds', DEFAULT_SECONDS)), MAX_SECONDS
+        )
+        interval = max(
+            float(request.GET.get('interval', DEFAULT_INTERVAL)),
+            MIN_INTERVAL
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Неверные параметры.'}, status=400)
+    sampler = Sampler(seconds, interval)
+    try:
+        sampler.start()
+    except RuntimeError as error:
+        return JsonResponse({'error': str(error)}, status=409)
+    return JsonResponse({
+        'name': f'{sampler.profile_name}.collapsed',
+        'seconds': seconds,
+        'interval': interval,
+    }, status=202)
@@ -0,0 +1,180 @@
+import re
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .manifests import only_for
+from .models import Post, comment_count
+
+SEARCH_CONFIG = 'russian'
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_WORDS = 24
+
+SQLITE_SEARCH_SQL = """
+    SELECT id, rank, snippet FROM (
+        SELECT blog_post.id AS id,
+               bm25(blog_post_fts, 5.0, 1.0) AS rank,
+               snippet(blog_post_fts, 1, %s, %s, '…', %s) AS snippet
+        FROM blog_post_fts
+        INNER JOIN blog_post ON blog_post.id = blog_post_fts.rowid
+        WHERE blog_post_fts MATCH %s AND blog_post.is_visible
+    )
+    WHERE rank > %s OR (rank = %s AND id > %s)
+    ORDER BY rank, id
+    LIMIT %s
+"""
+
+
+SQLITE_TRIGGERS = {
+    'blog_post_fts_ai': """
+        CREATE TRIGGER blog_post_fts_ai AFTER INSERT ON blog_post BEGIN
+            INSERT INTO blog_post_fts(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END
+    """,
+    'blog_post_fts_ad': """
+        CREATE TRIGGER blog_post_fts_ad AFTER DELETE ON blog_post BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+        END
+    """,
+    'blog_post_fts_au': """
+        CREATE TRIGGER blog_post_fts_au AFTER UPDATE OF title, text
+        ON blog_post BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+            INSERT INTO blog_post_fts(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END
+    """,
+}
+
+
+def ensure_sqlite_triggers(db_connection):
+    """
+    Восстанавливает триггеры индекса FTS5.
+
+    SQLite при изменении схемы blog_post пересоздаёт таблицу, и триггеры
+    пропадают вместе со старой таблицей; после этого индекс
+    перестраивается целиком.
+    """
+    if db_connection.vendor != 'sqlite':
+        return
+    with db_connection.cursor() as db_cursor:
+        db_cursor.execute(
+            "SELECT type, name FROM sqlite_master "
+            "WHERE name LIKE 'blog_post_fts%'"
+        )
+        existing = {name for _, name in db_cursor.fetchall()}
+        if 'blog_post_fts' not in existing:
+            return
+        missing = set(SQLITE_TRIGGERS) - existing
+        for name in sorted(missing):
+            db_cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            db_cursor.execute(
+                "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')"
+            )
+
+
+def parse_cursor(cursor):
+    """Курсор выдачи: пара (ранг, id) последнего показанного поста."""
+    try:
+        rank, pk = cursor.split(':')
+        return float(rank), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def make_cursor(rank, pk):
+    return f'{rank!r}:{pk}'
+
+
+def highlight(snippet):
+    """Экранирует фрагмент и подсвечивает совпадения."""
+    return mark_safe(
+        escape(snippet)
+        .replace(SNIPPET_START, '<mark>')
+        .replace(SNIPPET_END, '</mark>')
+    )
+
+
+def _fts_query(query):
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _search_sqlite(query, cursor, limit):
+    fts_query = _fts_query(query)
+    if not fts_query:
+        return []
+    rank, pk = cursor or (float('-inf'), 0)
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(SQLITE_SEARCH_SQL, [
+            SNIPPET_START, SNIPPET_END, SNIPPET_WORDS,
+            fts_query, rank, rank, pk, limit
+        ])
+        return db_cursor.fetchall()
+
+
+def _search_postgresql(query, cursor, limit):
+    from django.contrib.postgres.search import (
+        SearchHeadline, SearchQuery, SearchRank, SearchVector
+    )
+    from django.db.models import F, Q
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG)
+    vector = SearchVector('title', 'text', config=SEARCH_CONFIG)
+    results = Post.new_objects.annotate(
+        search=vector,
+        rank=-SearchRank(F('search'), search_query),
+        snippet=SearchHeadline(
+            'text',
+            search_query,
+            config=SEARCH_CONFIG,
+            start_sel=SNIPPET_START,
+            stop_sel=SNIPPET_END,
+            max_words=SNIPPET_WORDS
+        )
+    ).filter(search=search_query)
+    if cursor:
+        rank, pk = cursor
+        results = results.filter(Q(rank__gt=rank) | Q(rank=rank, id__gt=pk))
+    return list(
+        results.order_by('rank', 'id').values_list(
+            'id', 'rank', 'snippet'
+        )[:limit]
+    )
+
+
+def search_posts(query, cursor=None, limit=10):
+    """
+    Полнотекстовый поиск по опубликованным постам.
+
+    Возвращает список постов с атрибутом snippet и курсор следующей
+    страницы (None, если страница последняя).
+    """
+    if connection.vendor == 'postgresql':
+        rows = _search_postgresql(query, cursor, limit + 1)
+    else:
+        rows = _search_sqlite(query, cursor, limit + 1)
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    posts = only_for(
+        Post.new_objects.new_select_related(), 'includes/post_card.html'
+    ).annotate(
+        comment_count=comment_count()
+    ).in_bulk([pk for pk, _, _ in rows])
+    results = []
+    for pk, _, snippet in rows:
+        post = posts.get(pk)
+        if post is not None:
+            post.snippet = highlight(snippet)
+            results.append(post)
+    next_cursor = None
+    if has_next:
+        last_pk, last_rank, _ = rows[-1]
+        next_cursor = make_cursor(last_rank, last_pk)
+    return results, next_cursor
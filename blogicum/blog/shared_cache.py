@@ -0,0 +1,60 @@
+"""
+Кеш, общий для всех воркеров.
+
+Кеш по умолчанию у каждого процесса свой (LocMemCache). В нём лежат
+готовые страницы и ленты: их ключи содержат поколение содержимого,
+поэтому копия, устаревшая в одном воркере, просто перестаёт читаться.
+Само поколение, расписание отложенных публикаций и корзины ограничителя
+комментариев должны быть одни на все процессы и живут в кеше
+BLOG_SHARED_CACHE.
+
+Поколение и расписание читаются на каждый запрос, поэтому воркер
+помнит прочитанное значение BLOG_SHARED_STATE_TTL секунд: изменение
+из другого воркера становится видно не позже чем через этот срок,
+а своё — сразу.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+_local = {}
+
+
+def shared_cache():
+    return caches[settings.BLOG_SHARED_CACHE]
+
+
+def remember(key, value):
+    _local[key] = (value, time.monotonic() + settings.BLOG_SHARED_STATE_TTL)
+
+
+def recall(key):
+    """Значение из общего кеша; свежее прочитанное берётся из памяти."""
+    value, expires = _local.get(key, (None, 0))
+    if time.monotonic() < expires:
+        return value
+    value = shared_cache().get(key)
+    remember(key, value)
+    return value
+
+
+def store(key, value, timeout):
+    shared_cache().set(key, value, timeout)
+    remember(key, value)
+
+
+def discard(key):
+    shared_cache().delete(key)
+    _local.pop(key, None)
+
+
+def clear():
+    """Очищает общий кеш и память воркера о нём."""
+    shared_cache().clear()
+    forget_all()
+
+
+def forget_all():
+    """Забывает прочитанное: следующее чтение пойдёт в общий кеш."""
+    _local.clear()
@@ -0,0 +1,126 @@
+from django.db import connections
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .counters import refresh_counters, refresh_post_counters
+from .models import (
+    Category, Comment, Location, Post, User, visible_posts_q
+)
+from .publishing import (
+    bump_generation, reset_schedule, schedule, set_visibility,
+    visibility_changed
+)
+from .search import ensure_sqlite_triggers
+from .timeline import (
+    change_comment_count, sync_feed, sync_post, update_author,
+    update_category, update_location
+)
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    ensure_sqlite_triggers(connections[using])
+
+
+def _post_keys(post):
+    return post.category_id, post.location_id, post.author_id
+
+
+def _post_state(post):
+    return (*_post_keys(post), post.is_visible)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    # Пост, загруженный из базы, помнит состояние с загрузки
+    # (Post.from_db); иначе — один запрос.
+    instance._previous_state = getattr(instance, 'loaded_state', None)
+    if instance._previous_state is None and instance.pk is not None:
+        instance._previous_state = Post.all_objects.filter(
+            pk=instance.pk
+        ).values_list(
+            'category_id', 'location_id', 'author_id', 'is_visible'
+        ).first()
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_state', None)
+    current = _post_state(instance)
+    instance.loaded_state = current
+    if previous != current:
+        # Счётчики меняются, только если пост сменил категорию, место,
+        # автора или видимость.
+        keys = [current[:3]]
+        if previous:
+            keys.append(previous[:3])
+        refresh_counters(
+            *zip(*keys),
+            create_missing=not previous or previous[2] != current[2]
+        )
+    sync_post(instance, created)
+    schedule(instance)
+    bump_generation()
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    category_id, location_id, author_id = _post_keys(instance)
+    refresh_counters(
+        [category_id], [location_id], [author_id], create_missing=False
+    )
+    bump_generation()
+
+
+@receiver(visibility_changed, sender=Post)
+def posts_visibility_changed(sender, post_ids, **kwargs):
+    refresh_post_counters(Post.all_objects.filter(id__in=post_ids))
+    sync_feed(post_ids)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, **kwargs):
+    update_category(instance)
+    posts = Post.objects.filter(category=instance)
+    if instance.is_published:
+        set_visibility(
+            posts.filter(visible_posts_q(timezone.now())),
+            True
+        )
+    else:
+        set_visibility(posts, False)
+    reset_schedule()
+    bump_generation()
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    set_visibility(Post.objects.filter(category=instance), False)
+
+
+@receiver(post_save, sender=Location)
+def location_saved(sender, instance, **kwargs):
+    update_location(instance)
+    bump_generation()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields and 'username' not in update_fields:
+        return
+    update_author(instance)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        change_comment_count(instance.post_id, 1)
+    bump_generation()
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+    bump_generation()
@@ -0,0 +1,151 @@
+from xml.sax.saxutils import escape
+
+from django.core.cache import cache
+from django.db.models import F, Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import http_date
+
+from .models import Category, Post, User
+
+SITEMAP_CHUNK = 5000
+SITEMAP_CACHE_TIMEOUT = 60 * 60
+SITEMAP_XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class SitemapSection:
+    """
+    Раздел карты сайта.
+
+    Раздел делится на куски по диапазонам id: кусок с номером n содержит
+    записи с id из [n * SITEMAP_CHUNK, (n + 1) * SITEMAP_CHUNK). Записи
+    читаются через values_list, экземпляры моделей не создаются.
+    """
+
+    def __init__(self, get_queryset, url_name, url_kwarg, url_field,
+                 lastmod_field=None):
+        self.get_queryset = get_queryset
+        self.url_name = url_name
+        self.url_kwarg = url_kwarg
+        self.url_field = url_field
+        self.lastmod_field = lastmod_field
+
+    def chunk_queryset(self, chunk):
+        return self.get_queryset().filter(
+            id__gte=chunk * SITEMAP_CHUNK,
+            id__lt=(chunk + 1) * SITEMAP_CHUNK
+        )
+
+    def chunks(self):
+        """Номера непустых кусков и время их последнего изменения."""
+        chunks = self.get_queryset().annotate(
+            chunk=F('id') / SITEMAP_CHUNK
+        ).values('chunk')
+        if self.lastmod_field:
+            chunks = chunks.annotate(lastmod=Max(self.lastmod_field))
+            return chunks.order_by('chunk').values_list(
+                'chunk', 'lastmod'
+            ).iterator()
+        return (
+            (chunk, None) for chunk in chunks.order_by(
+                'chunk'
+            ).distinct().values_list('chunk', flat=True).iterator()
+        )
+
+    def lastmod(self, chunk):
+        if not self.lastmod_field:
+            return None
+        return self.chunk_queryset(chunk).aggregate(
+            lastmod=Max(self.lastmod_field)
+        )['lastmod']
+
+    def rows(self, chunk):
+        fields = [self.url_field]
+        if self.lastmod_field:
+            fields.append(self.lastmod_field)
+        return self.chunk_queryset(chunk).order_by('id').values_list(
+            *fields
+        ).iterator()
+
+    def location(self, value):
+        return reverse(self.url_name, kwargs={self.url_kwarg: value})
+
+
+SECTIONS = {
+    'posts': SitemapSection(
+        lambda: Post.new_objects.all(),
+        'blog:post_detail', 'post_id', 'id', 'pub_date'
+    ),
+    'categories': SitemapSection(
+        lambda: Category.objects.filter(is_published=True),
+        'blog:category_posts', 'category_slug', 'slug'
+    ),
+    'profiles': SitemapSection(
+        lambda: User.objects.filter(is_active=True),
+        'blog:profile', 'username', 'username'
+    ),
+}
+
+
+def _url_entry(loc, lastmod):
+    entry = f'<url><loc>{escape(loc)}</loc>'
+    if lastmod:
+        entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+    return entry + '</url>\n'
+
+
+def _render_index(request):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{SITEMAP_XMLNS}">\n'
+    for name, section in SECTIONS.items():
+        for chunk, lastmod in section.chunks():
+            loc = request.build_absolute_uri(reverse(
+                'blog:sitemap_section',
+                kwargs={'section': name, 'chunk': chunk}
+            ))
+            entry = f'<sitemap><loc>{escape(loc)}</loc>'
+            if lastmod:
+                entry += f'<lastmod>{lastmod.isoformat()}</lastmod>'
+            yield entry + '</sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def _render_section(request, section, chunk):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{SITEMAP_XMLNS}">\n'
+    for row in section.rows(chunk):
+        value, lastmod = row if len(row) == 2 else (row[0], None)
+        yield _url_entry(
+            request.build_absolute_uri(section.location(value)), lastmod
+        )
+    yield '</urlset>\n'
+
+
+def sitemap_index(request):
+    """Индекс карты сайта: по одной ссылке на каждый непустой кусок."""
+    return StreamingHttpResponse(
+        _render_index(request),
+        content_type='application/xml'
+    )
+
+
+def sitemap_section(request, section, chunk):
+    """Кусок раздела карты сайта, закешированный до его изменения."""
+    if section not in SECTIONS:
+        raise Http404
+    sitemap = SECTIONS[section]
+    lastmod = sitemap.lastmod(chunk)
+    version = int(lastmod.timestamp()) if lastmod else None
+    cache_key = (
+        f'blog:sitemap:{request.get_host()}:{section}:{chunk}:{version}'
+    )
+    content = cache.get(cache_key)
+    if content is None:
+        content = ''.join(_render_section(request, sitemap, chunk))
+        cache.set(cache_key, content, SITEMAP_CACHE_TIMEOUT)
+    if '<url>' not in content:
+        raise Http404
+    response = HttpResponse(content, content_type='application/xml')
+    if version is not None:
+        response['Last-Modified'] = http_date(version)
+    return response
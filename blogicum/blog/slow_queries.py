@@ -0,0 +1,168 @@
+"""
+Журнал медленных запросов с планом выполнения.
+
+Запрос дольше BLOG_SLOW_QUERY_MS миллисекунд пишется одной строкой JSON
+в BLOG_SLOW_QUERY_LOG: текст и параметры, представление, шаблон или
+строка кода, откуда он пришёл, и план. В параметрах бывают ключи сессий,
+хеши паролей и адреса почты, поэтому по умолчанию вместо значений
+пишутся только тип и длина; сами значения — с BLOG_SLOW_QUERY_PARAMS.
+План снимается сразу же на том же соединении и только для SELECT:
+EXPLAIN QUERY PLAN в SQLite, EXPLAIN в остальных базах — без ANALYZE,
+чтобы не выполнять запрос ещё раз. Внутри транзакции план снимается в
+точке сохранения: ошибка EXPLAIN в PostgreSQL иначе оборвала бы
+транзакцию вызывающего кода. Файл ротируется по размеру.
+
+Имя представления берётся у QueryStatsMiddleware: без неё в журнале
+вместо представления будет «-».
+"""
+import json
+import logging
+import sys
+import time
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.backends.signals import connection_created
+from django.db.backends.utils import CursorDebugWrapper, CursorWrapper
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .lazyload import call_site
+from .query_stats import current_view
+
+MAX_PARAM_LENGTH = 200
+EXPLAIN_SAVEPOINT = 'blog_slow_query_explain'
+EXECUTE_CODES = {
+    method.__code__
+    for wrapper in (CursorWrapper, CursorDebugWrapper)
+    for method in (wrapper.execute, wrapper.executemany)
+}
+
+
+@lru_cache(maxsize=None)
+def file_handler(path, max_bytes, backup_count):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8',
+        delay=True
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
+
+
+def write(entry):
+    handler = file_handler(
+        str(settings.BLOG_SLOW_QUERY_LOG),
+        settings.BLOG_SLOW_QUERY_LOG_MAX_BYTES,
+        settings.BLOG_SLOW_QUERY_LOG_BACKUPS,
+    )
+    handler.handle(logging.makeLogRecord({
+        'msg': json.dumps(entry, ensure_ascii=False, default=str)
+    }))
+
+
+def explain(connection, sql, params):
+    """План запроса строками или None, если план не снять."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    if connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+    savepoint = (
+        connection.in_atomic_block and connection.features.uses_savepoints
+    )
+    # Курсор базы напрямую: EXPLAIN не должен попадать
+    # в обёртки выполнения и панель отладки.
+    cursor = connection.create_cursor()
+    try:
+        with connection.wrap_database_errors:
+            if savepoint:
+                cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+            try:
+                cursor.execute(prefix + sql, params)
+                rows = cursor.fetchall()
+            except Exception:
+                if savepoint:
+                    cursor.execute(
+                        f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}'
+                    )
+                raise
+            finally:
+                if savepoint:
+                    cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+    except DatabaseError as error:
+        return [f'EXPLAIN не выполнен: {error}']
+    finally:
+        cursor.close()
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[3] for row in rows]
+    return [row[0] for row in rows]
+
+
+def _params(params):
+    if isinstance(params, dict):
+        return {name: _param(value) for name, value in params.items()}
+    return [_param(value) for value in params or ()]
+
+
+def _param(value):
+    if not settings.BLOG_SLOW_QUERY_PARAMS:
+        return _redacted(value)
+    if isinstance(value, str) and len(value) > MAX_PARAM_LENGTH:
+        return value[:MAX_PARAM_LENGTH] + '…'
+    return value
+
+
+def _redacted(value):
+    """Тип и длина вместо значения: str(40), int, None."""
+    if value is None:
+        return None
+    name = type(value).__name__
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return f'{name}({len(value)})'
+    return name
+
+
+def caller_frame():
+    """Первый кадр над CursorWrapper.execute — код, выполнивший запрос."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code not in EXECUTE_CODES:
+        frame = frame.f_back
+    while frame is not None and frame.f_code in EXECUTE_CODES:
+        frame = frame.f_back
+    return frame
+
+
+def log_slow_query(execute, sql, params, many, context):
+    threshold = settings.BLOG_SLOW_QUERY_MS
+    if threshold is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed = (time.perf_counter() - started) * 1000
+    if elapsed >= threshold:
+        connection = context['connection']
+        write({
+            'time': timezone.now().isoformat(),
+            'ms': round(elapsed, 3),
+            'database': connection.alias,
+            'view': current_view(),
+            'site': call_site(caller_frame()),
+            'sql': sql,
+            'params': None if many else _params(params),
+            'many': many,
+            'plan': None if many else explain(connection, sql, params),
+        })
+    return result
+
+
+@receiver(connection_created)
+def install(sender, connection, **kwargs):
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_query)
@@ -0,0 +1,7 @@
+from django import template
+
+from blog.text import rendered_text
+
+register = template.Library()
+
+register.filter('rendered_text', rendered_text)
@@ -0,0 +1,11 @@
+from django import template
+
+from blog.urlbuilders import build_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def blog_url(name, *args, **kwargs):
+    """Как {% url %}, но без обхода резолвера на каждый вызов."""
+    return build_url(name, *args, **kwargs)
@@ -0,0 +1,24 @@
+from django.template.defaultfilters import linebreaksbr
+from django.utils.safestring import mark_safe
+
+# Единственный тег, который render_text добавляет к экранированному тексту.
+LINE_BREAK = '<br>'
+
+
+def render_text(text):
+    """Экранированный текст с переносами строк, как фильтр linebreaksbr."""
+    return linebreaksbr(text, autoescape=True)
+
+
+def rendered_text(obj):
+    """
+    Текст поста или комментария в HTML для шаблона.
+
+    Готовый text_html выводится как есть, только если в нём нет других
+    тегов, кроме переносов строк: без «<» разметки в нём нет. Иначе и
+    для ещё не заполненных строк текст экранируется заново.
+    """
+    html = obj.text_html
+    if html and '<' not in html.replace(LINE_BREAK, ''):
+        return mark_safe(html)
+    return render_text(obj.text)
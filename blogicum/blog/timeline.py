@@ -0,0 +1,230 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_datetime
+from django.utils.text import Truncator
+
+from .models import (
+    Category, Comment, FeedEntry, Location, Post, User, comment_count
+)
+
+EXCERPT_WORDS = 10
+SYNC_BATCH_SIZE = 500
+
+
+def _entry(row):
+    location_name = (
+        row['location__name'] if row['location__is_published'] else None
+    )
+    return FeedEntry(
+        post_id=row['id'],
+        pub_date=row['pub_date'],
+        title=row['title'],
+        excerpt=Truncator(row['text']).words(EXCERPT_WORDS),
+        image=row['image'] or '',
+        author_id=row['author_id'],
+        author_username=row['author__username'],
+        category_id=row['category_id'],
+        category_slug=row['category__slug'],
+        category_title=row['category__title'],
+        location_id=row['location_id'],
+        location_name=location_name,
+        comment_count=row['comment_count'],
+    )
+
+
+def _sync_batch(post_ids):
+    rows = Post.new_objects.filter(id__in=post_ids).annotate(
+        comment_count=comment_count()
+    ).values(
+        'id', 'pub_date', 'title', 'text', 'image',
+        'author_id', 'author__username',
+        'category_id', 'category__slug', 'category__title',
+        'location_id', 'location__name', 'location__is_published',
+        'comment_count',
+    )
+    with transaction.atomic():
+        FeedEntry.objects.filter(post_id__in=post_ids).delete()
+        FeedEntry.objects.bulk_create([_entry(row) for row in rows])
+
+
+def _related_loaded(post):
+    return all(
+        Post._meta.get_field(name).is_cached(post)
+        or getattr(post, f'{name}_id') is None
+        for name in ('author', 'category', 'location')
+    )
+
+
+def _post_row(post, comment_count):
+    location = post.location
+    return {
+        'id': post.pk,
+        'pub_date': post.pub_date,
+        'title': post.title,
+        'text': post.text,
+        'image': post.image.name,
+        'author_id': post.author_id,
+        'author__username': post.author.username,
+        'category_id': post.category_id,
+        'category__slug': post.category.slug,
+        'category__title': post.category.title,
+        'location_id': post.location_id,
+        'location__name': location and location.name,
+        'location__is_published': location and location.is_published,
+        'comment_count': comment_count,
+    }
+
+
+def sync_post(post, created=False):
+    """
+    Запись ленты для одного сохранённого поста. Автор, категория и место
+    обычно уже загружены формой или select_related, и запись собирается
+    из них одним запросом; иначе — как в sync_feed.
+    """
+    if not _related_loaded(post):
+        sync_feed([post.pk])
+        return
+    if not post.is_visible or post.deleted_at is not None:
+        if not created:
+            FeedEntry.objects.filter(post_id=post.pk).delete()
+        return
+    entry = _entry(_post_row(post, 0))
+    if created:
+        entry.save(force_insert=True)
+        return
+    fields = {
+        field.attname: getattr(entry, field.attname)
+        for field in FeedEntry._meta.concrete_fields
+        if field.attname not in ('post_id', 'comment_count')
+    }
+    if not FeedEntry.objects.filter(post_id=post.pk).update(**fields):
+        # Пост только что стал видимым: число комментариев — из базы.
+        sync_feed([post.pk])
+
+
+def sync_feed(post_ids):
+    """
+    Приводит ленту в соответствие с постами: видимые посты попадают
+    в ленту, скрытые из неё удаляются.
+    """
+    post_ids = list(post_ids)
+    for start in range(0, len(post_ids), SYNC_BATCH_SIZE):
+        _sync_batch(post_ids[start:start + SYNC_BATCH_SIZE])
+
+
+@transaction.atomic
+def rebuild_feed():
+    """
+    Перестраивает ленту целиком в одной транзакции: читатели до её конца
+    видят старую ленту, а не пустую или недостроенную.
+    """
+    FeedEntry.objects.all().delete()
+    post_ids = Post.new_objects.order_by('id').values_list('id', flat=True)
+    batch = []
+    for post_id in post_ids.iterator():
+        batch.append(post_id)
+        if len(batch) == SYNC_BATCH_SIZE:
+            _sync_batch(batch)
+            batch = []
+    if batch:
+        _sync_batch(batch)
+
+
+def parse_feed_cursor(cursor):
+    """Курсор ленты: пара (pub_date, id) последнего показанного поста."""
+    try:
+        moment, pk = cursor.rsplit('/', 1)
+        moment = parse_datetime(moment)
+        if moment is None:
+            return None
+        return moment, int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def make_feed_cursor(entry):
+    return f'{entry.pub_date.isoformat()}/{entry.post_id}'
+
+
+def feed_page(cursor, limit):
+    """
+    Страница ленты после курсора: чтение диапазона индекса
+    (pub_date, post) без OFFSET и без подсчёта всех записей.
+    """
+    entries = FeedEntry.objects.order_by('-pub_date', '-post')
+    if cursor is not None:
+        moment, pk = cursor
+        entries = entries.filter(
+            Q(pub_date__lt=moment) | Q(pub_date=moment, post_id__lt=pk)
+        )
+    entries = list(entries[:limit + 1])
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = make_feed_cursor(entries[-1])
+    return [as_post(entry) for entry in entries], next_cursor
+
+
+def change_comment_count(post_id, delta):
+    FeedEntry.objects.filter(post_id=post_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+def refresh_comment_counts(post_ids):
+    FeedEntry.objects.filter(post_id__in=post_ids).update(
+        comment_count=Coalesce(Subquery(
+            Comment.objects.filter(
+                post_id=OuterRef('post_id')
+            ).order_by().values('post_id').annotate(
+                total=Count('id')
+            ).values('total')
+        ), 0)
+    )
+
+
+def update_category(category):
+    FeedEntry.objects.filter(category_id=category.id).exclude(
+        category_slug=category.slug, category_title=category.title
+    ).update(category_slug=category.slug, category_title=category.title)
+
+
+def update_location(location):
+    FeedEntry.objects.filter(location_id=location.id).update(
+        location_name=location.name if location.is_published else None
+    )
+
+
+def update_author(user):
+    FeedEntry.objects.filter(author_id=user.id).exclude(
+        author_username=user.username
+    ).update(author_username=user.username)
+
+
+def as_post(entry):
+    """Собирает из записи ленты пост для шаблона без обращений к базе."""
+    post = Post(
+        id=entry.post_id,
+        title=entry.title,
+        text=entry.excerpt,
+        pub_date=entry.pub_date,
+        image=entry.image,
+        is_published=True,
+        is_visible=True,
+        author=User(id=entry.author_id, username=entry.author_username),
+        category=Category(
+            id=entry.category_id,
+            slug=entry.category_slug,
+            title=entry.category_title,
+            is_published=True
+        ),
+    )
+    if entry.location_name is not None:
+        post.location = Location(
+            id=entry.location_id,
+            name=entry.location_name,
+            is_published=True
+        )
+    post.comment_count = entry.comment_count
+    return post
@@ -1,6 +1,8 @@
 from django.urls import path
 
-from . import views
+from . import (
+    api, async_views, feeds, metrics, profiling, sampling, sitemaps, views
+)
 
 app_name = 'blog'
 
@@ -10,6 +12,11 @@ urlpatterns = [
         views.PostListView.as_view(),
         name='index'
     ),
+    path(
+        'search/',
+        views.PostSearchView.as_view(),
+        name='search'
+    ),
     path(
         'posts/<int:post_id>/',
         views.PostDetailView.as_view(),
@@ -60,4 +67,104 @@ urlpatterns = [
         views.CommentDeleteView.as_view(),
         name='delete_comment'
     ),
+    path(
+        'feed/',
+        feeds.cached_feed(feeds.LatestPostsFeed),
+        name='feed'
+    ),
+    path(
+        'feed/atom/',
+        feeds.cached_feed(feeds.LatestPostsAtomFeed),
+        name='feed_atom'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/',
+        feeds.cached_feed(feeds.CategoryPostsFeed),
+        name='category_feed'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/atom/',
+        feeds.cached_feed(feeds.CategoryPostsAtomFeed),
+        name='category_feed_atom'
+    ),
+    path(
+        'profile/<slug:username>/feed/',
+        feeds.cached_feed(feeds.AuthorPostsFeed),
+        name='profile_feed'
+    ),
+    path(
+        'profile/<slug:username>/feed/atom/',
+        feeds.cached_feed(feeds.AuthorPostsAtomFeed),
+        name='profile_feed_atom'
+    ),
+    path(
+        'sitemap.xml',
+        sitemaps.sitemap_index,
+        name='sitemap'
+    ),
+    path(
+        'sitemap-<slug:section>-<int:chunk>.xml',
+        sitemaps.sitemap_section,
+        name='sitemap_section'
+    ),
+    path(
+        'api/posts/',
+        api.post_list,
+        name='api_post_list'
+    ),
+    path(
+        'api/posts/<int:post_id>/',
+        api.post_detail,
+        name='api_post_detail'
+    ),
+    path(
+        'api/posts/<int:post_id>/comments/',
+        api.comment_list,
+        name='api_comment_list'
+    ),
+    path(
+        'api/category/<slug:category_slug>/posts/',
+        api.category_post_list,
+        name='api_category_post_list'
+    ),
+    path(
+        'api/profile/<slug:username>/posts/',
+        api.profile_post_list,
+        name='api_profile_post_list'
+    ),
+    path(
+        'async/',
+        async_views.post_list,
+        name='index_async'
+    ),
+    path(
+        'async/posts/<int:post_id>/',
+        async_views.post_detail,
+        name='post_detail_async'
+    ),
+    path(
+        'async/profile/<slug:username>/',
+        async_views.profile,
+        name='profile_async'
+    ),
+    path(
+        'async/category/<slug:category_slug>/',
+        async_views.category_posts,
+        name='category_posts_async'
+    ),
+    path(
+        'metrics/',
+        metrics.metrics_view,
+        name='metrics'
+    ),
+    path(
+        'profiling/sample/',
+        sampling.start_sampling,
+        name='profiling_sample'
+    ),
+    path(
+        'profiling/<str:name>',
+        profiling.download,
+        name='profiling_download'
+    ),
 ]
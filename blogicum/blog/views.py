@@ -1,18 +1,34 @@
+import math
+from http import HTTPStatus
+
+from django.conf import settings
+from django.http import HttpResponse
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.generic import (
     CreateView, DetailView, ListView, UpdateView, DeleteView
 )
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic.edit import FormMixin
-from django.db.models import Count
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 
-from .models import Post, Category, User, Comment
+from .models import (
+    Post, Category, User, Comment, comment_count
+)
 from .forms import PostForm, CommentForm, ProfileEditForm
+from .budgets import AUTH_QUERIES
+from .comment_buffer import comment_buffer
+from .deletion import soft_delete_comments, soft_delete_post
+from .manifests import only_for
+from .paginators import CountedPaginator
+from .publishing import get_generation
+from .ratelimit import comment_wait
+from .search import parse_cursor, search_posts
+from .timeline import feed_page, parse_feed_cursor
 
 DEFAULT_VALUE = 10
+PAGE_CACHE_TIMEOUT = 60 * 10
 
 
 class PostMixin:
@@ -27,21 +43,65 @@ class CommentMixin:
     form_class = CommentForm
 
 
+class CountedPaginationMixin:
+    """Миксин пагинации по денормализованным счётчикам публикаций."""
+    paginator_class = CountedPaginator
+    posts_count = None
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(*args, count=self.posts_count, **kwargs)
+
+
+class AnonymousPageCacheMixin:
+    """Миксин кеша страницы для анонимов до смены поколения содержимого."""
+    page_cache_timeout = PAGE_CACHE_TIMEOUT
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        cache_key = (
+            f'blog:page:{request.get_full_path()}:{get_generation()}'
+        )
+        response = cache.get(cache_key)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.add_post_render_callback(
+                    lambda rendered: cache.set(
+                        cache_key, rendered, self.page_cache_timeout
+                    )
+                )
+        return response
+
+
 class PostListView(ListView):
-    """Главная страница."""
-    model = Post
+    """Главная страница: лента по курсору."""
     template_name = 'blog/index.html'
-    paginate_by = DEFAULT_VALUE
+    paginate_by = None
+    query_budget = 1 + AUTH_QUERIES
 
     def get_queryset(self):
-        return Post.new_objects.new_select_related().annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
+        self.cursor = parse_feed_cursor(self.request.GET.get('cursor'))
+        posts, self.next_cursor = feed_page(self.cursor, DEFAULT_VALUE)
+        return posts
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            page_obj=self.object_list,
+            is_first_page=self.cursor is None,
+            next_cursor=self.next_cursor,
+            **kwargs
+        )
 
 
 class PostCreateView(LoginRequiredMixin, PostMixin, CreateView):
     """Создание публикации."""
     template_name = 'blog/create.html'
+    # Категория и место из формы — 2, проверка их ключей моделью — 2,
+    # INSERT поста, счётчики категории и места — 2, строка статистики
+    # автора в своей транзакции (BEGIN вне тестовой транзакции) и её
+    # счётчики — 3, запись ленты.
+    query_budget = 11 + AUTH_QUERIES
 
     def form_valid(self, form):
         form.instance.author = self.request.user
@@ -57,13 +117,22 @@ class PostCreateView(LoginRequiredMixin, PostMixin, CreateView):
 class PostUpdateView(LoginRequiredMixin, PostMixin, UpdateView):
     """Редактирование публикации."""
     template_name = 'blog/create.html'
+    # Пост с автором, категория и место из формы — 2, проверка их ключей
+    # моделью — 2, UPDATE поста, UPDATE записи ленты. Счётчики не
+    # пересчитываются, пока категория, место и видимость прежние.
+    query_budget = 7 + AUTH_QUERIES
 
     def dispatch(self, request, *args, **kwargs):
-        post = get_object_or_404(Post, pk=self.kwargs['pk'])
-        if post.author != self.request.user:
-            return redirect('blog:post_detail', post.id)
+        self.object = get_object_or_404(
+            Post.objects.select_related('author'), pk=self.kwargs['pk']
+        )
+        if self.object.author_id != self.request.user.id:
+            return redirect('blog:post_detail', self.object.id)
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.object
+
     def get_success_url(self):
         return reverse_lazy(
             'blog:post_detail',
@@ -77,10 +146,15 @@ class PostDetailView(FormMixin, DetailView):
     template_name = 'blog/detail.html'
     form_class = CommentForm
     pk_url_kwarg = 'post_id'
+    queryset = Post.objects.select_related('category', 'location', 'author')
+    query_budget = 2 + AUTH_QUERIES
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = only_for(
+            self.object.comments.select_related('author'),
+            'includes/comments.html'
+        )
         return context
 
 
@@ -95,34 +169,46 @@ def delete_post(request, pk):
     form = PostForm(instance=instance)
     context = {'form': form}
     if request.method == 'POST':
-        instance.delete()
+        soft_delete_post(instance)
         return redirect('blog:index')
     return render(request, 'blog/create.html', context)
 
 
-class ProfileListView(ListView):
+# Пост, транзакция (BEGIN, в тестах две команды точки сохранения) — 2,
+# UPDATE поста, DELETE записи ленты, счётчики категории, места и
+# автора — 3.
+delete_post.query_budget = 8 + AUTH_QUERIES
+
+
+class ProfileListView(CountedPaginationMixin, ListView):
     """Страница профиля пользователя."""
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = DEFAULT_VALUE
+    query_budget = 2 + AUTH_QUERIES
 
     def get_context_data(self, **kwargs):
         user = get_object_or_404(
-            User,
+            User.objects.select_related('stats'),
             username=self.kwargs['username']
         )
+        stats = getattr(user, 'stats', None)
         if user == self.request.user:
+            self.posts_count = stats and stats.posts_count
             user_posts = user.posts.select_related(
                 'location', 'category', 'author'
             ).annotate(
-                comment_count=Count('comments')
+                comment_count=comment_count()
             ).order_by('-pub_date')
         else:
-            user_posts = Post.new_objects.filter(author=user.id).annotate(
-                comment_count=Count('comments')
+            self.posts_count = stats and stats.published_posts_count
+            user_posts = Post.new_objects.new_select_related().filter(
+                author=user.id
+            ).annotate(
+                comment_count=comment_count()
             ).order_by('-pub_date')
         return super().get_context_data(
-            object_list=user_posts,
+            object_list=only_for(user_posts, 'includes/post_card.html'),
             profile=user,
             **kwargs
         )
@@ -148,11 +234,25 @@ class CommentCreateView(LoginRequiredMixin, CommentMixin, CreateView):
     """Добавление комментария."""
     one_post = None
     template_name = 'blog/comment.html'
+    query_budget = 3 + AUTH_QUERIES
 
     def form_valid(self, form):
-        self.one_post = get_object_or_404(Post, pk=self.kwargs['pk'])
+        self.one_post = get_object_or_404(
+            Post.objects.only('id'), pk=self.kwargs['pk']
+        )
+        wait = comment_wait(self.request.user.id, self.one_post.id)
+        if wait:
+            response = HttpResponse(
+                'Слишком много комментариев, попробуйте позже.',
+                status=HTTPStatus.TOO_MANY_REQUESTS
+            )
+            response['Retry-After'] = math.ceil(wait)
+            return response
         form.instance.author = self.request.user
         form.instance.post = self.one_post
+        if settings.BLOG_COMMENT_BUFFER:
+            comment_buffer.add(form.instance)
+            return redirect(self.get_success_url())
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -165,14 +265,16 @@ class CommentCreateView(LoginRequiredMixin, CommentMixin, CreateView):
 class CommentUpdateView(LoginRequiredMixin, CommentMixin, UpdateView):
     """Редактирование комментария."""
     template_name = 'blog/comment.html'
+    query_budget = 3 + AUTH_QUERIES
 
     def dispatch(self, request, *args, **kwargs):
         comment = get_object_or_404(
             Comment,
-            pk=self.kwargs['post_id']
+            pk=self.kwargs['pk'],
+            post_id=self.kwargs['post_id']
         )
-        if comment.author != self.request.user:
-            return redirect('blog:post_detail', comment.post.id)
+        if comment.author_id != self.request.user.id:
+            return redirect('blog:post_detail', comment.post_id)
         return super().dispatch(request, *args, **kwargs)
 
     def get_success_url(self):
@@ -186,16 +288,22 @@ class CommentDeleteView(LoginRequiredMixin, DeleteView):
     """Удаление комментария."""
     model = Comment
     template_name = 'blog/comment.html'
+    query_budget = 4 + AUTH_QUERIES
 
     def dispatch(self, request, *args, **kwargs):
         comment = get_object_or_404(
             Comment,
-            pk=self.kwargs['post_id']
+            pk=self.kwargs['pk'],
+            post_id=self.kwargs['post_id']
         )
-        if comment.author != self.request.user:
-            return redirect('blog:post_detail', comment.post.id)
+        if comment.author_id != self.request.user.id:
+            return redirect('blog:post_detail', comment.post_id)
         return super().dispatch(request, *args, **kwargs)
 
+    def delete(self, request, *args, **kwargs):
+        soft_delete_comments(Comment.objects.filter(pk=self.kwargs['pk']))
+        return redirect(self.get_success_url())
+
     def get_success_url(self):
         return reverse_lazy(
             'blog:post_detail',
@@ -203,11 +311,13 @@ class CommentDeleteView(LoginRequiredMixin, DeleteView):
         )
 
 
-class CategoryListView(ListView):
+class CategoryListView(AnonymousPageCacheMixin, CountedPaginationMixin,
+                       ListView):
     """Страница публикации постов по категории."""
     model = Post
     template_name = 'blog/category.html'
     paginate_by = DEFAULT_VALUE
+    query_budget = 2 + AUTH_QUERIES
 
     def get_context_data(self, **kwargs):
         category = get_object_or_404(
@@ -215,15 +325,42 @@ class CategoryListView(ListView):
             slug=self.kwargs['category_slug'],
             is_published=True
         )
+        self.posts_count = category.published_posts_count
         post_list = category.categories.filter(
-            category__slug=category.slug,
-            is_published=True,
-            pub_date__lte=timezone.now()
+            is_visible=True
+        ).select_related(
+            'location', 'author', 'category'
         ).annotate(
-            comment_count=Count('comments')
+            comment_count=comment_count()
         ).order_by('-pub_date')
         return super().get_context_data(
             category=category,
-            object_list=post_list,
+            object_list=only_for(post_list, 'includes/post_card.html'),
+            **kwargs
+        )
+
+
+class PostSearchView(ListView):
+    """Поиск по публикациям."""
+    template_name = 'blog/search.html'
+    paginate_by = None
+    query_budget = 2 + AUTH_QUERIES
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        self.next_cursor = None
+        if not self.query:
+            return []
+        posts, self.next_cursor = search_posts(
+            self.query,
+            cursor=parse_cursor(self.request.GET.get('cursor')),
+            limit=DEFAULT_VALUE
+        )
+        return posts
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            query=self.query,
+            next_cursor=self.next_cursor,
             **kwargs
         )
@@ -0,0 +1,50 @@
+"""Настройки для боевых воркеров: без инструментов разработки."""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import (
+    BLOG_SLOW_QUERY_LOG, CACHES, DATABASES, INSTALLED_APPS, MIDDLEWARE,
+    STATIC_ROOT
+)
+
+DEBUG = False
+
+DEV_ONLY_APPS = ('debug_toolbar',)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEV_ONLY_APPS]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware.split('.')[0] not in DEV_ONLY_APPS
+]
+
+DATABASES['default']['NAME'] = os.environ.get(
+    'BLOGICUM_DB', DATABASES['default']['NAME']
+)
+
+# Воркерам на нескольких машинах нужен общий memcached.
+if os.environ.get('BLOGICUM_MEMCACHED'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ['BLOGICUM_MEMCACHED'],
+    }
+else:
+    CACHES['shared']['LOCATION'] = os.environ.get(
+        'BLOGICUM_SHARED_CACHE_DIR', CACHES['shared']['LOCATION']
+    )
+
+# На стенде можно включить 'log', чтобы видеть ленивые запросы.
+BLOG_STRICT_LOADING = os.environ.get('BLOGICUM_STRICT_LOADING') or None
+
+# Превышение бюджета запросов в бою не ломает страницу.
+BLOG_QUERY_BUDGETS = 'log'
+
+BLOG_SLOW_QUERY_LOG = os.environ.get(
+    'BLOGICUM_SLOW_QUERY_LOG', BLOG_SLOW_QUERY_LOG
+)
+
+STATIC_ROOT = os.environ.get('BLOGICUM_STATIC_ROOT', STATIC_ROOT)
+
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
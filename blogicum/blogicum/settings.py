@@ -27,12 +27,18 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.render_timing.RenderTimingMiddleware',
+    'blog.query_stats.QueryStatsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.middleware.ScheduledPublishMiddleware',
+    'blog.lazyload.StrictLoadingMiddleware',
+    'blog.budgets.QueryBudgetMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
@@ -66,6 +72,24 @@ DATABASES = {
     }
 }
 
+# Кеш по умолчанию у каждого воркера свой, общее состояние блога
+# (поколение содержимого, расписание публикаций, ограничитель
+# комментариев) — в кеше BLOG_SHARED_CACHE. Файлы видны всем воркерам
+# одной машины и не добавляют запросов к базе.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'shared_cache',
+    },
+}
+
+# Сколько секунд воркер помнит прочитанное из общего кеша.
+BLOG_SHARED_CACHE = 'shared'
+BLOG_SHARED_STATE_TTL = 1
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -100,6 +124,8 @@ STATICFILES_DIRS = [
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static'
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -116,3 +142,57 @@ MEDIA_ROOT = BASE_DIR / 'media'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Удалять пользователей в фоне, скрыв их записи до удаления.
+BLOG_ASYNC_DELETION = False
+
+# Сколько дней purge_deleted хранит мягко удалённые посты и комментарии.
+BLOG_DELETED_RETENTION_DAYS = 30
+
+# Корзины жетонов для комментариев: (жетонов в секунду, ёмкость).
+BLOG_COMMENT_RATE_LIMITS = {
+    'user': (0.5, 10),
+    'post': (50, 200),
+}
+
+# Копить комментарии и сохранять их пачкой раз в интервал, секунды.
+BLOG_COMMENT_BUFFER = False
+BLOG_COMMENT_BUFFER_INTERVAL = 0.005
+
+# Ленивые запросы в представлениях блога: None, 'log' или 'raise'.
+# Тесты включают 'raise' в tests/conftest.py.
+BLOG_STRICT_LOADING = None
+
+# Куда ProfilingMiddleware сохраняет профили запросов и сколько секунд
+# действует подписанное значение заголовка X-Blog-Profile.
+BLOG_PROFILE_DIR = BASE_DIR / 'profiles'
+BLOG_PROFILE_TOKEN_MAX_AGE = 60 * 60
+
+# Время рендера шаблонов: заголовок Server-Timing с самыми долгими
+# шаблонами, дерево рендера в лог для запросов дольше порога, секунды.
+BLOG_TEMPLATE_TIMING = True
+BLOG_SERVER_TIMING_TEMPLATES = 10
+BLOG_SLOW_REQUEST_SECONDS = 0.5
+
+# Статистика запросов по отпечаткам: сколько отпечатков держать в памяти
+# и раз во сколько секунд складывать их в таблицу QueryStat; None —
+# только вручную (query_stats --flush).
+BLOG_QUERY_STATS = True
+BLOG_QUERY_STATS_SIZE = 500
+BLOG_QUERY_STATS_FLUSH_INTERVAL = 60
+
+# Журнал запросов дольше порога, миллисекунды, с планом выполнения;
+# None выключает журнал. Значения параметров пишутся только с
+# BLOG_SLOW_QUERY_PARAMS, иначе тип и длина. Файл ротируется по размеру,
+# байты.
+BLOG_SLOW_QUERY_MS = 100
+BLOG_SLOW_QUERY_PARAMS = False
+BLOG_SLOW_QUERY_LOG = BASE_DIR / 'logs' / 'slow_queries.jsonl'
+BLOG_SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+BLOG_SLOW_QUERY_LOG_BACKUPS = 5
+
+# Бюджеты запросов представлений (query_budget): None, 'log' или 'raise'.
+BLOG_QUERY_BUDGETS = 'raise'
+
+# Куда prerender_pages складывает готовые страницы приложения pages.
+PAGES_PRERENDER_DIR = BASE_DIR / 'prerendered'
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.urls import get_resolver
+from django.utils import translation
+
+
+def project_templates():
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        directory = Path(directory)
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def warm_up():
+    """
+    Заполняет кеши, которые иначе заполнял бы первый запрос каждого
+    воркера: маршруты, переводы и шаблоны. Вызывается до fork,
+    поэтому к базе данных не обращается.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for _, namespace_resolver in resolver.namespace_dict.values():
+        namespace_resolver.reverse_dict
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+    # Без DEBUG шаблоны хранит кеширующий загрузчик; с DEBUG их
+    # разбор выбрасывается, и прогревать нечего.
+    if not settings.DEBUG:
+        for template_name in project_templates():
+            get_template(template_name)
@@ -5,3 +5,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+from blogicum.warmup import warm_up  # noqa: E402
+
+# С gunicorn --preload это выполняется в мастере до fork.
+warm_up()
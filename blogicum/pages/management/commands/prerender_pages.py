@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pages.prerender import PAGES, build
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает статические страницы и страницы ошибок в HTML. '
+        'Запускать после collectstatic, чтобы ссылки на статику были '
+        'с хешами; сервер подхватит страницы при следующем старте.'
+    )
+
+    def handle(self, *args, **options):
+        build(settings.PAGES_PRERENDER_DIR)
+        self.stdout.write(
+            f'Собрано страниц: {len(PAGES)} в {settings.PAGES_PRERENDER_DIR}'
+        )
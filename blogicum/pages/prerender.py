@@ -0,0 +1,63 @@
+from hashlib import md5
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.template.loader import render_to_string
+from django.urls import resolve, reverse
+
+# Имя страницы: шаблон и маршрут, от имени которого она рендерится.
+PAGES = {
+    'about': ('pages/about.html', 'pages:about'),
+    'rules': ('pages/rules.html', 'pages:rules'),
+    '404': ('pages/404.html', 'blog:index'),
+    '403csrf': ('pages/403csrf.html', 'blog:index'),
+    '500': ('pages/500.html', 'blog:index'),
+}
+HASHED_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
+# Подставляется вместо адреса запроса, который известен только при ответе.
+URL_PLACEHOLDER = '__PRERENDERED_REQUEST_URL__'
+
+# Имя страницы -> (содержимое, ETag); заполняется load() при старте.
+pages = {}
+
+
+def render_page(template_name, url_name):
+    """Рендерит страницу так, как её увидит анонимный посетитель."""
+    # django.test тянет unittest; воркеру при старте он не нужен.
+    from django.test import RequestFactory
+
+    path = reverse(url_name)
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.resolver_match = resolve(path)
+    request.build_absolute_uri = lambda location=None: URL_PLACEHOLDER
+    return render_to_string(template_name, request=request).encode()
+
+
+def build(output_dir):
+    """
+    Собирает статику с хешами в именах файлов и рендерит страницы
+    с этими адресами: их можно кешировать надолго.
+    """
+    from django.test import override_settings
+
+    # При DEBUG хранилище с манифестом отдаёт адреса без хешей.
+    with override_settings(STATICFILES_STORAGE=HASHED_STORAGE, DEBUG=False):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for name, (template_name, url_name) in PAGES.items():
+            (output_dir / f'{name}.html').write_bytes(
+                render_page(template_name, url_name)
+            )
+
+
+def load(output_dir):
+    """Загружает собранные страницы в память; без сборки их нет."""
+    pages.clear()
+    for name in PAGES:
+        page = output_dir / f'{name}.html'
+        if page.exists():
+            content = page.read_bytes()
+            pages[name] = (content, f'"{md5(content).hexdigest()}"')
@@ -1,11 +1,14 @@
 from django.urls import path
-from django.views.generic import TemplateView
+
+from .views import StaticPageView
 
 app_name = 'pages'
 
 urlpatterns = [
-    path('about/', TemplateView.as_view(template_name='pages/about.html'),
+    path('about/', StaticPageView.as_view(template_name='pages/about.html',
+                                          page_name='about'),
          name='about'),
-    path('rules/', TemplateView.as_view(template_name='pages/rules.html'),
+    path('rules/', StaticPageView.as_view(template_name='pages/rules.html',
+                                          page_name='rules'),
          name='rules'),
 ]
@@ -1,22 +1,66 @@
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.html import escape
+from django.views.generic import TemplateView
+
+from .prerender import URL_PLACEHOLDER, pages
+
+STATIC_PAGE_MAX_AGE = 60 * 60 * 24
+
+
+def prerendered(request, name):
+    """Собранная страница для анонимов или None, если её нужно рендерить."""
+    user = getattr(request, 'user', None)
+    if name not in pages or user is not None and user.is_authenticated:
+        return None
+    return pages[name]
+
+
+class StaticPageView(TemplateView):
+    """Статическая страница: для анонимов отдаётся собранной заранее."""
+    page_name = None
+
+    def get(self, request, *args, **kwargs):
+        page = prerendered(request, self.page_name)
+        if page is None:
+            return super().get(request, *args, **kwargs)
+        content, etag = page
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content)
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=STATIC_PAGE_MAX_AGE)
+        return response
+
+
+def error_page(request, name, template_name, status):
+    page = prerendered(request, name)
+    if page is None:
+        return render(request, template_name, status=status)
+    content = page[0].replace(
+        URL_PLACEHOLDER.encode(),
+        escape(request.build_absolute_uri()).encode()
+    )
+    return HttpResponse(content, status=status)
 
 
 def tr_handler404(request, exception):
     """
     Обработка ошибки 404
     """
-    return render(request, 'pages/404.html', status=404)
+    return error_page(request, '404', 'pages/404.html', 404)
 
 
 def tr_handler403(request, reason=''):
     """
     Обработка ошибки 403
     """
-    return render(request, 'pages/403csrf.html', status=403)
+    return error_page(request, '403csrf', 'pages/403csrf.html', 403)
 
 
 def tr_handler500(request):
     """
     Обработка ошибки 500
     """
-    return render(request, template_name='pages/500.html', status=500)
+    return error_page(request, '500', 'pages/500.html', 500)
@@ -31,7 +31,8 @@ def CommentModelAdapter(CommentModel: type) -> CommentModelAdapterT:
 
         @property
         def _access_by_name_fields(self):
-            return ['id', 'refresh_from_db']
+            # text_html и deleted_at — служебные поля, а не поля задания.
+            return ['id', 'refresh_from_db', 'text_html', 'deleted_at']
 
         @property
         def AdapterFields(self) -> type:
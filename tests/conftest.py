@@ -72,10 +72,49 @@ pytest_plugins = [
     'fixtures.locations',
     'fixtures.categories',
     'fixtures.comments',
+    'fixtures.sql_snapshots',
     'adapters.comment',
 ]
 
 
+@pytest.fixture(scope='session', autouse=True)
+def shared_cache_dir(tmp_path_factory):
+    """
+    Общий кеш воркеров — во временном каталоге, в том числе для
+    сигналов, сработавших при создании тестовой базы.
+    """
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    caches_setting = {
+        **settings.CACHES,
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tmp_path_factory.mktemp('shared_cache'),
+        },
+    }
+    with override_settings(CACHES=caches_setting):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def blog_test_settings(settings):
+    """
+    Настройки блога для тестов: ленивые запросы — ошибка, фоновые
+    записи статистики и журнал медленных запросов выключены, чтобы
+    не добавлять запросы в чужие замеры. Общий кеш очищается перед
+    каждым тестом.
+    """
+    from blog import shared_cache
+
+    settings.BLOG_STRICT_LOADING = 'raise'
+    settings.BLOG_QUERY_STATS_FLUSH_INTERVAL = None
+    settings.BLOG_SLOW_QUERY_MS = None
+    shared_cache.clear()
+    yield
+    shared_cache.forget_all()
+
+
 @pytest.fixture
 def mixer():
     return _mixer
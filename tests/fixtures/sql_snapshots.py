@@ -0,0 +1,127 @@
+"""
+Снимки SQL: какие запросы и сколько выполняет представление.
+
+Снимок хранится в tests/snapshots/sql/<имя>.sql и проверяется на каждом
+прогоне. Если запросы изменились намеренно, снимки перезаписываются
+запуском pytest с --update-sql-snapshots, а разница попадает в ревью.
+С --plans к каждому снимку добавляется <имя>.plan — EXPLAIN QUERY PLAN
+для SELECT-запросов в SQLite, чтобы было видно потерю индекса.
+"""
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+
+from blog import shared_cache
+from blog.publishing import publish_due
+
+SNAPSHOTS_DIR = Path(__file__).resolve().parent.parent / 'snapshots' / 'sql'
+
+# Значения уходят в параметры, но длина списков и имена точек
+# сохранения от данных зависят — их тоже приводим к одному виду.
+NORMALIZERS = (
+    (re.compile(r'IN \((?:%s, )*%s\)'), 'IN (...)'),
+    (re.compile(r'(\(%s(?:, %s)*\))(?:, \1)+'), r'\1, ...'),
+    (re.compile(r'"s\d+_x\d+"'), '"s_x"'),
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('sql snapshots')
+    group.addoption(
+        '--update-sql-snapshots', action='store_true',
+        help='Перезаписать снимки SQL вместо сравнения.'
+    )
+    group.addoption(
+        '--plans', action='store_true',
+        help='Сравнивать и планы запросов (EXPLAIN QUERY PLAN, SQLite).'
+    )
+
+
+def normalize(sql):
+    for pattern, replacement in NORMALIZERS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def render_queries(name, queries):
+    lines = [f'-- {name}', f'-- Запросов: {len(queries)}', '']
+    for sql, _ in queries:
+        lines.extend((normalize(sql) + ';', ''))
+    return '\n'.join(lines)
+
+
+def render_plans(name, queries):
+    lines = [f'-- {name}', '']
+    with connection.cursor() as cursor:
+        for number, (sql, params) in enumerate(queries, 1):
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            depth = {0: -1}
+            lines.append(f'-- Запрос {number}')
+            for node, parent, _, detail in cursor.fetchall():
+                depth[node] = depth.get(parent, -1) + 1
+                lines.append('  ' * depth[node] + detail)
+            lines.append('')
+    return '\n'.join(lines)
+
+
+def compare(path, actual, update):
+    if update:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(actual, encoding='utf-8')
+        return
+    if not path.exists():
+        pytest.fail(
+            f'Нет снимка `{path.name}`: запустите pytest '
+            f'с --update-sql-snapshots и добавьте его в коммит.'
+        )
+    expected = path.read_text(encoding='utf-8')
+    assert actual == expected, (
+        f'Запросы изменились по сравнению со снимком `{path.name}`. '
+        f'Если так и задумано, обновите снимки '
+        f'с --update-sql-snapshots.'
+    )
+
+
+@pytest.fixture
+def sql_snapshot(request):
+    """
+    Контекстный менеджер: сравнивает запросы блока со снимком.
+
+    Перед замером кеши очищаются и отложенные публикации открываются,
+    чтобы их проверка не попадала в снимок.
+    """
+    update = request.config.getoption('--update-sql-snapshots')
+    with_plans = request.config.getoption('--plans')
+
+    @contextmanager
+    def snapshot(name):
+        cache.clear()
+        shared_cache.clear()
+        publish_due()
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            yield
+        compare(
+            SNAPSHOTS_DIR / f'{name}.sql',
+            render_queries(name, queries),
+            update
+        )
+        if with_plans and connection.vendor == 'sqlite':
+            compare(
+                SNAPSHOTS_DIR / f'{name}.plan',
+                render_plans(name, queries),
+                update
+            )
+
+    return snapshot
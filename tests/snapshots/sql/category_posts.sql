@@ -0,0 +1,6 @@
+-- category_posts
+-- Запросов: 2
+
+SELECT "blog_category"."id", "blog_category"."is_published", "blog_category"."created_at", "blog_category"."posts_count", "blog_category"."published_posts_count", "blog_category"."title", "blog_category"."description", "blog_category"."slug" FROM "blog_category" WHERE ("blog_category"."is_published" AND "blog_category"."slug" = %s) LIMIT 21;
+
+SELECT "blog_post"."id", "blog_post"."is_published", "blog_post"."title", "blog_post"."text", "blog_post"."pub_date", "blog_post"."author_id", "blog_post"."location_id", "blog_post"."category_id", "blog_post"."image", COUNT("blog_comment"."id") FILTER (WHERE "blog_comment"."deleted_at" IS NULL) AS "comment_count", "auth_user"."id", "auth_user"."username", "blog_location"."id", "blog_location"."is_published", "blog_location"."name", "blog_category"."id", "blog_category"."is_published", "blog_category"."title", "blog_category"."slug" FROM "blog_post" INNER JOIN "blog_category" ON ("blog_post"."category_id" = "blog_category"."id") LEFT OUTER JOIN "blog_comment" ON ("blog_post"."id" = "blog_comment"."post_id") INNER JOIN "auth_user" ON ("blog_post"."author_id" = "auth_user"."id") LEFT OUTER JOIN "blog_location" ON ("blog_post"."location_id" = "blog_location"."id") WHERE ("blog_post"."deleted_at" IS NULL AND "blog_post"."category_id" = %s AND "blog_post"."is_visible") GROUP BY "blog_post"."id", "blog_post"."is_published", "blog_post"."title", "blog_post"."text", "blog_post"."pub_date", "blog_post"."author_id", "blog_post"."location_id", "blog_post"."category_id", "blog_post"."image", "auth_user"."id", "auth_user"."username", "blog_location"."id", "blog_location"."is_published", "blog_location"."name", "blog_category"."id", "blog_category"."is_published", "blog_category"."title", "blog_category"."slug" ORDER BY "blog_post"."pub_date" DESC LIMIT 3;
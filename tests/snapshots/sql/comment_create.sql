@@ -0,0 +1,12 @@
+-- comment_create
+-- Запросов: 5
+
+SELECT "django_session"."session_key", "django_session"."session_data", "django_session"."expire_date" FROM "django_session" WHERE ("django_session"."expire_date" > %s AND "django_session"."session_key" = %s) LIMIT 21;
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "auth_user" WHERE "auth_user"."id" = %s LIMIT 21;
+
+SELECT "blog_post"."id" FROM "blog_post" WHERE ("blog_post"."deleted_at" IS NULL AND "blog_post"."id" = %s) LIMIT 21;
+
+INSERT INTO "blog_comment" ("text_html", "text", "created_at", "author_id", "post_id", "deleted_at") VALUES (%s, %s, %s, %s, %s, %s);
+
+UPDATE "blog_feedentry" SET "comment_count" = ("blog_feedentry"."comment_count" + %s) WHERE "blog_feedentry"."post_id" = %s;
@@ -0,0 +1,14 @@
+-- comment_delete
+-- Запросов: 6
+
+SELECT "blog_comment"."id", "blog_comment"."text_html", "blog_comment"."text", "blog_comment"."created_at", "blog_comment"."author_id", "blog_comment"."post_id", "blog_comment"."deleted_at" FROM "blog_comment" WHERE ("blog_comment"."deleted_at" IS NULL AND "blog_comment"."id" = %s AND "blog_comment"."post_id" = %s) LIMIT 21;
+
+SELECT "django_session"."session_key", "django_session"."session_data", "django_session"."expire_date" FROM "django_session" WHERE ("django_session"."expire_date" > %s AND "django_session"."session_key" = %s) LIMIT 21;
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "auth_user" WHERE "auth_user"."id" = %s LIMIT 21;
+
+SELECT "blog_comment"."post_id" FROM "blog_comment" WHERE ("blog_comment"."deleted_at" IS NULL AND "blog_comment"."id" = %s) ORDER BY "blog_comment"."created_at" ASC;
+
+UPDATE "blog_comment" SET "deleted_at" = %s WHERE ("blog_comment"."deleted_at" IS NULL AND "blog_comment"."id" = %s);
+
+UPDATE "blog_feedentry" SET "comment_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_comment" U0 WHERE (U0."deleted_at" IS NULL AND U0."post_id" = "blog_feedentry"."post_id") GROUP BY U0."post_id"), %s) WHERE "blog_feedentry"."post_id" IN (...);
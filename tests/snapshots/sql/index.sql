@@ -0,0 +1,6 @@
+-- index
+-- Запросов: 2
+
+SELECT SUM("blog_category"."published_posts_count") AS "total" FROM "blog_category";
+
+SELECT "blog_feedentry"."post_id", "blog_feedentry"."pub_date", "blog_feedentry"."title", "blog_feedentry"."excerpt", "blog_feedentry"."image", "blog_feedentry"."author_id", "blog_feedentry"."author_username", "blog_feedentry"."category_id", "blog_feedentry"."category_slug", "blog_feedentry"."category_title", "blog_feedentry"."location_id", "blog_feedentry"."location_name", "blog_feedentry"."comment_count" FROM "blog_feedentry" ORDER BY "blog_feedentry"."pub_date" DESC, "blog_feedentry"."post_id" DESC LIMIT 3;
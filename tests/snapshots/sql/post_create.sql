@@ -0,0 +1,26 @@
+-- post_create
+-- Запросов: 12
+
+SELECT "django_session"."session_key", "django_session"."session_data", "django_session"."expire_date" FROM "django_session" WHERE ("django_session"."expire_date" > %s AND "django_session"."session_key" = %s) LIMIT 21;
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "auth_user" WHERE "auth_user"."id" = %s LIMIT 21;
+
+SELECT "blog_category"."id", "blog_category"."is_published", "blog_category"."created_at", "blog_category"."posts_count", "blog_category"."published_posts_count", "blog_category"."title", "blog_category"."description", "blog_category"."slug" FROM "blog_category" WHERE "blog_category"."id" = %s LIMIT 21;
+
+SELECT "blog_location"."id", "blog_location"."is_published", "blog_location"."created_at", "blog_location"."posts_count", "blog_location"."published_posts_count", "blog_location"."name" FROM "blog_location" WHERE "blog_location"."id" = %s LIMIT 21;
+
+SELECT (1) AS "a" FROM "blog_location" WHERE "blog_location"."id" = %s LIMIT 1;
+
+SELECT (1) AS "a" FROM "blog_category" WHERE "blog_category"."id" = %s LIMIT 1;
+
+INSERT INTO "blog_post" ("is_published", "created_at", "text_html", "title", "text", "pub_date", "author_id", "location_id", "category_id", "image", "is_visible", "deleted_at") VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+
+UPDATE "blog_category" SET "posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."category_id" = "blog_category"."id") GROUP BY U0."category_id"), %s), "published_posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."category_id" = "blog_category"."id" AND U0."is_visible") GROUP BY U0."category_id"), %s) WHERE "blog_category"."id" IN (...);
+
+UPDATE "blog_location" SET "posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."location_id" = "blog_location"."id") GROUP BY U0."location_id"), %s), "published_posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."is_visible" AND U0."location_id" = "blog_location"."id") GROUP BY U0."location_id"), %s) WHERE "blog_location"."id" IN (...);
+
+INSERT OR IGNORE INTO "blog_profilestats" ("posts_count", "published_posts_count", "user_id") SELECT %s, %s, %s;
+
+UPDATE "blog_profilestats" SET "posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."author_id" = "blog_profilestats"."user_id") GROUP BY U0."author_id"), %s), "published_posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."author_id" = "blog_profilestats"."user_id" AND U0."is_visible") GROUP BY U0."author_id"), %s) WHERE "blog_profilestats"."user_id" IN (...);
+
+INSERT INTO "blog_feedentry" ("post_id", "pub_date", "title", "excerpt", "image", "author_id", "author_username", "category_id", "category_slug", "category_title", "location_id", "location_name", "comment_count") SELECT %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s;
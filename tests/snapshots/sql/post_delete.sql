@@ -0,0 +1,22 @@
+-- post_delete
+-- Запросов: 10
+
+SELECT "django_session"."session_key", "django_session"."session_data", "django_session"."expire_date" FROM "django_session" WHERE ("django_session"."expire_date" > %s AND "django_session"."session_key" = %s) LIMIT 21;
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "auth_user" WHERE "auth_user"."id" = %s LIMIT 21;
+
+SELECT "blog_post"."id", "blog_post"."is_published", "blog_post"."created_at", "blog_post"."text_html", "blog_post"."title", "blog_post"."text", "blog_post"."pub_date", "blog_post"."author_id", "blog_post"."location_id", "blog_post"."category_id", "blog_post"."image", "blog_post"."is_visible", "blog_post"."deleted_at" FROM "blog_post" WHERE ("blog_post"."deleted_at" IS NULL AND "blog_post"."author_id" = %s AND "blog_post"."id" = %s) LIMIT 21;
+
+SAVEPOINT "s_x";
+
+UPDATE "blog_post" SET "deleted_at" = %s, "is_visible" = %s WHERE "blog_post"."id" = %s;
+
+DELETE FROM "blog_feedentry" WHERE "blog_feedentry"."post_id" = %s;
+
+UPDATE "blog_category" SET "posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."category_id" = "blog_category"."id") GROUP BY U0."category_id"), %s), "published_posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."category_id" = "blog_category"."id" AND U0."is_visible") GROUP BY U0."category_id"), %s) WHERE "blog_category"."id" IN (...);
+
+UPDATE "blog_location" SET "posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."location_id" = "blog_location"."id") GROUP BY U0."location_id"), %s), "published_posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."is_visible" AND U0."location_id" = "blog_location"."id") GROUP BY U0."location_id"), %s) WHERE "blog_location"."id" IN (...);
+
+UPDATE "blog_profilestats" SET "posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."author_id" = "blog_profilestats"."user_id") GROUP BY U0."author_id"), %s), "published_posts_count" = COALESCE((SELECT COUNT(U0."id") AS "total" FROM "blog_post" U0 WHERE (U0."deleted_at" IS NULL AND U0."author_id" = "blog_profilestats"."user_id" AND U0."is_visible") GROUP BY U0."author_id"), %s) WHERE "blog_profilestats"."user_id" IN (...);
+
+RELEASE SAVEPOINT "s_x";
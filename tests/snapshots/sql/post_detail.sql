@@ -0,0 +1,10 @@
+-- post_detail
+-- Запросов: 4
+
+SELECT "blog_post"."id", "blog_post"."is_published", "blog_post"."created_at", "blog_post"."text_html", "blog_post"."title", "blog_post"."text", "blog_post"."pub_date", "blog_post"."author_id", "blog_post"."location_id", "blog_post"."category_id", "blog_post"."image", "blog_post"."is_visible", "blog_post"."deleted_at", "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined", "blog_location"."id", "blog_location"."is_published", "blog_location"."created_at", "blog_location"."posts_count", "blog_location"."published_posts_count", "blog_location"."name", "blog_category"."id", "blog_category"."is_published", "blog_category"."created_at", "blog_category"."posts_count", "blog_category"."published_posts_count", "blog_category"."title", "blog_category"."description", "blog_category"."slug" FROM "blog_post" INNER JOIN "auth_user" ON ("blog_post"."author_id" = "auth_user"."id") LEFT OUTER JOIN "blog_location" ON ("blog_post"."location_id" = "blog_location"."id") LEFT OUTER JOIN "blog_category" ON ("blog_post"."category_id" = "blog_category"."id") WHERE ("blog_post"."deleted_at" IS NULL AND "blog_post"."id" = %s) LIMIT 21;
+
+SELECT "django_session"."session_key", "django_session"."session_data", "django_session"."expire_date" FROM "django_session" WHERE ("django_session"."expire_date" > %s AND "django_session"."session_key" = %s) LIMIT 21;
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "auth_user" WHERE "auth_user"."id" = %s LIMIT 21;
+
+SELECT "blog_comment"."id", "blog_comment"."text_html", "blog_comment"."text", "blog_comment"."created_at", "blog_comment"."author_id", "blog_comment"."post_id", "auth_user"."id", "auth_user"."username" FROM "blog_comment" INNER JOIN "auth_user" ON ("blog_comment"."author_id" = "auth_user"."id") WHERE ("blog_comment"."deleted_at" IS NULL AND "blog_comment"."post_id" = %s) ORDER BY "blog_comment"."created_at" ASC;
@@ -0,0 +1,20 @@
+-- post_edit
+-- Запросов: 9
+
+SELECT "blog_post"."id", "blog_post"."is_published", "blog_post"."created_at", "blog_post"."text_html", "blog_post"."title", "blog_post"."text", "blog_post"."pub_date", "blog_post"."author_id", "blog_post"."location_id", "blog_post"."category_id", "blog_post"."image", "blog_post"."is_visible", "blog_post"."deleted_at", "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "blog_post" INNER JOIN "auth_user" ON ("blog_post"."author_id" = "auth_user"."id") WHERE ("blog_post"."deleted_at" IS NULL AND "blog_post"."id" = %s) LIMIT 21;
+
+SELECT "django_session"."session_key", "django_session"."session_data", "django_session"."expire_date" FROM "django_session" WHERE ("django_session"."expire_date" > %s AND "django_session"."session_key" = %s) LIMIT 21;
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "auth_user" WHERE "auth_user"."id" = %s LIMIT 21;
+
+SELECT "blog_category"."id", "blog_category"."is_published", "blog_category"."created_at", "blog_category"."posts_count", "blog_category"."published_posts_count", "blog_category"."title", "blog_category"."description", "blog_category"."slug" FROM "blog_category" WHERE "blog_category"."id" = %s LIMIT 21;
+
+SELECT "blog_location"."id", "blog_location"."is_published", "blog_location"."created_at", "blog_location"."posts_count", "blog_location"."published_posts_count", "blog_location"."name" FROM "blog_location" WHERE "blog_location"."id" = %s LIMIT 21;
+
+SELECT (1) AS "a" FROM "blog_location" WHERE "blog_location"."id" = %s LIMIT 1;
+
+SELECT (1) AS "a" FROM "blog_category" WHERE "blog_category"."id" = %s LIMIT 1;
+
+UPDATE "blog_post" SET "is_published" = %s, "created_at" = %s, "text_html" = %s, "title" = %s, "text" = %s, "pub_date" = %s, "author_id" = %s, "location_id" = %s, "category_id" = %s, "image" = %s, "is_visible" = %s, "deleted_at" = NULL WHERE "blog_post"."id" = %s;
+
+UPDATE "blog_feedentry" SET "pub_date" = %s, "title" = %s, "excerpt" = %s, "image" = %s, "author_id" = %s, "author_username" = %s, "category_id" = %s, "category_slug" = %s, "category_title" = %s, "location_id" = %s, "location_name" = %s WHERE "blog_feedentry"."post_id" = %s;
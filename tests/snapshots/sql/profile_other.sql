@@ -0,0 +1,10 @@
+-- profile_other
+-- Запросов: 4
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined", "blog_profilestats"."posts_count", "blog_profilestats"."published_posts_count", "blog_profilestats"."user_id" FROM "auth_user" LEFT OUTER JOIN "blog_profilestats" ON ("auth_user"."id" = "blog_profilestats"."user_id") WHERE "auth_user"."username" = %s LIMIT 21;
+
+SELECT "django_session"."session_key", "django_session"."session_data", "django_session"."expire_date" FROM "django_session" WHERE ("django_session"."expire_date" > %s AND "django_session"."session_key" = %s) LIMIT 21;
+
+SELECT "auth_user"."id", "auth_user"."password", "auth_user"."last_login", "auth_user"."is_superuser", "auth_user"."username", "auth_user"."first_name", "auth_user"."last_name", "auth_user"."email", "auth_user"."is_staff", "auth_user"."is_active", "auth_user"."date_joined" FROM "auth_user" WHERE "auth_user"."id" = %s LIMIT 21;
+
+SELECT "blog_post"."id", "blog_post"."is_published", "blog_post"."title", "blog_post"."text", "blog_post"."pub_date", "blog_post"."author_id", "blog_post"."location_id", "blog_post"."category_id", "blog_post"."image", COUNT("blog_comment"."id") FILTER (WHERE "blog_comment"."deleted_at" IS NULL) AS "comment_count", "auth_user"."id", "auth_user"."username", "blog_location"."id", "blog_location"."is_published", "blog_location"."name", "blog_category"."id", "blog_category"."is_published", "blog_category"."title", "blog_category"."slug" FROM "blog_post" INNER JOIN "auth_user" ON ("blog_post"."author_id" = "auth_user"."id") LEFT OUTER JOIN "blog_comment" ON ("blog_post"."id" = "blog_comment"."post_id") LEFT OUTER JOIN "blog_location" ON ("blog_post"."location_id" = "blog_location"."id") LEFT OUTER JOIN "blog_category" ON ("blog_post"."category_id" = "blog_category"."id") WHERE ("blog_post"."deleted_at" IS NULL AND "blog_post"."is_visible" AND "blog_post"."author_id" = %s) GROUP BY "blog_post"."id", "blog_post"."is_published", "blog_post"."title", "blog_post"."text", "blog_post"."pub_date", "blog_post"."author_id", "blog_post"."location_id", "blog_post"."category_id", "blog_post"."image", "auth_user"."id", "auth_user"."username", "blog_location"."id", "blog_location"."is_published", "blog_location"."name", "blog_category"."id", "blog_category"."is_published", "blog_category"."title", "blog_category"."slug" ORDER BY "blog_post"."pub_date" DESC LIMIT 3;
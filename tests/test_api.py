@@ -0,0 +1,91 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.publishing import publish_due
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def get_json(client, url, status=200, **params):
+    response = client.get(url, params)
+    assert response.status_code == status, (
+        f'Убедитесь, что `{url}` отвечает кодом {status}.'
+    )
+    content = (
+        b''.join(response) if response.streaming else response.content
+    )
+    return response, json.loads(content)
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return mixer.cycle(15).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+        pub_date=(now - timedelta(hours=hour) for hour in range(1, 16)))
+
+
+def test_feed_cursor_pagination(
+        client, feed_posts, future_posts, django_assert_num_queries):
+    publish_due()
+    with django_assert_num_queries(1):
+        _, first = get_json(client, '/api/posts/')
+    assert len(first['results']) == 10
+    assert 'text' not in first['results'][0]
+    _, second = get_json(client, '/api/posts/', cursor=first['next'])
+    assert second['next'] is None
+    ids = [post['id'] for post in first['results'] + second['results']]
+    assert ids == [post.id for post in feed_posts]
+
+
+def test_sparse_fieldsets(client, feed_posts, published_location):
+    _, data = get_json(
+        client, '/api/posts/', fields='title,author,location', limit=1)
+    assert data['results'] == [{
+        'title': feed_posts[0].title,
+        'author': feed_posts[0].author.username,
+        'location': published_location.name,
+    }]
+    get_json(client, '/api/posts/', status=400, fields='password')
+
+
+def test_detail_and_comments(
+        client, mixer, feed_posts, django_assert_num_queries):
+    post = feed_posts[0]
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    publish_due()
+    with django_assert_num_queries(1):
+        _, data = get_json(client, f'/api/posts/{post.id}/')
+    assert data['text'] == post.text
+    assert data['comment_count'] == 3
+    with django_assert_num_queries(2):
+        _, data = get_json(client, f'/api/posts/{post.id}/comments/')
+    assert len(data['results']) == 3
+
+
+def test_visibility_and_not_found(
+        client, user, feed_posts, future_posts,
+        posts_with_unpublished_category):
+    for post in [*future_posts, *posts_with_unpublished_category]:
+        get_json(client, f'/api/posts/{post.id}/', status=404)
+        get_json(client, f'/api/posts/{post.id}/comments/', status=404)
+    _, data = get_json(client, f'/api/profile/{user.username}/posts/',
+                       limit=100)
+    assert len(data['results']) == len(feed_posts)
+    get_json(client, '/api/profile/nobody/posts/', status=404)
+    category = feed_posts[0].category
+    _, data = get_json(client, f'/api/category/{category.slug}/posts/')
+    assert len(data['results']) == 10
+
+
+def test_etag(client, feed_posts):
+    response, _ = get_json(client, '/api/posts/')
+    response = client.get(
+        '/api/posts/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 304
@@ -0,0 +1,51 @@
+import pytest
+
+from blog.budgets import QueryBudgetExceeded
+from blog.views import PostListView
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.mark.parametrize('page', ['', 'posts/{post.id}/',
+                                  'profile/{post.author.username}/',
+                                  'category/{post.category.slug}/'])
+def test_async_pages_match_sync_pages(
+        user_client, mixer, many_posts_with_published_locations, page):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    url = page.format(post=post)
+    sync_response = user_client.get(f'/{url}')
+    async_response = user_client.get(f'/async/{url}')
+    assert async_response.status_code == sync_response.status_code == 200
+    assert page_lines(async_response) == page_lines(sync_response)
+
+
+def page_lines(response):
+    content = response.content.decode().split('<div id="djDebug"')[0]
+    return [
+        line for line in content.splitlines()
+        if 'csrfmiddlewaretoken' not in line
+    ]
+
+
+def test_async_page_cached_for_anonymous(
+        client, django_assert_num_queries,
+        many_posts_with_published_locations):
+    post = many_posts_with_published_locations[0]
+    url = f'/async/category/{post.category.slug}/'
+    client.get(url)
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == 200, (
+        'Асинхронная страница категории для анонима должна отдаваться '
+        'из кеша страниц.'
+    )
+
+
+def test_async_page_over_budget_reported(
+        user_client, monkeypatch, many_posts_with_published_locations):
+    monkeypatch.setattr(PostListView, 'query_budget', 1)
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get('/async/')
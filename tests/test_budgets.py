@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+
+from blog import metrics
+from blog.budgets import QueryBudgetExceeded
+from blog.views import PostDetailView
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def post_url(post_with_published_location):
+    return f'/posts/{post_with_published_location.id}/'
+
+
+def test_views_fit_their_budgets(user_client, post_url):
+    assert user_client.get(post_url).status_code == 200
+
+
+def test_budget_exceeded_raises_with_diff(
+        monkeypatch, user_client, post_url):
+    user_client.get(post_url)
+    monkeypatch.setattr(PostDetailView, 'query_budget', 1)
+    with pytest.raises(QueryBudgetExceeded) as error:
+        user_client.get(post_url)
+    message = str(error.value)
+    assert 'blog:post_detail' in message
+    assert 'при бюджете 1' in message, 'В ошибке должен быть бюджет.'
+    assert '+ SELECT' in message, 'Лишние запросы должны быть отмечены.'
+
+
+def test_budget_diff_against_last_good_request(
+        monkeypatch, settings, user_client, post_url):
+    settings.BLOG_STRICT_LOADING = 'log'
+    user_client.get(post_url)
+    monkeypatch.setattr(PostDetailView, 'query_budget', 4)
+    monkeypatch.setattr(
+        PostDetailView, 'queryset',
+        PostDetailView.queryset.select_related(None)
+    )
+    with pytest.raises(QueryBudgetExceeded) as error:
+        user_client.get(post_url)
+    extra = [
+        line for line in str(error.value).splitlines()
+        if line.startswith('+ ')
+    ]
+    assert len(extra) == 4, (
+        'Разница должна показывать отдельные запросы связей вместо JOIN.'
+    )
+
+
+def test_budget_exceeded_logged_in_production(
+        monkeypatch, settings, caplog, user_client, post_url):
+    settings.BLOG_QUERY_BUDGETS = 'log'
+    metrics.reset()
+    monkeypatch.setattr(PostDetailView, 'query_budget', 1)
+    with caplog.at_level(logging.WARNING, logger='blog.budgets'):
+        assert user_client.get(post_url).status_code == 200
+    assert 'запросов 4 при бюджете 1' in caplog.text
+    assert (
+        'blog_query_budget_exceeded_total{view="blog:post_detail"} 1'
+        in metrics.render()
+    ), 'Превышение бюджета должно попадать в метрики.'
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import DatabaseError
+
+from blog import comment_buffer as buffer_module
+from blog.comment_buffer import comment_buffer
+from blog.models import Comment, FeedEntry
+from blog.ratelimit import take_token
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_token_bucket():
+    assert take_token('bucket', 1, 2, now=0) == 0
+    assert take_token('bucket', 1, 2, now=0) == 0
+    assert take_token('bucket', 1, 2, now=0) == 1
+    assert take_token('bucket', 1, 2, now=0.5) == 0.5
+    assert take_token('bucket', 1, 2, now=1) == 0
+
+
+def test_comments_rate_limited(
+        settings, user_client, post_with_published_location):
+    settings.BLOG_COMMENT_RATE_LIMITS = {'user': (0.1, 2), 'post': (100, 100)}
+    url = f'/posts/{post_with_published_location.id}/comment/'
+    for _ in range(2):
+        assert user_client.post(url, {'text': 'Текст'}).status_code == (
+            HTTPStatus.FOUND
+        )
+    response = user_client.post(url, {'text': 'Текст'})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        'Частые комментарии одного пользователя должны отклоняться.'
+    )
+    assert response['Retry-After'] == '10'
+    assert Comment.objects.count() == 2
+
+
+def test_buffered_comments_saved_in_one_batch(
+        settings, monkeypatch, user_client, post_with_published_location,
+        django_assert_num_queries):
+    settings.BLOG_COMMENT_BUFFER = True
+    monkeypatch.setattr(comment_buffer, '_start_worker', lambda: None)
+    post = post_with_published_location
+    for _ in range(3):
+        response = user_client.post(
+            f'/posts/{post.id}/comment/', {'text': 'Текст'}
+        )
+        assert response.status_code == HTTPStatus.FOUND
+    assert not Comment.objects.exists()
+    with django_assert_num_queries(4):
+        assert comment_buffer.flush() == 3
+    assert Comment.objects.filter(post=post).count() == 3
+    assert FeedEntry.objects.get(post=post).comment_count == 3
+
+
+def test_failed_batch_returns_to_buffer(
+        monkeypatch, user, post_with_published_location):
+    bulk_create = Comment.objects.bulk_create
+
+    def fail_on_bad(comments):
+        if any(comment.text == 'Плохой' for comment in comments):
+            raise DatabaseError('нет места')
+        return bulk_create(comments)
+
+    monkeypatch.setattr(Comment.objects, 'bulk_create', fail_on_bad)
+    monkeypatch.setattr(comment_buffer, '_start_worker', lambda: None)
+    monkeypatch.setattr(comment_buffer, 'dead_letters', [])
+    for text in ('Текст', 'Плохой'):
+        comment_buffer.add(Comment(
+            text=text, author=user, post=post_with_published_location
+        ))
+    for _ in range(buffer_module.MAX_ATTEMPTS - 1):
+        with pytest.raises(DatabaseError):
+            comment_buffer.flush()
+        assert len(comment_buffer._pending) == 2, (
+            'Несохранённая пачка должна вернуться в буфер.'
+        )
+    assert comment_buffer.flush() == 1
+    assert Comment.objects.get().text == 'Текст'
+    assert [comment.text for comment in comment_buffer.dead_letters] == [
+        'Плохой'
+    ], 'Несохраняемый комментарий должен уйти в dead_letters.'
+    assert not comment_buffer._pending
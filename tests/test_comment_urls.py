@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Comment
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def comments(mixer, user, post_with_published_location):
+    # Комментарии к посту, у которых pk не совпадает с id поста.
+    mixer.cycle(2).blend('blog.Comment', post=post_with_published_location)
+    return mixer.cycle(2).blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+
+
+def test_comment_found_by_its_own_pk(
+        user_client, comments, post_with_published_location):
+    post = post_with_published_location
+    comment = comments[-1]
+    assert comment.pk != post.pk
+    response = user_client.get(
+        f'/posts/{post.id}/edit_comment/{comment.id}/'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['form'].instance == comment, (
+        'Редактироваться должен комментарий из адреса, а не комментарий '
+        'с номером поста.'
+    )
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    assert set(Comment.objects.all()) >= set(comments[:-1])
+    assert not Comment.objects.filter(pk=comment.pk).exists(), (
+        'Удаляться должен комментарий из адреса.'
+    )
+
+
+def test_comment_of_other_post_not_found(
+        mixer, user, user_client, comments):
+    other_post = mixer.blend('blog.Post', author=user)
+    comment = comments[0]
+    for action in ('edit_comment', 'delete_comment'):
+        response = user_client.get(
+            f'/posts/{other_post.id}/{action}/{comment.id}/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Комментарий под адресом чужого поста не должен находиться.'
+        )
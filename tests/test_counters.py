@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.counters import reconcile_counters
+from blog.models import Category, Location, ProfileStats
+from blog.publishing import publish_due
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def counters(obj):
+    obj.refresh_from_db()
+    return obj.posts_count, obj.published_posts_count
+
+
+def test_counters_follow_post_changes(
+        mixer, user, post_with_published_location, published_category):
+    post = post_with_published_location
+    location = post.location
+    stats = ProfileStats.objects.get(user=user)
+    assert counters(published_category) == (1, 1)
+    assert counters(location) == (1, 1)
+    assert counters(stats) == (1, 1)
+    post.is_published = False
+    post.save()
+    assert counters(published_category) == (1, 0)
+    other_category = mixer.blend('blog.Category', is_published=True)
+    post.category = other_category
+    post.save()
+    assert counters(published_category) == (0, 0)
+    assert counters(other_category) == (1, 0)
+    post.delete()
+    assert counters(other_category) == (0, 0)
+    assert counters(location) == (0, 0)
+    assert counters(stats) == (0, 0)
+
+
+def test_counters_follow_bulk_visibility_changes(
+        mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1))
+    assert counters(published_category) == (1, 0)
+    publish_due(now=post.pub_date + timedelta(seconds=1))
+    assert counters(published_category) == (1, 1)
+    published_category.is_published = False
+    published_category.save()
+    assert counters(published_category) == (1, 0)
+    assert counters(ProfileStats.objects.get(user=user)) == (1, 0)
+
+
+def test_reconcile_repairs_counters(post_with_published_location):
+    Category.objects.update(posts_count=10, published_posts_count=10)
+    Location.objects.update(published_posts_count=0)
+    ProfileStats.objects.all().delete()
+    reconcile_counters()
+    assert counters(post_with_published_location.category) == (1, 1)
+    assert counters(post_with_published_location.location) == (1, 1)
+    assert counters(
+        ProfileStats.objects.get(user=post_with_published_location.author)
+    ) == (1, 1)
+
+
+def test_pages_do_not_count_posts(
+        client, user, many_posts_with_published_locations):
+    cache.clear()
+    category = many_posts_with_published_locations[0].category
+    for url in ('/', f'/category/{category.slug}/',
+                f'/profile/{user.username}/'):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.context['page_obj'].paginator.count == 20
+        assert not [
+            query for query in queries
+            if query['sql'].startswith('SELECT COUNT(*)')
+        ], f'Страница `{url}` не должна считать посты через COUNT(*).'
+
+
+def test_category_page_cached_for_anonymous_users(
+        client, mixer, post_with_published_location,
+        django_assert_max_num_queries):
+    cache.clear()
+    url = f'/category/{post_with_published_location.category.slug}/'
+    publish_due()
+    client.get(url)
+    with django_assert_max_num_queries(0):
+        assert client.get(url).status_code == 200
+    mixer.blend('blog.Comment', post=post_with_published_location)
+    response = client.get(url)
+    assert 'Комментарии (1)' in response.content.decode()
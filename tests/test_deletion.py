@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import deletion
+from blog.deletion import delete_user, restore_comments, restore_posts
+from blog.models import Comment, FeedEntry, Post, ProfileStats, User
+from blog.publishing import publish_due
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def delete_post_queries(user_client, post):
+    publish_due()
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(f'/posts/{post.id}/delete/')
+    assert response.status_code == 302
+    return len(queries)
+
+
+def test_post_deletion_does_not_depend_on_comments(
+        mixer, user, user_client, published_category):
+    few = mixer.blend('blog.Post', author=user, category=published_category)
+    many = mixer.blend('blog.Post', author=user, category=published_category)
+    mixer.cycle(2).blend('blog.Comment', post=few)
+    mixer.cycle(40).blend('blog.Comment', post=many)
+    assert delete_post_queries(user_client, few) == delete_post_queries(
+        user_client, many
+    ), 'Число запросов при удалении поста не должно зависеть от комментариев.'
+    assert not Post.objects.exists()
+    assert Post.all_objects.count() == 2, (
+        'Удалённые посты хранятся до очистки.'
+    )
+    assert not FeedEntry.objects.exists()
+    assert ProfileStats.objects.get(user=user).posts_count == 0
+    call_command('purge_deleted', days=0)
+    assert not Post.all_objects.exists()
+    assert not Comment.all_objects.exists()
+
+
+def test_purge_keeps_recently_deleted(mixer, user, published_category):
+    old, recent = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category)
+    mixer.blend('blog.Comment', post=recent)
+    deletion.soft_delete_posts(Post.objects.all())
+    Post.all_objects.filter(pk=old.pk).update(
+        deleted_at=timezone.now() - timedelta(days=31)
+    )
+    call_command('purge_deleted', days=30, batch_size=1)
+    assert list(Post.all_objects.all()) == [recent]
+    assert Comment.objects.count() == 1
+
+
+def test_image_removed_on_purge(
+        settings, tmp_path, user, user_client, mixer, published_category,
+        django_capture_on_commit_callbacks):
+    settings.MEDIA_ROOT = tmp_path
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    post.image.save('photo.jpg', ContentFile(b'jpeg'))
+    path = tmp_path / post.image.name
+    user_client.post(f'/posts/{post.id}/delete/')
+    assert path.exists()
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('purge_deleted', days=0)
+    assert not path.exists(), 'Файл изображения должен удаляться с постом.'
+
+
+def test_restore_soft_deleted(
+        mixer, user, user_client, published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    user_client.post(
+        f'/posts/{post.id}/delete_comment/{comment.id}/'
+    )
+    assert not Comment.objects.exists()
+    assert FeedEntry.objects.get(post=post).comment_count == 0
+    user_client.post(f'/posts/{post.id}/delete/')
+    assert user_client.get(f'/posts/{post.id}/').status_code == 404
+    restore_posts(Post.all_objects.all())
+    restore_comments(Comment.all_objects.all())
+    post.refresh_from_db()
+    assert post.deleted_at is None and post.is_visible
+    assert FeedEntry.objects.get(post=post).comment_count == 1
+    assert ProfileStats.objects.get(user=user).published_posts_count == 1
+
+
+def test_delete_user(mixer, user, another_user, published_category):
+    own_post = mixer.blend(
+        'blog.Post', author=user, category=published_category)
+    other_post = mixer.blend(
+        'blog.Post', author=another_user, category=published_category)
+    mixer.cycle(3).blend('blog.Comment', post=own_post, author=another_user)
+    mixer.cycle(3).blend('blog.Comment', post=other_post, author=user)
+    mixer.blend('blog.Comment', post=other_post, author=another_user)
+    delete_user(user)
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert list(Post.objects.all()) == [other_post]
+    assert Comment.objects.count() == 1
+    assert FeedEntry.objects.get(post=other_post).comment_count == 1
+
+
+def test_async_user_deletion(
+        settings, monkeypatch, mixer, user, another_user, client,
+        published_category, django_capture_on_commit_callbacks):
+    settings.BLOG_ASYNC_DELETION = True
+    started = []
+    monkeypatch.setattr(
+        deletion, 'run_in_background',
+        lambda func, *args: started.append((func, args))
+    )
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    other_post = mixer.blend(
+        'blog.Post', author=another_user, category=published_category)
+    mixer.blend('blog.Comment', post=other_post, author=user)
+    with django_capture_on_commit_callbacks(execute=True):
+        deletion.remove_user(user)
+    assert started, 'Удаление должно уйти в фон.'
+    assert client.get(f'/posts/{post.id}/').status_code == 404
+    assert FeedEntry.objects.get(post=other_post).comment_count == 0
+    user.refresh_from_db()
+    assert not user.is_active
+    func, args = started[0]
+    func(*args)
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert list(Post.all_objects.all()) == [other_post]
@@ -0,0 +1,76 @@
+import pytest
+from django.core.cache import cache
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_feed_lists_only_visible_posts(
+        client, post_with_published_location, future_posts,
+        posts_with_unpublished_category):
+    response = client.get('/feed/')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('application/rss+xml')
+    content = response.content.decode()
+    assert post_with_published_location.title in content
+    for post in [*future_posts, *posts_with_unpublished_category]:
+        assert f'<title>{post.title}</title>' not in content
+
+
+def test_category_and_profile_feeds(
+        client, mixer, user, post_with_published_location):
+    category = post_with_published_location.category
+    other_post = mixer.blend(
+        'blog.Post', category__is_published=True,
+        pub_date=post_with_published_location.pub_date)
+    response = client.get(f'/category/{category.slug}/feed/atom/')
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert post_with_published_location.title in content
+    assert other_post.title not in content
+    response = client.get(f'/profile/{user.username}/feed/')
+    assert response.status_code == 200
+    assert post_with_published_location.title in response.content.decode()
+    assert client.get('/category/missing/feed/').status_code == 404
+
+
+def test_feed_conditional_get(client, post_with_published_location):
+    response = client.get('/feed/')
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+    response = client.get('/feed/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 304
+
+
+def test_feed_if_modified_since(client, post_with_published_location):
+    response = client.get('/feed/')
+    response = client.get(
+        '/feed/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert response.status_code == 304, (
+        'Лента должна учитывать If-Modified-Since.'
+    )
+
+
+def test_category_feed_queries_and_missing_category(
+        client, django_assert_num_queries, post_with_published_location):
+    category = post_with_published_location.category
+    url = f'/category/{category.slug}/feed/'
+    # Первый запрос заполняет расписание отложенных публикаций.
+    client.get('/feed/')
+    with django_assert_num_queries(2):
+        etag = client.get(url)['ETag']
+    category.slug = 'renamed'
+    category.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 404, (
+        'Для пропавшей категории лента должна отвечать 404, а не 304.'
+    )
@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from blog.lazyload import LazyLoadError
+from blog.manifests import TEMPLATE_FIELDS
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+CARD = 'includes/post_card.html'
+
+
+@pytest.fixture
+def card_without_title(monkeypatch):
+    monkeypatch.setitem(TEMPLATE_FIELDS, CARD, tuple(
+        field for field in TEMPLATE_FIELDS[CARD] if field != 'title'
+    ))
+
+
+def test_list_pages_have_no_lazy_loads(
+        mixer, user, user_client, another_user_client,
+        many_posts_with_published_locations):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    pages = (
+        f'/profile/{user.username}/',
+        f'/category/{post.category.slug}/',
+        f'/posts/{post.id}/',
+        f'/posts/{post.id}/edit/',
+    )
+    for client in (user_client, another_user_client):
+        for page in pages:
+            assert client.get(page).status_code in (200, 302)
+
+
+def test_lazy_load_raises_with_template_line(
+        card_without_title, client, post_with_published_location):
+    with pytest.raises(LazyLoadError) as error:
+        client.get(f'/category/{post_with_published_location.category.slug}/')
+    assert f'Post.title в {CARD}:10' in str(error.value), (
+        'Ошибка должна указывать поле, шаблон и строку ленивой загрузки.'
+    )
+
+
+def test_lazy_load_logged(
+        card_without_title, settings, client, caplog,
+        post_with_published_location):
+    settings.BLOG_STRICT_LOADING = 'log'
+    with caplog.at_level(logging.WARNING, logger='blog.lazyload'):
+        response = client.get(
+            f'/profile/{post_with_published_location.author.username}/'
+        )
+    assert response.status_code == 200
+    assert 'Post.title' in caplog.text
@@ -0,0 +1,57 @@
+import random
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog import loadtest
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True)
+]
+
+
+def test_hot_posts_and_deep_pages_skewed():
+    site = loadtest.Site(
+        post_ids=list(range(100)), pages=50, category_ids=[],
+        location_ids=[], usernames=[], page_skew=1.2, hot_skew=1.1, burst=1
+    )
+    rng = random.Random(1)
+    posts = [site.hot_post(rng) for _ in range(2000)]
+    pages = [site.page(rng) for _ in range(2000)]
+    assert posts.count(0) > posts.count(50) * 10, (
+        'Первые посты должны быть горячими.'
+    )
+    assert pages.count(1) > len(pages) / 3 and max(pages) > 10, (
+        'Лента должна чаще открываться с начала, но доходить до глубоких '
+        'страниц.'
+    )
+
+
+@pytest.mark.parametrize('scenario, requests', [
+    ('feed', ('feed',)),
+    ('detail', ('detail',)),
+    ('comment', ('login', 'comment')),
+    ('create', ('login', 'create_form', 'create')),
+])
+def test_load_test_against_live_server(
+        scenario, requests, settings, tmp_path, live_server,
+        many_posts_with_published_locations):
+    settings.MEDIA_ROOT = tmp_path
+    out = StringIO()
+    # Один клиент: SQLite в памяти не выдерживает параллельных записей.
+    call_command(
+        'load_test', live_server.url, '--duration', '0.5', '--clients', '1',
+        '--users', '1', '--mix', scenario, stdout=out
+    )
+    report = out.getvalue()
+    for name in requests:
+        assert f'\n{name} ' in report, f'В отчёте нет запросов {name}.'
+    assert 'ошибок 0' in report, report
+    assert 'blog:metrics' in report, 'В отчёте должны быть метрики сервера.'
+
+
+def test_load_test_only_on_loopback():
+    with pytest.raises(CommandError):
+        call_command('load_test', 'http://example.com')
@@ -0,0 +1,69 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+
+from blog.manifests import only_for
+from blog.models import Comment, Post, comment_count
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def assert_renders_without_queries(template_name, context):
+    with CaptureQueriesContext(connection) as queries:
+        render_to_string(template_name, context)
+    assert not queries.captured_queries, (
+        f'Шаблон `{template_name}` читает поля не из манифеста: '
+        f'{[query["sql"] for query in queries.captured_queries]}'
+    )
+
+
+def test_post_card_reads_only_manifest_fields(post_with_published_location):
+    posts = list(only_for(
+        Post.objects.select_related('author', 'category', 'location'),
+        'includes/post_card.html'
+    ).annotate(comment_count=comment_count()))
+    for post in posts:
+        assert_renders_without_queries(
+            'includes/post_card.html', {'post': post}
+        )
+
+
+def test_comments_read_only_manifest_fields(
+        mixer, user, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post, author=user)
+    comments = list(only_for(
+        Comment.objects.filter(post=post).select_related('author'),
+        'includes/comments.html'
+    ))
+    assert_renders_without_queries('includes/comments.html', {
+        'post': post, 'comments': comments, 'user': AnonymousUser()
+    })
+
+
+def test_list_pages_skip_unused_columns(
+        client, mixer, user, post_with_published_location):
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post, author=user)
+    pages = (
+        (f'/profile/{user.username}/', 'blog_post'),
+        (f'/category/{post.category.slug}/', 'blog_post'),
+        (f'/posts/{post.id}/', 'blog_comment'),
+    )
+    for page, table in pages:
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get(page).status_code == 200
+        sql = [
+            query['sql'] for query in queries.captured_queries
+            if f'FROM "{table}"' in query['sql']
+        ]
+        assert sql, f'Страница `{page}` не загрузила записи.'
+        for query in sql:
+            assert '"password"' not in query, (
+                f'Страница `{page}` загружает пароль автора: {query}'
+            )
+            assert '"description"' not in query
@@ -0,0 +1,50 @@
+import pytest
+
+from blog.publishing import publish_due
+from pages import prerender
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def built_pages(settings, tmp_path):
+    # Без панели отладки, которая дописывается в ответ.
+    settings.DEBUG = False
+    settings.STATIC_ROOT = tmp_path / 'static'
+    prerender.build(tmp_path / 'pages')
+    prerender.load(tmp_path / 'pages')
+    yield prerender.pages
+    prerender.load(tmp_path / 'missing')
+
+
+def test_static_pages_served_prerendered(
+        client, user_client, user, built_pages,
+        django_assert_num_queries):
+    publish_due()
+    content, etag = built_pages['about']
+    assert b'.png' in content and b'/static/img/logo.' in content
+    assert b'/static/img/logo.png' not in content, (
+        'В собранных страницах адреса статики должны быть с хешами.'
+    )
+    with django_assert_num_queries(0):
+        response = client.get('/pages/about/')
+    assert response.content == content
+    assert response['ETag'] == etag
+    assert 'max-age=86400' in response['Cache-Control']
+    assert client.get(
+        '/pages/about/', HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304
+    response = user_client.get('/pages/about/')
+    assert user.username in response.content.decode(), (
+        'Вошедшему пользователю страница рендерится с его шапкой.'
+    )
+
+
+def test_error_page_served_prerendered(client, built_pages):
+    response = client.get('/no-such-page/')
+    assert response.status_code == 404
+    assert 'Страница не найдена' in response.content.decode()
+    assert b'http://testserver/no-such-page/ ' in response.content
+    assert prerender.URL_PLACEHOLDER.encode() not in response.content
@@ -0,0 +1,56 @@
+import pytest
+from django.test import Client
+
+from blog.profiling import make_token
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.BLOG_PROFILE_DIR = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def staff_client(mixer):
+    client = Client()
+    client.force_login(mixer.blend('auth.User', is_staff=True))
+    return client
+
+
+def test_staff_query_param_profiles_request(
+        profile_dir, staff_client, post_with_published_location):
+    response = staff_client.get(
+        f'/posts/{post_with_published_location.id}/?profile=1'
+    )
+    name = response['X-Blog-Profile']
+    assert (profile_dir / f'{name}.prof').is_file()
+    collapsed = (profile_dir / f'{name}.collapsed').read_text()
+    stack, _, micros = collapsed.splitlines()[-1].rpartition(' ')
+    assert stack and micros.isdigit(), (
+        'Свёрнутые стеки должны быть в формате `кадр;кадр число`.'
+    )
+    assert 'render' in collapsed, 'В профиль должен попасть рендер шаблона.'
+    download = staff_client.get(f'/profiling/{name}.prof')
+    assert download.status_code == 200
+    assert download['Content-Disposition'].startswith('attachment')
+
+
+def test_profiling_needs_staff_or_signed_header(
+        profile_dir, user_client, client):
+    assert 'X-Blog-Profile' not in user_client.get('/?profile=1')
+    assert 'X-Blog-Profile' not in client.get(
+        '/', HTTP_X_BLOG_PROFILE='profile:forged:signature'
+    )
+    assert not list(profile_dir.iterdir()), (
+        'Без прав или подписи запрос не должен профилироваться.'
+    )
+    response = client.get('/', HTTP_X_BLOG_PROFILE=make_token())
+    assert (profile_dir / f'{response["X-Blog-Profile"]}.prof').is_file()
+    name = response['X-Blog-Profile']
+    assert user_client.get(f'/profiling/{name}.prof').status_code == 302, (
+        'Скачивать профили могут только сотрудники.'
+    )
@@ -0,0 +1,100 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+from blog import shared_cache
+from blog.models import Post
+from blog.publishing import (
+    NEXT_PUBLISH_KEY, NOTHING_SCHEDULED, get_generation, publish_due
+)
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1))
+
+
+@contextmanager
+def other_worker(monkeypatch):
+    """Свой экземпляр общего кеша и своя память — как в другом воркере."""
+    other = caches.create_connection(settings.BLOG_SHARED_CACHE)
+    with monkeypatch.context() as patch:
+        patch.setattr(shared_cache, 'shared_cache', lambda: other)
+        patch.setattr(shared_cache, '_local', {})
+        yield
+
+
+def test_visibility_is_stored_on_save(
+        post_with_published_location, scheduled_post,
+        posts_with_unpublished_category):
+    assert set(Post.new_objects.values_list('id', flat=True)) == {
+        post_with_published_location.id}
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    assert not Post.new_objects.exists()
+
+
+def test_publish_due_opens_scheduled_posts(scheduled_post):
+    generation = get_generation()
+    assert publish_due() == []
+    assert publish_due(
+        now=scheduled_post.pub_date + timedelta(seconds=1)
+    ) == [scheduled_post.id]
+    assert Post.new_objects.filter(id=scheduled_post.id).exists()
+    assert get_generation() > generation
+
+
+def test_workers_share_generation_and_schedule(
+        settings, monkeypatch, scheduled_post):
+    settings.BLOG_SHARED_STATE_TTL = 0
+    shared_cache.forget_all()
+    assert not isinstance(shared_cache.shared_cache(), LocMemCache), (
+        'Поколение и расписание должны жить в кеше, общем для воркеров.'
+    )
+    generation = get_generation()
+    publish_due()
+    with other_worker(monkeypatch):
+        assert get_generation() == generation
+        publish_due(now=scheduled_post.pub_date + timedelta(seconds=1))
+    assert get_generation() != generation, (
+        'Публикация в другом воркере должна менять поколение и в этом.'
+    )
+    assert shared_cache.recall(NEXT_PUBLISH_KEY) == NOTHING_SCHEDULED
+
+
+def test_middleware_publishes_when_due(client, scheduled_post):
+    client.get('/')
+    Post.objects.filter(id=scheduled_post.id).update(
+        pub_date=timezone.now() - timedelta(seconds=1))
+    cache.clear()
+    shared_cache.clear()
+    response = client.get('/')
+    assert scheduled_post in response.context['page_obj']
+
+
+def test_category_publication_toggles_posts(post_with_published_location):
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+    assert not Post.new_objects.exists()
+    category.is_published = True
+    category.save()
+    assert Post.new_objects.get() == post_with_published_location
@@ -0,0 +1,110 @@
+import hashlib
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+
+from blog import query_stats
+from blog.models import QueryStat
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def stats():
+    query_stats.stats.take()
+    yield query_stats.stats
+    query_stats.stats.take()
+
+
+def test_fingerprint_normalizes_literals():
+    assert query_stats.fingerprint(
+        'SELECT * FROM "blog_post" WHERE "id" IN (%s, %s, %s)'
+    ) == query_stats.fingerprint(
+        'SELECT * FROM "blog_post"  WHERE "id" IN (%s)'
+    ), 'Списки IN разной длины должны давать один отпечаток.'
+    assert query_stats.fingerprint(
+        "SELECT 1 FROM t WHERE name = 'a' AND \"x2\" > 10"
+    ) == 'SELECT ? FROM t WHERE name = ? AND "x2" > ?'
+
+
+def test_queries_recorded_with_view(
+        stats, client, many_posts_with_published_locations):
+    client.get('/')
+    index_entries = [
+        entry for entry in stats.entries.values()
+        if 'blog:index' in entry.views
+    ]
+    assert index_entries, 'Запросы должны быть подписаны представлением.'
+    assert any(entry.rows >= 10 for entry in index_entries), (
+        'Должно учитываться число выбранных строк.'
+    )
+
+
+def test_table_is_bounded(stats, settings):
+    stats.size = 2
+    try:
+        for number in range(3):
+            stats.record(f'SELECT "c{number}" FROM t', 0.001, '-')
+        stats.record('SELECT "c2" FROM t', 0.001, '-')
+        assert len(stats.entries) == 2
+    finally:
+        stats.size = settings.BLOG_QUERY_STATS_SIZE
+
+
+def test_flush_merges_into_table(
+        stats, client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    client.get(url)
+    query_stats.flush()
+    client.get(url)
+    query_stats.flush()
+    assert not stats.entries, 'После сброса таблица в памяти пуста.'
+    stat = QueryStat.objects.filter(
+        views__has_key='blog:post_detail'
+    ).first()
+    assert stat is not None
+    assert stat.views['blog:post_detail'] == 2, (
+        'Повторный сброс должен складываться с сохранённой статистикой.'
+    )
+    out = StringIO()
+    call_command('query_stats', '--limit', '50', stdout=out)
+    assert 'blog:post_detail (2)' in out.getvalue()
+
+
+def test_flush_adds_to_rows_of_other_workers(stats):
+    sql = 'SELECT "c" FROM t'
+    key = query_stats.fingerprint(sql)
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    QueryStat.objects.create(
+        digest=digest, fingerprint=key, calls=5, max_time=1,
+        views={'blog:index': 5}
+    )
+    stats.record(sql, 0.5, 'blog:index')
+    stats.record(sql, 0.5, 'blog:post_detail')
+    query_stats.flush()
+    stat = QueryStat.objects.get(digest=digest)
+    assert stat.calls == 7, (
+        'Сброс должен прибавлять вызовы к строке, созданной другим воркером.'
+    )
+    assert stat.max_time == 1
+    assert stat.views == {'blog:index': 6, 'blog:post_detail': 1}
+
+
+def test_failed_flush_keeps_entries(stats, monkeypatch, client):
+    def fail(entries):
+        raise IntegrityError('duplicate digest')
+
+    monkeypatch.setattr(query_stats, 'save', fail)
+    stats.record('SELECT "c" FROM t', 0.5, '-')
+    assert query_stats.flush() == 0
+    assert query_stats.fingerprint('SELECT "c" FROM t') in stats.entries, (
+        'Несохранённая статистика должна дождаться следующего сброса.'
+    )
+    monkeypatch.setattr(stats, 'flush_due', lambda: True)
+    assert client.get('/').status_code == 200, (
+        'Ошибка сброса статистики не должна ломать страницу.'
+    )
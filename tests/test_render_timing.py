@@ -0,0 +1,48 @@
+import logging
+
+import pytest
+
+from blog import metrics
+from blog.profiling import make_token
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def index_page(client, many_posts_with_published_locations):
+    metrics.reset()
+    return client.get('/')
+
+
+def test_server_timing_tree(index_page):
+    timing = index_page['Server-Timing']
+    assert timing.startswith('app;dur=')
+    assert 'desc="blog/index.html > includes/post_card.html x10"' in timing, (
+        'В Server-Timing должны быть include с числом вызовов.'
+    )
+
+
+def test_render_metrics_aggregated(index_page, client):
+    client.get('/')
+    response = client.get(
+        '/metrics/', HTTP_X_BLOG_PROFILING_TOKEN=make_token()
+    )
+    assert response.status_code == 200
+    assert (
+        'blog_template_render_seconds_count{template="includes/post_card.html"'
+        ',view="blog:index"} 20'
+    ) in response.content.decode(), (
+        'Метрика должна складывать рендеры шаблона по всем запросам.'
+    )
+    assert client.get('/metrics/').status_code == 302
+
+
+def test_slow_request_logged(
+        settings, caplog, client, many_posts_with_published_locations):
+    settings.BLOG_SLOW_REQUEST_SECONDS = 0
+    with caplog.at_level(logging.WARNING, logger='blog.render_timing'):
+        client.get('/')
+    assert 'Медленный запрос GET /' in caplog.text
+    assert '  includes/post_card.html ×10' in caplog.text
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+from django.test import Client
+
+from blog.profiling import make_token
+from blog.sampling import Sampler
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.BLOG_PROFILE_DIR = tmp_path
+    return tmp_path
+
+
+def test_sampler_attributes_stacks_to_view_and_template(
+        profile_dir, client, many_posts_with_published_locations):
+    sampler = Sampler(seconds=1, interval=0.001)
+    sampler.start()
+    while sampler.is_alive():
+        client.get('/')
+    stacks = (profile_dir / f'{sampler.profile_name}.collapsed').read_text()
+    index_stacks = [
+        line for line in stacks.splitlines() if line.startswith('blog:index;')
+    ]
+    assert index_stacks, 'Стеки должны начинаться с имени представления.'
+    assert any(
+        '[template includes/post_card.html]' in line for line in index_stacks
+    ), 'Рендер шаблонов должен быть отмечен в стеках.'
+
+
+def test_sampling_view_access(profile_dir, mixer, client, user_client):
+    assert user_client.get('/profiling/sample/').status_code == 302, (
+        'Запускать профилировщик могут только сотрудники.'
+    )
+    staff = mixer.blend('auth.User', is_staff=True)
+    staff_client = Client()
+    staff_client.force_login(staff)
+    response = staff_client.get('/profiling/sample/?seconds=0.2')
+    assert response.status_code == 202
+    assert staff_client.get('/profiling/sample/').status_code == 409, (
+        'Второй профилировщик не должен запускаться параллельно.'
+    )
+    path = profile_dir / response.json()['name']
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert client.get(
+        f'/profiling/{path.name}',
+        HTTP_X_BLOG_PROFILING_TOKEN=make_token()
+    ).status_code == 200
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.search import parse_cursor
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        title=mixer.sequence('Заметка о горах {0}'),
+        text='Путешествие по Кавказу, вершины и ледники.',
+        pub_date=timezone.now() - timedelta(days=1))
+
+
+def search(client, query, cursor=None):
+    params = {'q': query}
+    if cursor:
+        params['cursor'] = cursor
+    response = client.get('/search/', params)
+    assert response.status_code == 200, (
+        'Убедитесь, что страница поиска загружается без ошибок.'
+    )
+    return response
+
+
+def test_search_finds_and_highlights(client, searchable_posts):
+    response = search(client, 'кавказ')
+    found = list(response.context['object_list'])
+    assert {post.id for post in found} == {
+        post.id for post in searchable_posts}
+    assert '<mark>Кавказу</mark>' in found[0].snippet
+
+
+def test_search_respects_visibility(
+        client, mixer, user, searchable_posts, future_posts,
+        posts_with_unpublished_category):
+    for post in [*future_posts, *posts_with_unpublished_category]:
+        post.text = 'Кавказ'
+        post.save()
+    searchable_posts[0].is_published = False
+    searchable_posts[0].save()
+    response = search(client, 'кавказ')
+    assert {post.id for post in response.context['object_list']} == {
+        post.id for post in searchable_posts[1:]}
+
+
+def test_search_index_follows_updates_and_deletes(client, searchable_posts):
+    post = searchable_posts[0]
+    post.text = 'Морское побережье.'
+    post.save()
+    searchable_posts[1].delete()
+    response = search(client, 'побережье')
+    assert [p.id for p in response.context['object_list']] == [post.id]
+    response = search(client, 'кавказ')
+    assert [p.id for p in response.context['object_list']] == [
+        searchable_posts[2].id]
+
+
+def test_search_cursor_pagination(client, mixer, user, published_category):
+    mixer.cycle(15).blend(
+        'blog.Post', author=user, category=published_category,
+        text='Одинаковый текст про озеро.',
+        pub_date=timezone.now() - timedelta(days=1))
+    first_page = search(client, 'озеро')
+    next_cursor = first_page.context['next_cursor']
+    assert parse_cursor(next_cursor)
+    second_page = search(client, 'озеро', next_cursor)
+    assert second_page.context['next_cursor'] is None
+    ids = [post.id for post in first_page.context['object_list']]
+    ids += [post.id for post in second_page.context['object_list']]
+    assert len(ids) == len(set(ids)) == 15
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+from django.core.cache import cache
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def get_locations(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f'Убедитесь, что страница `{url}` загружается без ошибок.'
+    )
+    content = b''.join(response) if response.streaming else response.content
+    return re.findall(r'<loc>http://testserver([^<]+)</loc>', content.decode())
+
+
+def test_sitemap_covers_visible_content(
+        client, user, post_with_published_location, future_posts,
+        posts_with_unpublished_category):
+    sections = get_locations(client, '/sitemap.xml')
+    assert sections, 'Индекс карты сайта не должен быть пустым.'
+    locations = []
+    for section in sections:
+        locations += get_locations(client, section)
+    assert f'/posts/{post_with_published_location.id}/' in locations
+    for post in [*future_posts, *posts_with_unpublished_category]:
+        assert f'/posts/{post.id}/' not in locations
+    assert f'/profile/{user.username}/' in locations
+    category = post_with_published_location.category
+    assert f'/category/{category.slug}/' in locations
+
+
+def test_sitemap_chunk_is_cached_until_publish(
+        client, django_assert_max_num_queries, post_with_published_location):
+    url = '/sitemap-posts-0.xml'
+    get_locations(client, url)
+    with django_assert_max_num_queries(1):
+        get_locations(client, url)
+    assert client.get('/sitemap-posts-1000.xml').status_code == 404
+    assert client.get('/sitemap-unknown-0.xml').status_code == 404
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from django.db import connection, transaction
+
+from blog.models import Post
+from blog.slow_queries import explain
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def slow_query_log(settings, tmp_path):
+    settings.BLOG_SLOW_QUERY_MS = 0
+    settings.BLOG_SLOW_QUERY_LOG = tmp_path / 'slow.jsonl'
+    return settings.BLOG_SLOW_QUERY_LOG
+
+
+def read_entries(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_slow_query_logged_with_plan(
+        slow_query_log, client, many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    client.get(f'/category/{category.slug}/')
+    entries = [
+        entry for entry in read_entries(slow_query_log)
+        if entry['view'] == 'blog:category_posts'
+    ]
+    assert entries, 'Медленные запросы должны попадать в журнал.'
+    posts_query = next(
+        entry for entry in entries if 'GROUP BY' in entry['sql']
+    )
+    assert posts_query['site'].startswith('blog/category.html:'), (
+        'В журнале должен быть шаблон, из которого пришёл запрос.'
+    )
+    assert posts_query['params'], 'В журнал должны попадать параметры.'
+    assert category.slug not in json.dumps(entries), (
+        'Значения параметров не должны попадать в журнал по умолчанию.'
+    )
+    assert f'str({len(category.slug)})' in json.dumps(entries)
+    assert any('blog_post' in line for line in posts_query['plan']), (
+        'Для SELECT должен сниматься план выполнения.'
+    )
+    assert not any(
+        entry['sql'].startswith('EXPLAIN') for entry in entries
+    ), 'EXPLAIN не должен сам попадать в журнал.'
+
+
+def test_fast_queries_not_logged(
+        many_posts_with_published_locations, settings, slow_query_log, client):
+    settings.BLOG_SLOW_QUERY_MS = 60 * 1000
+    client.get('/')
+    assert not slow_query_log.exists()
+
+
+def test_log_rotates(
+        settings, slow_query_log, client, post_with_published_location):
+    settings.BLOG_SLOW_QUERY_LOG_MAX_BYTES = 2000
+    settings.BLOG_SLOW_QUERY_LOG_BACKUPS = 2
+    for _ in range(3):
+        client.get(f'/posts/{post_with_published_location.id}/')
+    assert slow_query_log.with_name('slow.jsonl.1').exists(), (
+        'Журнал должен ротироваться по размеру.'
+    )
+
+
+def test_param_values_logged_when_enabled(
+        settings, post_with_published_location, slow_query_log, client):
+    settings.BLOG_SLOW_QUERY_PARAMS = True
+    category = post_with_published_location.category
+    client.get(f'/category/{category.slug}/')
+    assert category.slug in slow_query_log.read_text()
+
+
+def test_failed_explain_keeps_transaction(post_with_published_location):
+    with transaction.atomic():
+        plan = explain(connection, 'SELECT * FROM "blog_missing"', ())
+        assert plan[0].startswith('EXPLAIN не выполнен'), plan
+        assert Post.objects.count() == 1, (
+            'Ошибка EXPLAIN не должна обрывать транзакцию.'
+        )
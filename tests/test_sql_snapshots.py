@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1)
+    )
+    mixer.cycle(2).blend('blog.Comment', post=posts[0], author=user)
+    return posts
+
+
+@pytest.fixture
+def post(posts):
+    return posts[0]
+
+
+def test_index_sql(sql_snapshot, client, posts):
+    with sql_snapshot('index'):
+        assert client.get('/').status_code == 200
+
+
+def test_post_detail_sql(sql_snapshot, user_client, post):
+    with sql_snapshot('post_detail'):
+        assert user_client.get(f'/posts/{post.id}/').status_code == 200
+
+
+def test_profile_owner_sql(sql_snapshot, user, user_client, posts):
+    with sql_snapshot('profile_owner'):
+        response = user_client.get(f'/profile/{user.username}/')
+    assert response.status_code == 200
+
+
+def test_profile_other_sql(sql_snapshot, user, another_user_client, posts):
+    with sql_snapshot('profile_other'):
+        response = another_user_client.get(f'/profile/{user.username}/')
+    assert response.status_code == 200
+
+
+def test_category_posts_sql(sql_snapshot, client, post):
+    with sql_snapshot('category_posts'):
+        response = client.get(f'/category/{post.category.slug}/')
+    assert response.status_code == 200
+
+
+def test_post_create_sql(
+        sql_snapshot, user_client, published_category, published_location):
+    data = {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': timezone.now().strftime('%Y-%m-%dT%H:%M'),
+        'category': published_category.id,
+        'location': published_location.id,
+    }
+    with sql_snapshot('post_create'):
+        response = user_client.post('/posts/create/', data)
+    assert response.status_code == 302
+
+
+def test_post_edit_sql(sql_snapshot, user_client, post):
+    data = {
+        'title': 'Новый заголовок',
+        'text': post.text,
+        'pub_date': post.pub_date.strftime('%Y-%m-%dT%H:%M'),
+        'category': post.category_id,
+        'location': post.location_id,
+    }
+    with sql_snapshot('post_edit'):
+        response = user_client.post(f'/posts/{post.id}/edit/', data)
+    assert response.status_code == 302
+
+
+def test_post_delete_sql(sql_snapshot, user_client, post):
+    with sql_snapshot('post_delete'):
+        response = user_client.post(f'/posts/{post.id}/delete/')
+    assert response.status_code == 302
+
+
+def test_comment_flow_sql(sql_snapshot, user_client, post):
+    with sql_snapshot('comment_create'):
+        response = user_client.post(
+            f'/posts/{post.id}/comment/', {'text': 'Комментарий'}
+        )
+    assert response.status_code == 302
+    comment = post.comments.last()
+    url = f'/posts/{post.id}/edit_comment/{comment.id}/'
+    with sql_snapshot('comment_edit'):
+        response = user_client.post(url, {'text': 'Исправлено'})
+    assert response.status_code == 302
+    url = f'/posts/{post.id}/delete_comment/{comment.id}/'
+    with sql_snapshot('comment_delete'):
+        assert user_client.post(url).status_code == 302
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+
+PRODUCTION_SETTINGS = 'blogicum.production_settings'
+# Запас относительно замеров на машине разработчика (~0,5 с и ~25 мс).
+MAX_BOOT_SECONDS = 3
+MAX_FIRST_RESPONSE_SECONDS = 0.5
+
+
+def test_cold_start_to_first_response(monkeypatch, tmp_path):
+    monkeypatch.setenv('BLOGICUM_DB', str(tmp_path / 'db.sqlite3'))
+    monkeypatch.setenv('BLOGICUM_STATIC_ROOT', str(tmp_path / 'static'))
+    monkeypatch.setenv(
+        'BLOGICUM_SHARED_CACHE_DIR', str(tmp_path / 'shared_cache')
+    )
+    for command in ('migrate', 'collectstatic'):
+        subprocess.run(
+            [sys.executable, 'manage.py', command, '--noinput', '-v0',
+             '--settings', PRODUCTION_SETTINGS],
+            cwd=settings.BASE_DIR, check=True
+        )
+    output = StringIO()
+    call_command(
+        'startup_profile', json=True, settings_module=PRODUCTION_SETTINGS,
+        stdout=output
+    )
+    report = json.loads(output.getvalue())
+    assert report['status'] == 200
+    assert not report['debug_toolbar_loaded'], (
+        'Боевые настройки не должны загружать debug_toolbar.'
+    )
+    assert report['boot'] < MAX_BOOT_SECONDS, (
+        f'Загрузка воркера заняла {report["boot"]:.2f} с.'
+    )
+    assert report['first_response'] < MAX_FIRST_RESPONSE_SECONDS, (
+        f'Первый ответ занял {report["first_response"]:.2f} с.'
+    )
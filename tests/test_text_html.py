@@ -0,0 +1,50 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+TEXT = '<script>alert(1)</script>\nвторая строка'
+HTML = '&lt;script&gt;alert(1)&lt;/script&gt;<br>вторая строка'
+
+
+def test_text_html_rendered_on_save(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    post.text = TEXT
+    post.save(update_fields=('text',))
+    assert Post.objects.get(pk=post.pk).text_html == HTML
+    user_client.post(f'/posts/{post.id}/comment/', {'text': TEXT})
+    assert Comment.objects.get().text_html == HTML
+    content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert content.count(HTML) == 2, (
+        'Текст поста и комментария должен выводиться готовым HTML.'
+    )
+    assert '<script>' not in content.split('<div id="djDebug"')[0]
+
+
+def test_foreign_markup_in_text_html_escaped(
+        client, post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        text=TEXT, text_html='<script>alert(1)</script>'
+    )
+    content = client.get(f'/posts/{post.id}/').content.decode()
+    assert HTML in content, (
+        'HTML из базы с тегами, кроме <br>, должен заменяться '
+        'экранированным текстом.'
+    )
+    assert '<script>alert' not in content
+
+
+def test_backfill_text_html(mixer, post_with_published_location):
+    mixer.blend('blog.Comment', post=post_with_published_location,
+                text=TEXT)
+    Post.objects.update(text_html='')
+    Comment.objects.update(text_html='')
+    call_command('render_text_html')
+    assert Comment.objects.get().text_html == HTML
+    assert Post.objects.get().text_html != ''
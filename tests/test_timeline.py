@@ -0,0 +1,131 @@
+from datetime import timedelta
+from urllib.parse import quote
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import timeline
+from blog.models import FeedEntry
+from blog.publishing import publish_due
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_feed_follows_post_changes(
+        mixer, user, post_with_published_location, published_category):
+    post = post_with_published_location
+    entry = FeedEntry.objects.get(post=post)
+    assert (entry.title, entry.author_username, entry.category_slug) == (
+        post.title, user.username, published_category.slug
+    )
+    assert entry.location_name == post.location.name
+    mixer.blend('blog.Comment', post=post)
+    comment = mixer.blend('blog.Comment', post=post)
+    assert FeedEntry.objects.get(post=post).comment_count == 2
+    comment.delete()
+    assert FeedEntry.objects.get(post=post).comment_count == 1
+    published_category.title = 'Новое название'
+    published_category.save()
+    user.username = 'renamed'
+    user.save()
+    entry = FeedEntry.objects.get(post=post)
+    assert (entry.category_title, entry.author_username) == (
+        'Новое название', 'renamed'
+    )
+    post.location.is_published = False
+    post.location.save()
+    assert FeedEntry.objects.get(post=post).location_name is None
+    post.is_published = False
+    post.save()
+    assert not FeedEntry.objects.filter(post=post).exists(), (
+        'Снятый с публикации пост должен пропасть из ленты.'
+    )
+
+
+def test_feed_follows_bulk_visibility_changes(
+        mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1))
+    assert not FeedEntry.objects.exists()
+    publish_due(now=post.pub_date + timedelta(seconds=1))
+    assert FeedEntry.objects.filter(post=post).exists()
+    published_category.is_published = False
+    published_category.save()
+    assert not FeedEntry.objects.exists()
+
+
+def test_edited_post_keeps_comment_count(
+        mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    response = user_client.post(f'/posts/{post.id}/edit/', {
+        'title': 'Новый заголовок',
+        'text': post.text,
+        'pub_date': post.pub_date.strftime('%Y-%m-%dT%H:%M'),
+        'category': post.category_id,
+        'location': post.location_id,
+    })
+    assert response.status_code == 302
+    entry = FeedEntry.objects.get(post=post)
+    assert (entry.title, entry.comment_count) == ('Новый заголовок', 2), (
+        'Запись ленты должна обновляться без потери числа комментариев.'
+    )
+
+
+def test_rebuild_feed(many_posts_with_published_locations):
+    FeedEntry.objects.all().delete()
+    call_command('rebuild_feed')
+    assert FeedEntry.objects.count() == len(
+        many_posts_with_published_locations
+    )
+
+
+def test_failed_rebuild_keeps_old_feed(
+        monkeypatch, many_posts_with_published_locations):
+    def broken_batch(post_ids):
+        raise RuntimeError
+    monkeypatch.setattr(timeline, '_sync_batch', broken_batch)
+    with pytest.raises(RuntimeError):
+        timeline.rebuild_feed()
+    assert FeedEntry.objects.count() == len(
+        many_posts_with_published_locations
+    ), 'Неудачная перестройка не должна оставлять ленту пустой.'
+
+
+def test_index_reads_only_feed(
+        client, many_posts_with_published_locations,
+        django_assert_num_queries):
+    publish_due()
+    response = client.get('/')
+    with django_assert_num_queries(1):
+        response = client.get('/')
+    posts = list(response.context['page_obj'])
+    assert len(posts) == 10
+    assert posts == sorted(posts, key=lambda post: post.pub_date,
+                           reverse=True)
+    assert f'/posts/{posts[0].id}/' in response.content.decode()
+
+
+def test_index_pages_by_cursor(
+        client, mixer, user, published_category):
+    moment = timezone.now() - timedelta(days=1)
+    # Посты с одинаковой датой: курсор различает их по id.
+    posts = mixer.cycle(25).blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=moment)
+    seen = []
+    url = '/'
+    while url:
+        response = client.get(url)
+        seen += [post.id for post in response.context['page_obj']]
+        cursor = response.context['next_cursor']
+        url = cursor and f'/?cursor={quote(cursor)}'
+        assert len(seen) <= len(posts)
+    assert seen == sorted((post.id for post in posts), reverse=True), (
+        'Страницы ленты по курсору должны идти без пропусков и повторов.'
+    )
+    assert client.get('/?cursor=мусор').status_code == 200
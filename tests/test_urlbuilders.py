@@ -0,0 +1,47 @@
+import pytest
+from django.urls import NoReverseMatch, reverse
+
+from blog import urlbuilders
+from blog.urlbuilders import build_url
+
+ROUTES = [
+    ('blog:index', ()),
+    ('blog:post_detail', (5,)),
+    ('blog:profile', ('some_user',)),
+    ('blog:category_posts', ('news-2',)),
+    ('blog:edit_comment', (3, 14)),
+    ('blog:sitemap_section', ('posts', 2)),
+    ('pages:about', ()),
+    ('login', ()),
+]
+
+
+@pytest.mark.parametrize('name, args', ROUTES)
+def test_build_url_matches_reverse(name, args):
+    assert build_url(name, *args) == reverse(name, args=args), (
+        f'Адрес `{name}` должен совпадать с результатом reverse().'
+    )
+
+
+def test_build_url_kwargs():
+    assert build_url('blog:edit_comment', post_id=1, pk=2) == reverse(
+        'blog:edit_comment', kwargs={'post_id': 1, 'pk': 2}
+    )
+
+
+def test_build_url_rejects_invalid_values():
+    with pytest.raises(NoReverseMatch):
+        build_url('blog:category_posts', 'a.b')
+    with pytest.raises(NoReverseMatch):
+        build_url('blog:post_detail', 'abc')
+    with pytest.raises(NoReverseMatch):
+        build_url('blog:post_detail')
+
+
+def test_builders_reset_on_urlconf_change(settings):
+    build_url('blog:index')
+    assert urlbuilders.builders
+    settings.ROOT_URLCONF = 'blogicum.urls'
+    assert not urlbuilders.builders, (
+        'При смене ROOT_URLCONF собранные маршруты нужно сбросить.'
+    )